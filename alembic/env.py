@@ -1,4 +1,9 @@
 from models.user import Base  # Import your Base object here
+import models.ai_model  # noqa: F401
+import models.cognitive_profile  # noqa: F401
+import models.game_definition  # noqa: F401
+import models.game_instance  # noqa: F401
+import llm_service.models  # noqa: F401
 from logging.config import fileConfig
 
 from sqlalchemy import engine_from_config
@@ -15,8 +20,11 @@ load_dotenv()
 # access to the values within the .ini file in use.
 config = context.config
 
-# Set the SQLAlchemy URL from environment variable
-config.set_main_option("sqlalchemy.url", os.environ.get("DATABASE_URL"))
+# Set the SQLAlchemy URL from environment variable. Migrations run on a
+# synchronous connection, so the app's asyncpg driver is swapped out.
+config.set_main_option(
+    "sqlalchemy.url",
+    os.environ.get("DATABASE_URL", "").replace("+asyncpg", "+psycopg2"))
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
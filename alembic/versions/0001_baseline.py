@@ -0,0 +1,129 @@
+"""Baseline schema with hot-path indexes
+
+Creates every table as of this revision, plus the indexes behind the
+queries run on each request:
+
+- a user's game instances, newest first, optionally by status, with a
+  partial index over games still being played;
+- game instances by start time, for replay training;
+- containment filters on any ``game_state`` key (GIN, jsonb_path_ops);
+- a user's LLM call logs, newest first.
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0001_baseline"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "users",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("username", sa.String(50), nullable=False),
+        sa.Column("email", sa.String(255), nullable=False),
+        sa.Column("hashed_password", sa.String(255), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "game_definitions",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column("rules_config", postgresql.JSONB(), nullable=False),
+        sa.Column("version", sa.String(20), nullable=False),
+    )
+    op.create_index("ix_game_definitions_name", "game_definitions", ["name"], unique=True)
+
+    op.create_table(
+        "ai_models",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False, unique=True),
+        sa.Column("description", sa.String(), nullable=True),
+        sa.Column("config", sa.JSON(), nullable=False),
+        sa.Column("metadata", sa.JSON(), nullable=True),
+        sa.Column("file_path", sa.String(), nullable=True),
+        sa.Column("created_at", sa.String(), nullable=False),
+        sa.Column("updated_at", sa.String(), nullable=True),
+    )
+    op.create_index("ix_ai_models_id", "ai_models", ["id"])
+
+    op.create_table(
+        "cognitive_profiles",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id"),
+                  nullable=False, unique=True),
+        sa.Column("profile_data", postgresql.JSONB(), nullable=False),
+        sa.Column("last_updated", sa.DateTime(), nullable=False),
+    )
+
+    op.create_table(
+        "game_instances",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("game_definition_id", postgresql.UUID(as_uuid=True),
+                  sa.ForeignKey("game_definitions.id"), nullable=False),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id"),
+                  nullable=True),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("game_state", postgresql.JSONB(), nullable=False),
+        sa.Column("start_time", sa.DateTime(), nullable=False),
+        sa.Column("end_time", sa.DateTime(), nullable=True),
+        sa.Column("score", sa.Integer(), nullable=True),
+        sa.Column("ai_model_id", postgresql.UUID(as_uuid=True), nullable=True),
+    )
+    op.create_index(
+        "ix_game_instances_user_id_start_time", "game_instances",
+        ["user_id", sa.text("start_time DESC"), sa.text("id DESC")])
+    op.create_index(
+        "ix_game_instances_user_id_status_start_time", "game_instances",
+        ["user_id", "status", sa.text("start_time DESC")])
+    op.create_index(
+        "ix_game_instances_active_user_id", "game_instances",
+        ["user_id", sa.text("start_time DESC")],
+        postgresql_where=sa.text("status IN ('pending', 'in_progress')"))
+    op.create_index("ix_game_instances_start_time", "game_instances", ["start_time"])
+    op.create_index(
+        "ix_game_instances_game_state", "game_instances", ["game_state"],
+        postgresql_using="gin", postgresql_ops={"game_state": "jsonb_path_ops"})
+
+    op.create_table(
+        "llm_call_logs",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id"),
+                  nullable=True),
+        sa.Column("provider", sa.String(50), nullable=False),
+        sa.Column("model", sa.String(100), nullable=False),
+        sa.Column("prompt", sa.Text(), nullable=False),
+        sa.Column("response", sa.Text(), nullable=True),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index(
+        "ix_llm_call_logs_user_id_created_at", "llm_call_logs",
+        ["user_id", sa.text("created_at DESC"), sa.text("id DESC")])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("llm_call_logs")
+    op.drop_table("game_instances")
+    op.drop_table("cognitive_profiles")
+    op.drop_table("ai_models")
+    op.drop_table("game_definitions")
+    op.drop_table("users")
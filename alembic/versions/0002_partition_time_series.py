@@ -0,0 +1,154 @@
+"""Partition llm_call_logs and game_instances by month
+
+Both tables only grow, and their indexes and vacuum runs grow with them.
+They are rebuilt as tables range-partitioned by month on ``created_at``
+and ``start_time`` respectively, so old months can be detached and
+dropped or archived (``core.partitions``) instead of deleted row by row.
+
+The partition key has to be part of every unique constraint, so the
+primary keys become ``(id, created_at)`` and ``(id, start_time)``.
+Existing rows are copied into partitions covering their months, plus
+three months ahead; the ``maintain_partitions`` task keeps creating
+partitions from then on.
+
+Revision ID: 0002_partition_time_series
+Revises: 0001_baseline
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0002_partition_time_series"
+down_revision: Union[str, None] = "0001_baseline"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Partitions created past the current month; see PARTITION_MONTHS_AHEAD
+MONTHS_AHEAD = 3
+
+
+def llm_call_logs_columns() -> list:
+    return [
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id"),
+                  nullable=True),
+        sa.Column("provider", sa.String(50), nullable=False),
+        sa.Column("model", sa.String(100), nullable=False),
+        sa.Column("prompt", sa.Text(), nullable=False),
+        sa.Column("response", sa.Text(), nullable=True),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    ]
+
+
+def game_instances_columns() -> list:
+    return [
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("game_definition_id", postgresql.UUID(as_uuid=True),
+                  sa.ForeignKey("game_definitions.id"), nullable=False),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id"),
+                  nullable=True),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("game_state", postgresql.JSONB(), nullable=False),
+        sa.Column("start_time", sa.DateTime(), nullable=False),
+        sa.Column("end_time", sa.DateTime(), nullable=True),
+        sa.Column("score", sa.Integer(), nullable=True),
+        sa.Column("ai_model_id", postgresql.UUID(as_uuid=True), nullable=True),
+    ]
+
+
+def create_llm_call_logs_indexes() -> None:
+    op.create_index(
+        "ix_llm_call_logs_user_id_created_at", "llm_call_logs",
+        ["user_id", sa.text("created_at DESC"), sa.text("id DESC")])
+
+
+def create_game_instances_indexes() -> None:
+    op.create_index(
+        "ix_game_instances_user_id_start_time", "game_instances",
+        ["user_id", sa.text("start_time DESC"), sa.text("id DESC")])
+    op.create_index(
+        "ix_game_instances_user_id_status_start_time", "game_instances",
+        ["user_id", "status", sa.text("start_time DESC")])
+    op.create_index(
+        "ix_game_instances_active_user_id", "game_instances",
+        ["user_id", sa.text("start_time DESC")],
+        postgresql_where=sa.text("status IN ('pending', 'in_progress')"))
+    op.create_index("ix_game_instances_start_time", "game_instances", ["start_time"])
+    op.create_index(
+        "ix_game_instances_game_state", "game_instances", ["game_state"],
+        postgresql_using="gin", postgresql_ops={"game_state": "jsonb_path_ops"})
+
+
+TABLES = (
+    ("llm_call_logs", "created_at", llm_call_logs_columns, create_llm_call_logs_indexes),
+    ("game_instances", "start_time", game_instances_columns, create_game_instances_indexes),
+)
+
+
+def create_monthly_partitions(table: str, column: str, source: str) -> None:
+    """Create partitions from the oldest row of ``source`` to MONTHS_AHEAD months out.
+
+    Partitions are named ``<table>_yYYYYmMM``, as ``core.partitions`` expects.
+    """
+    op.execute(f"""
+        DO $$
+        DECLARE
+            month date;
+        BEGIN
+            FOR month IN
+                SELECT generate_series(
+                    date_trunc('month', coalesce((SELECT min({column}) FROM {source}), now())),
+                    date_trunc('month', now()) + interval '{MONTHS_AHEAD} months',
+                    interval '1 month')::date
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF {table} FOR VALUES FROM (%L) TO (%L)',
+                    '{table}_' || to_char(month, '"y"YYYY"m"MM'),
+                    month, (month + interval '1 month')::date);
+            END LOOP;
+        END $$
+    """)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, column, columns, create_indexes in TABLES:
+        source = f"{table}_unpartitioned"
+        op.rename_table(table, source)
+        op.execute(f"ALTER INDEX {table}_pkey RENAME TO {source}_pkey")
+        op.create_table(
+            table,
+            *columns(),
+            sa.PrimaryKeyConstraint("id", column, name=f"{table}_pkey"),
+            postgresql_partition_by=f"RANGE ({column})",
+        )
+        create_monthly_partitions(table, column, source)
+        op.execute(f"INSERT INTO {table} SELECT * FROM {source}")
+        op.drop_table(source)
+        # Built after the copy, and cascaded to every partition
+        create_indexes()
+
+
+def downgrade() -> None:
+    """Downgrade schema.
+
+    Partitions detached by the retention job are left as they are.
+    """
+    for table, column, columns, create_indexes in reversed(TABLES):
+        source = f"{table}_partitioned"
+        op.rename_table(table, source)
+        op.execute(f"ALTER INDEX {table}_pkey RENAME TO {source}_pkey")
+        op.create_table(
+            table,
+            *columns(),
+            sa.PrimaryKeyConstraint("id", name=f"{table}_pkey"),
+        )
+        op.execute(f"INSERT INTO {table} SELECT * FROM {source}")
+        op.drop_table(source)
+        create_indexes()
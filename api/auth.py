@@ -77,7 +77,7 @@ async def login_user(user_in: UserLogin, session: AsyncSession = Depends(get_asy
     """
     logger.info(f"Login attempt for email: {user_in.email}")
     user = await get_user_by_email(session, user_in.email)
-    if not user or not verify_password(user_in.password, user.hashed_password):
+    if not user or not await verify_password(user_in.password, user.hashed_password):
         logger.warning(f"Login failed for email: {user_in.email}")
         raise HTTPException(status_code=401, detail="Invalid credentials.")
     token_data = {"sub": str(user.id), "email": user.email}
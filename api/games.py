@@ -1,59 +1,160 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Query
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import Any, Dict, Optional
+import asyncio
+import uuid
 
-from crud.game_definition import GameDefinitionCRUD
-from crud.game_instance import GameInstanceCRUD
-from schemas.game_definition import GameDefinitionCreate, GameDefinitionUpdate, GameDefinition
-from schemas.game_instance import GameInstanceCreate, GameInstanceUpdate, GameInstance
+from api.pagination import invalid_cursor, ndjson_response
+from core.auth import get_current_user
+from core.database import get_async_session
+from core.state_patches import state_patch_queue
+from crud import game_definition as crud_game_definition
+from crud import game_instance as crud_game_instance
+from crud.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from schemas.game_definition import (
+    GameDefinitionCreate,
+    GameDefinitionUpdate,
+    GameDefinitionPage,
+    GameDefinitionRead,
+)
+from schemas.game_instance import (
+    GameInstanceBulkCreate,
+    GameInstanceBulkResult,
+    GameInstanceCreate,
+    GameInstancePage,
+    GameInstanceRead,
+)
 
 router = APIRouter()
 
-def get_game_definition_crud():
-    return GameDefinitionCRUD()
+@router.on_event("startup")
+async def startup_event():
+    state_patch_queue.start()
 
-def get_game_instance_crud():
-    return GameInstanceCRUD()
+@router.on_event("shutdown")
+async def shutdown_event():
+    await state_patch_queue.stop()
 
-@router.post('/game-definitions/', response_model=GameDefinition)
-async def create_game_definition(game_definition: GameDefinitionCreate, crud: GameDefinitionCRUD = Depends(get_game_definition_crud)):
-    return await crud.create(game_definition)
+async def get_game_definition_or_404(game_id: uuid.UUID, session: AsyncSession):
+    game_definition = await crud_game_definition.get_by_id(session, game_id)
+    if not game_definition:
+        raise HTTPException(status_code=404, detail='Game definition not found')
+    return game_definition
 
-@router.get('/game-definitions/', response_model=List[GameDefinition])
-async def list_game_definitions(crud: GameDefinitionCRUD = Depends(get_game_definition_crud)):
-    return await crud.get_all()
+@router.post('/game-definitions/', response_model=GameDefinitionRead, status_code=201)
+async def create_game_definition(game_definition: GameDefinitionCreate, session: AsyncSession = Depends(get_async_session)):
+    try:
+        return await crud_game_definition.create(session, game_definition)
+    except IntegrityError:
+        raise HTTPException(status_code=409, detail='A game definition with this name already exists')
 
-@router.put('/game-definitions/{game_id}', response_model=GameDefinition)
-async def update_game_definition(game_id: int, game_definition: GameDefinitionUpdate, crud: GameDefinitionCRUD = Depends(get_game_definition_crud)):
-    existing_definition = await crud.get(game_id)
-    if not existing_definition:
-        raise HTTPException(status_code=404, detail='Game definition not found')
-    return await crud.update(game_id, game_definition)
+@router.get('/game-definitions/', response_model=GameDefinitionPage)
+async def list_game_definitions(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description='next_cursor of the previous page'),
+    stream: bool = Query(False, description='Stream every definition after cursor as NDJSON'),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """List game definitions by name, a page at a time or streamed."""
+    try:
+        if stream:
+            return ndjson_response(
+                lambda stream_session: crud_game_definition.stream_all(stream_session, cursor),
+                GameDefinitionRead)
+        page = await crud_game_definition.list_all(session, limit, cursor)
+    except ValueError as e:
+        raise invalid_cursor(e)
+    return GameDefinitionPage(
+        items=[GameDefinitionRead.from_orm(item) for item in page.items],
+        next_cursor=page.next_cursor)
+
+@router.put('/game-definitions/{game_id}', response_model=GameDefinitionRead)
+async def update_game_definition(game_id: uuid.UUID, game_definition: GameDefinitionUpdate, session: AsyncSession = Depends(get_async_session)):
+    existing_definition = await get_game_definition_or_404(game_id, session)
+    try:
+        return await crud_game_definition.update(session, existing_definition, game_definition)
+    except IntegrityError:
+        raise HTTPException(status_code=409, detail='A game definition with this name already exists')
 
 @router.delete('/game-definitions/{game_id}', status_code=204)
-async def delete_game_definition(game_id: int, crud: GameDefinitionCRUD = Depends(get_game_definition_crud)):
-    existing_definition = await crud.get(game_id)
-    if not existing_definition:
-        raise HTTPException(status_code=404, detail='Game definition not found')
-    await crud.delete(game_id)
+async def delete_game_definition(game_id: uuid.UUID, session: AsyncSession = Depends(get_async_session)):
+    existing_definition = await get_game_definition_or_404(game_id, session)
+    try:
+        await crud_game_definition.delete(session, existing_definition)
+    except IntegrityError:
+        raise HTTPException(status_code=409, detail='Game definition is used by game instances')
 
-@router.post('/game-instances/', response_model=GameInstance)
-async def create_game_instance(game_instance: GameInstanceCreate, crud: GameInstanceCRUD = Depends(get_game_instance_crud)):
-    return await crud.create(game_instance)
+@router.post('/game-instances/', response_model=GameInstanceRead, status_code=201)
+async def create_game_instance(game_instance: GameInstanceCreate, session: AsyncSession = Depends(get_async_session)):
+    try:
+        return await crud_game_instance.create(session, game_instance)
+    except IntegrityError:
+        raise HTTPException(status_code=409, detail='Game instance references unknown rows')
 
-@router.get('/game-instances/', response_model=List[GameInstance])
-async def list_game_instances(crud: GameInstanceCRUD = Depends(get_game_instance_crud)):
-    return await crud.get_all()
+@router.post('/game-instances/bulk', response_model=GameInstanceBulkResult, status_code=201)
+async def bulk_create_game_instances(payload: GameInstanceBulkCreate, session: AsyncSession = Depends(get_async_session)):
+    """Store a batch of finished or in-progress games in one transaction."""
+    try:
+        ids = await crud_game_instance.bulk_create(session, payload.instances, upsert=payload.upsert)
+    except IntegrityError:
+        raise HTTPException(status_code=409, detail='Batch conflicts with existing game instances or references unknown rows')
+    return GameInstanceBulkResult(count=len(ids), ids=ids)
 
-@router.put('/game-instances/{instance_id}', response_model=GameInstance)
-async def update_game_instance(instance_id: int, game_instance: GameInstanceUpdate, crud: GameInstanceCRUD = Depends(get_game_instance_crud)):
-    existing_instance = await crud.get(instance_id)
-    if not existing_instance:
-        raise HTTPException(status_code=404, detail='Game instance not found')
-    return await crud.update(instance_id, game_instance)
+@router.get('/game-instances/mine', response_model=GameInstancePage)
+async def list_my_game_instances(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description='next_cursor of the previous page'),
+    stream: bool = Query(False, description='Stream every instance after cursor as NDJSON'),
+    session: AsyncSession = Depends(get_async_session),
+    current_user=Depends(get_current_user),
+):
+    """List the current user's game instances, newest first, a page at a time or streamed."""
+    try:
+        if stream:
+            user_id = current_user.id
+            return ndjson_response(
+                lambda stream_session: crud_game_instance.stream_by_user(stream_session, user_id, cursor),
+                GameInstanceRead)
+        page = await crud_game_instance.list_by_user(session, current_user.id, limit, cursor)
+    except ValueError as e:
+        raise invalid_cursor(e)
+    return GameInstancePage(
+        items=[GameInstanceRead.from_orm(item) for item in page.items],
+        next_cursor=page.next_cursor)
+
+@router.patch('/game-instances/{instance_id}/state', status_code=202)
+async def patch_game_state(
+    instance_id: uuid.UUID,
+    patch: Dict[str, Any],
+    start_time: datetime = Query(..., description="The instance's start_time, part of its key"),
+    current_user=Depends(get_current_user),
+):
+    """Merge a JSON merge patch (RFC 7386) into one of the current user's game states.
+
+    Instances are keyed by id and start_time, as the table is partitioned
+    by start_time. Only the changed keys are sent, and patches for the
+    same instance arriving within a short window are written together, so
+    the response only acknowledges receipt. Patches for instances that
+    turn out not to exist, or to belong to another user, are dropped,
+    logged and counted in game_state_patches_unmatched.
+    """
+    try:
+        state_patch_queue.submit((instance_id, start_time, current_user.id), patch)
+    except asyncio.QueueFull:
+        raise HTTPException(status_code=503, detail='Game state patch queue is full, retry later')
+    return {'status': 'Patch accepted'}
 
 @router.delete('/game-instances/{instance_id}', status_code=204)
-async def delete_game_instance(instance_id: int, crud: GameInstanceCRUD = Depends(get_game_instance_crud)):
-    existing_instance = await crud.get(instance_id)
-    if not existing_instance:
+async def delete_game_instance(
+    instance_id: uuid.UUID,
+    start_time: datetime = Query(..., description="The instance's start_time, part of its key"),
+    session: AsyncSession = Depends(get_async_session),
+    current_user=Depends(get_current_user),
+):
+    """Delete one of the current user's game instances."""
+    existing_instance = await crud_game_instance.get_by_id(session, instance_id, start_time)
+    if not existing_instance or existing_instance.user_id != current_user.id:
         raise HTTPException(status_code=404, detail='Game instance not found')
-    await crud.delete(instance_id)
\ No newline at end of file
+    await crud_game_instance.delete(session, existing_instance)
@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from llm_service.schemas import LLMCallRequest, LLMCallResponse, LLMCallLogRead
+from llm_service.schemas import LLMCallRequest, LLMCallResponse, LLMCallLogRead, LLMCallLogPage
 from llm_service.service import LLMIntegrationService
-from llm_service.crud import create_log, list_logs_by_user
+from llm_service.crud import create_log, list_logs_by_user, stream_logs_by_user
+from api.pagination import invalid_cursor, ndjson_response
+from crud.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from core.database import get_async_session
 from core.auth import get_current_user
 from core.logging import get_logger
@@ -36,13 +38,26 @@ async def call_llm_endpoint(
     return TaskStatus(task_id=task.id, status=task.status)
 
 
-@router.get("/logs", response_model=list[LLMCallLogRead], summary="List user's LLM call logs")
+@router.get("/logs", response_model=LLMCallLogPage, summary="List user's LLM call logs")
 async def get_logs(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+    stream: bool = Query(False, description="Stream every log after cursor as NDJSON"),
     session: AsyncSession = Depends(get_async_session),
     current_user=Depends(get_current_user),
 ):
-    """List all LLM call logs for the current user."""
+    """List the current user's LLM call logs, newest first, a page at a time."""
     logger.info(f"Listing LLM call logs for user: {current_user.email}")
-    logs = await list_logs_by_user(session, current_user.id)
+    try:
+        if stream:
+            user_id = current_user.id
+            return ndjson_response(
+                lambda stream_session: stream_logs_by_user(stream_session, user_id, cursor),
+                LLMCallLogRead)
+        page = await list_logs_by_user(session, current_user.id, limit, cursor)
+    except ValueError as e:
+        raise invalid_cursor(e)
     # Ensure orm_mode is True on LLMCallLogRead for serialization
-    return [LLMCallLogRead.from_orm(log) for log in logs]
+    return LLMCallLogPage(
+        items=[LLMCallLogRead.from_orm(log) for log in page.items],
+        next_cursor=page.next_cursor)
@@ -0,0 +1,41 @@
+"""Helpers for paginated and streamed list endpoints."""
+
+from typing import Any, AsyncIterator, Callable, Optional, Type
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def invalid_cursor(error: ValueError) -> HTTPException:
+    return HTTPException(status_code=400, detail=str(error))
+
+
+def ndjson_response(
+    rows: Callable[[AsyncSession], AsyncIterator[Any]],
+    schema: Type[BaseModel],
+    session_factory: Optional[Callable[[], AsyncSession]] = None
+) -> StreamingResponse:
+    """Stream rows as newline-delimited JSON, one ``schema`` object per line.
+
+    The response uses its own session, since it is still being written
+    after the endpoint returns and its dependencies are torn down. ``rows``
+    is called right away, so a bad cursor raises here rather than after
+    the response has started.
+    """
+    if session_factory is None:
+        from core.database import AsyncSessionLocal as session_factory
+
+    session = session_factory()
+    iterator = rows(session)
+
+    async def body() -> AsyncIterator[str]:
+        try:
+            async for row in iterator:
+                yield schema.from_orm(row).json() + "\n"
+        finally:
+            await session.close()
+
+    return StreamingResponse(body(), media_type=NDJSON_MEDIA_TYPE)
@@ -1,11 +1,15 @@
 """API router for AI Engine endpoints."""
 
-from typing import Dict, Any
+import asyncio
+import os
+from typing import Dict, Any, List
 from fastapi import APIRouter, Depends, HTTPException
+from pydantic import conlist
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.database import get_db
-from core.auth import get_current_user
+from core.database import AsyncSessionLocal, get_async_session
+from core.auth import get_current_admin, get_current_user, is_admin
+from core.logging import get_logger
 from core.ai_engine import (
     AIEngine,
     AdaptivePredictionEngine,
@@ -14,26 +18,87 @@ from core.ai_engine import (
     CollectiveWisdomAggregator,
     ExplainableAI
 )
-from schemas.user import User
-from schemas.game import GameState
+from core.principal_cache import UserSnapshot
+from core.ai_engine.checkpoint import FORMAT_NAME, FORMAT_VERSION
+from core.ai_engine.feedback import FeedbackQueue
+from core.metrics import REGISTRY
+from crud import ai_model as crud_ai_model
+from schemas.ai_engine import FeedbackRequest, GameState
+
+logger = get_logger(__name__)
 
 router = APIRouter(prefix="/ai", tags=["AI Engine"])
 
+# Row of the ai_models table that tracks the engine's weights checkpoint
+AI_MODEL_NAME = os.getenv("AI_MODEL_NAME", "ai-engine")
+AI_CHECKPOINT_DIR = os.getenv("AI_CHECKPOINT_DIR", "checkpoints")
+# Shared memory segment through which worker processes share model weights
+AI_SHARED_WEIGHTS = os.getenv("AI_SHARED_WEIGHTS")
+# Most game states accepted by one /predict/batch call
+AI_MAX_BATCH_SIZE = int(os.getenv("AI_MAX_BATCH_SIZE", "256"))
+
 # Initialize AI Engine components
 ai_engine = AIEngine()
 
+# Feedback is acknowledged immediately and applied in mini-batches
+feedback_queue = FeedbackQueue(ai_engine)
+
+# Per-game store sizes are read from the engine when metrics are scraped
+REGISTRY.callback(
+    "ai_engine_store_size",
+    "Games tracked by each per-game store.",
+    lambda: {key: size for key, (size, _) in ai_engine.store_stats().items()},
+    ("component", "store"))
+REGISTRY.callback(
+    "ai_engine_store_evictions",
+    "Entries or games evicted from each per-game store.",
+    lambda: {key: evictions for key, (_, evictions) in ai_engine.store_stats().items()},
+    ("component", "store"), type="counter")
+
 
 @router.on_event("startup")
 async def initialize_ai_engine():
-    """Initialize AI Engine components on startup."""
+    """Initialize AI Engine components and warm-start them from the latest checkpoint."""
     await ai_engine.initialize_components()
+    try:
+        async with AsyncSessionLocal() as session:
+            model = await crud_ai_model.get_by_name(session, AI_MODEL_NAME)
+        if model is not None and model.file_path:
+            ai_engine.load_checkpoint(model.file_path)
+    except Exception as e:
+        logger.warning(f"Starting AI Engine without checkpoint: {str(e)}")
+
+    if AI_SHARED_WEIGHTS:
+        ai_engine.share_weights(AI_SHARED_WEIGHTS)
+
+    feedback_queue.start()
+
+
+@router.on_event("shutdown")
+async def shutdown_ai_engine():
+    """Apply pending feedback, then release AI Engine worker resources."""
+    await feedback_queue.stop()
+    await ai_engine.shutdown()
+
+
+def _build_input(game_state: GameState, current_user: UserSnapshot) -> Dict[str, Any]:
+    """Prepare AI Engine input data for a game state."""
+    return {
+        "game_id": game_state.game_id,
+        "player_id": current_user.id,
+        "game_state": game_state.dict(),
+        "player_state": {
+            "id": current_user.id,
+            "profile": current_user.profile.dict() if current_user.profile else {}
+        }
+    }
 
 
 @router.post("/predict")
 async def predict_game_state(
     game_state: GameState,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_session)
 ) -> Dict[str, Any]:
     """
     Process current game state and make predictions.
@@ -44,18 +109,13 @@ async def predict_game_state(
     3. Makes predictions
     4. Aggregates collective wisdom
     5. Provides explanations
+
+    Steps 1-2 and 4-5 have no data dependency on each other and run
+    concurrently.
     """
     try:
         # Prepare input data
-        input_data = {
-            "game_id": game_state.game_id,
-            "player_id": current_user.id,
-            "game_state": game_state.dict(),
-            "player_state": {
-                "id": current_user.id,
-                "profile": current_user.profile.dict() if current_user.profile else {}
-            }
-        }
+        input_data = _build_input(game_state, current_user)
 
         # Process game state through AI Engine
         result = await ai_engine.process_game_state(input_data)
@@ -69,11 +129,38 @@ async def predict_game_state(
         )
 
 
-@router.post("/feedback")
+@router.post("/predict/batch")
+async def predict_game_states(
+    game_states: conlist(GameState, min_items=1, max_items=AI_MAX_BATCH_SIZE),
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_session)
+) -> List[Dict[str, Any]]:
+    """
+    Process several game states in one call and make predictions.
+
+    Runs the same pipeline as ``/predict`` but each component scores the
+    whole batch with stacked feature matrices. Results are returned in the
+    order of the submitted game states. Batches larger than
+    ``AI_MAX_BATCH_SIZE`` are rejected with 422.
+    """
+    try:
+        inputs = [_build_input(game_state, current_user)
+                  for game_state in game_states]
+
+        return await ai_engine.process_game_states(inputs)
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error processing game states: {str(e)}"
+        )
+
+
+@router.post("/feedback", status_code=202)
 async def provide_feedback(
-    feedback: Dict[str, Any],
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    feedback: FeedbackRequest,
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_session)
 ) -> Dict[str, str]:
     """
     Provide feedback to update AI models.
@@ -84,16 +171,30 @@ async def provide_feedback(
     - Uncertainty estimation accuracy
     - Collective wisdom relevance
     - Explanation clarity
+
+    Feedback is queued and applied to the models in mini-batches, so the
+    response only acknowledges receipt. Records the models could not apply,
+    such as gradients of the wrong length, are rejected with 422 instead.
     """
+    # Add user context to feedback
+    record = feedback.dict(exclude_none=True)
+    record["player_id"] = current_user.id
     try:
-        # Add user context to feedback
-        feedback["player_id"] = current_user.id
+        ai_engine.validate_feedback(record)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
 
-        # Update AI components with feedback
-        await ai_engine.update_components(feedback)
+    try:
+        # Queue feedback for the next model update
+        feedback_queue.submit(record)
 
-        return {"status": "Feedback processed successfully"}
+        return {"status": "Feedback accepted"}
 
+    except asyncio.QueueFull:
+        raise HTTPException(
+            status_code=503,
+            detail="Feedback queue is full, retry later"
+        )
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -101,15 +202,46 @@ async def provide_feedback(
         )
 
 
+@router.post("/checkpoint")
+async def save_checkpoint(
+    current_user: UserSnapshot = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_async_session)
+) -> Dict[str, Any]:
+    """
+    Save the current AI model weights as a new checkpoint.
+
+    The checkpoint is recorded on the engine's ``ai_models`` row, so worker
+    processes started afterwards load it instead of random weights. Only
+    users listed in ``ADMIN_USER_IDS`` may save checkpoints.
+    """
+    try:
+        path = ai_engine.save_checkpoint(
+            AI_CHECKPOINT_DIR, metadata={"saved_by": str(current_user.id)})
+        model = await crud_ai_model.record_checkpoint(
+            db,
+            AI_MODEL_NAME,
+            path,
+            config={"format": FORMAT_NAME, "format_version": FORMAT_VERSION},
+            metadata={"saved_by": str(current_user.id)}
+        )
+        return {"name": model.name, "file_path": model.file_path}
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error saving checkpoint: {str(e)}"
+        )
+
+
 @router.get("/cognitive-profile/{player_id}")
 async def get_cognitive_profile(
     player_id: str,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_session)
 ) -> Dict[str, Any]:
     """Get cognitive profile for a player."""
     try:
-        if current_user.id != player_id and not current_user.is_admin:
+        if str(current_user.id) != player_id and not is_admin(current_user):
             raise HTTPException(
                 status_code=403,
                 detail="Not authorized to access this profile"
@@ -143,8 +275,8 @@ async def get_cognitive_profile(
 @router.get("/collective-wisdom/{game_id}")
 async def get_collective_wisdom(
     game_id: str,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_session)
 ) -> Dict[str, Any]:
     """Get collective wisdom insights for a game."""
     try:
@@ -156,11 +288,7 @@ async def get_collective_wisdom(
             )
 
         # Get latest knowledge for the game
-        knowledge = next(
-            (k for k in reversed(wisdom_aggregator.knowledge_base)
-             if k.game_id == game_id),
-            None
-        )
+        knowledge = await ai_engine.latest("wisdom_aggregator", "knowledge_base", game_id)
 
         if not knowledge:
             raise HTTPException(
@@ -182,8 +310,8 @@ async def get_collective_wisdom(
 @router.get("/explanations/{game_id}")
 async def get_explanations(
     game_id: str,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_session)
 ) -> Dict[str, Any]:
     """Get AI explanations for a game."""
     try:
@@ -195,11 +323,7 @@ async def get_explanations(
             )
 
         # Get latest explanation for the game
-        explanation = next(
-            (e for e in reversed(xai_system.explanation_history)
-             if e.game_id == game_id),
-            None
-        )
+        explanation = await ai_engine.latest("xai_system", "explanation_history", game_id)
 
         if not explanation:
             raise HTTPException(
@@ -221,8 +345,8 @@ async def get_explanations(
 @router.get("/uncertainty/{game_id}")
 async def get_uncertainty_factors(
     game_id: str,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_session)
 ) -> Dict[str, Any]:
     """Get uncertainty factors for a game."""
     try:
@@ -234,11 +358,7 @@ async def get_uncertainty_factors(
             )
 
         # Get latest uncertainty factors for the game
-        factors = next(
-            (f for f in reversed(uncertainty_generator.uncertainty_history)
-             if f.game_id == game_id),
-            None
-        )
+        factors = await ai_engine.latest("quantum_generator", "uncertainty_history", game_id)
 
         if not factors:
             raise HTTPException(
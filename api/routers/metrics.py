@@ -0,0 +1,14 @@
+"""API router exposing metrics to Prometheus."""
+
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from core.metrics import CONTENT_TYPE, REGISTRY
+
+router = APIRouter(tags=["Monitoring"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics() -> Response:
+    """Return the process's metrics in the Prometheus text format."""
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from schemas.user import UserRead, UserUpdate
 from schemas.cognitive_profile import CognitiveProfileRead, CognitiveProfileUpdate
-from crud.user import update_user
+from crud.user import get_user_by_id, update_user
 from crud.cognitive_profile import get_by_user_id, create_profile, update_profile
 from core.database import get_async_session
 from core.auth import get_current_user
@@ -77,7 +77,11 @@ async def update_profile_info(
     Update the current user's profile information. Only provided fields will be updated.
     """
     logger.info(f"Profile update attempt for user: {current_user.email}")
-    user = await update_user(session, current_user, user_update)
+    # current_user is a cached snapshot; update the row itself
+    user = await get_user_by_id(session, current_user.id)
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found.")
+    user = await update_user(session, user, user_update)
     logger.info(f"Profile updated for user: {user.email}")
     return UserRead.from_orm(user)
 
@@ -0,0 +1,303 @@
+"""Micro- and macro-benchmarks for the AI Engine.
+
+Each AI component's ``process``/``update`` is timed on its own, and
+the full ``AIEngine`` pipeline is timed end to end, on synthetic games at
+several batch sizes and history depths. Results report throughput,
+p50/p99 latency and the peak memory a call allocates, and can be saved
+as a JSON baseline or compared against one::
+
+    python -m benchmarks.ai_engine --output benchmarks/baseline.json
+    python -m benchmarks.ai_engine --compare benchmarks/baseline.json
+
+Comparison exits with status 1 when a case's throughput drops, or its
+p99 latency or peak allocation rises, by more than ``--threshold``
+relative to the baseline.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+import tracemalloc
+import numpy as np
+
+from core.ai_engine import AIEngine
+from core.ai_engine.collective import FEATURE_INDEX
+from core.ai_engine.executors import DEFAULT_EXECUTOR, create_executor
+
+GAME_COUNTS = (1, 100, 10000)
+HISTORY_DEPTHS = (10, 1000)
+# Skip configurations whose history prefill would exceed this many entries
+MAX_PREFILL = 1_000_000
+# Players shared by the synthetic games, so cognitive profiles repeat
+PLAYER_POOL = 1000
+# Growth in peak allocation below this is noise, however large relatively
+MIN_ALLOC_REGRESSION_MB = 1.0
+
+
+def game_state_keys(engine: AIEngine) -> List[str]:
+    """Return every game state key read by the engine's components."""
+    keys = dict.fromkeys(FEATURE_INDEX)
+    for extractor in engine.cognitive_builder.extractors.values():
+        keys.update(dict.fromkeys(extractor["sources"]))
+    for model in engine.prediction_engine.models.values():
+        keys.update(dict.fromkeys(model["features"]))
+    for analyzer in engine.xai_system.analyzers.values():
+        keys.update(dict.fromkeys(f"{feature}_value" for feature in analyzer["features"]))
+    keys["complexity"] = None
+    return list(keys)
+
+
+def make_game_states(engine: AIEngine, count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Generate pipeline inputs for ``count`` distinct games."""
+    rng = np.random.default_rng(seed)
+    keys = game_state_keys(engine)
+    values = rng.uniform(0.0, 1.0, size=(count, len(keys)))
+    return [
+        {
+            "game_id": f"game-{index}",
+            "player_id": f"player-{index % PLAYER_POOL}",
+            "game_state": dict(zip(keys, row.tolist())),
+        }
+        for index, row in enumerate(values)
+    ]
+
+
+def make_feedback(
+    engine: AIEngine,
+    component: str,
+    inputs: List[Dict[str, Any]],
+    seed: int = 0
+) -> List[Dict[str, Any]]:
+    """Generate one feedback record per input for a component's update."""
+    rng = np.random.default_rng(seed)
+    groups: Dict[str, int] = {}
+    for attribute in ("feature_weights", "pattern_weights", "strategy_weights"):
+        weights = getattr(getattr(engine, component), attribute, None)
+        if isinstance(weights, dict):
+            groups.update({name: len(value) for name, value in weights.items()})
+
+    feedbacks = []
+    for item in inputs:
+        feedback = {
+            "game_id": item["game_id"],
+            "player_id": item["player_id"],
+            "game_state": item["game_state"],
+            "actual_outcome": {"value": float(rng.integers(0, 2))},
+            "uncertainty_accuracy": float(rng.uniform()),
+        }
+        for group, size in groups.items():
+            feedback[f"{group}_accuracy"] = float(rng.uniform())
+            feedback[f"{group}_gradient"] = rng.normal(size=size).tolist()
+        feedbacks.append(feedback)
+    return feedbacks
+
+
+async def peak_alloc_mb(call: Callable[[], Awaitable[Any]]) -> float:
+    """Return the peak memory allocated during one call, in MiB.
+
+    Traced on a call of its own, as tracing slows the timed ones down.
+    Only this process's allocations are seen, not a process executor's
+    workers.
+    """
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        await call()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+    return max(peak - baseline, 0) / (1024 * 1024)
+
+
+async def measure(
+    call: Callable[[], Awaitable[Any]],
+    games: int,
+    min_time: float,
+    min_rounds: int = 3,
+    max_rounds: int = 1000
+) -> Dict[str, float]:
+    """Time repeated calls, each handling ``games`` games."""
+    latencies = []
+    started = time.perf_counter()
+    while len(latencies) < max_rounds and (
+            len(latencies) < min_rounds or time.perf_counter() - started < min_time):
+        start = time.perf_counter()
+        await call()
+        latencies.append(time.perf_counter() - start)
+    total = sum(latencies)
+    return {
+        "rounds": len(latencies),
+        "throughput": games * len(latencies) / total,
+        "p50_ms": float(np.percentile(latencies, 50) * 1000),
+        "p99_ms": float(np.percentile(latencies, 99) * 1000),
+        "peak_alloc_mb": await peak_alloc_mb(call),
+    }
+
+
+def configurations(
+    game_counts: Sequence[int],
+    history_depths: Sequence[int]
+) -> Iterator[Tuple[int, int]]:
+    for games in game_counts:
+        for history in history_depths:
+            if games * history <= MAX_PREFILL:
+                yield games, history
+
+
+async def prefill(engine: AIEngine, inputs: List[Dict[str, Any]], history: int) -> None:
+    """Run the pipeline ``history`` times so per-game stores hold history."""
+    for _ in range(history):
+        await engine.process_game_states(inputs)
+
+
+async def run_benchmarks(
+    game_counts: Sequence[int] = GAME_COUNTS,
+    history_depths: Sequence[int] = HISTORY_DEPTHS,
+    min_time: float = 1.0,
+    executor: str = DEFAULT_EXECUTOR,
+    selected: Optional[str] = None,
+    report: Callable[[str, Dict[str, float]], None] = lambda name, result: None
+) -> Dict[str, Dict[str, float]]:
+    """Run every benchmark case and return its results by case name."""
+    results: Dict[str, Dict[str, float]] = {}
+
+    async def case(name: str, games: int, history: int, call: Callable[[], Awaitable[Any]]) -> None:
+        if selected and selected not in name:
+            return
+        result = {"games": games, "history": history,
+                  **await measure(call, games, min_time)}
+        results[name] = result
+        report(name, result)
+
+    for games, history in configurations(game_counts, history_depths):
+        engine = AIEngine(executor=create_executor(executor))
+        await engine.initialize_components()
+        try:
+            inputs = make_game_states(engine, games)
+            await prefill(engine, inputs, history)
+            suffix = f"games={games},history={history}"
+
+            for name, component in engine.components.items():
+                if games == 1:
+                    await case(f"{name}.process[{suffix}]", games, history,
+                               lambda component=component: component.process(inputs[0]))
+                else:
+                    await case(f"{name}.process_batch[{suffix}]", games, history,
+                               lambda component=component: component.process_batch(inputs))
+
+            for name, component in engine.components.items():
+                feedbacks = make_feedback(engine, name, inputs)
+                if games == 1:
+                    await case(f"{name}.update[{suffix}]", games, history,
+                               lambda component=component, feedbacks=feedbacks:
+                               component.update(feedbacks[0]))
+                else:
+                    await case(f"{name}.update_batch[{suffix}]", games, history,
+                               lambda component=component, feedbacks=feedbacks:
+                               component.update_batch(feedbacks))
+
+            if games == 1:
+                await case(f"engine.process_game_state[{suffix}]", games, history,
+                           lambda: engine.process_game_state(inputs[0]))
+            else:
+                await case(f"engine.process_game_states[{suffix}]", games, history,
+                           lambda: engine.process_game_states(inputs))
+        finally:
+            await engine.shutdown()
+
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float
+) -> List[str]:
+    """Return a description of every case that regressed against the baseline."""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        if result["throughput"] < reference["throughput"] * (1 - threshold):
+            regressions.append(
+                f"{name}: throughput {result['throughput']:.1f}/s "
+                f"vs baseline {reference['throughput']:.1f}/s")
+        if result["p99_ms"] > reference["p99_ms"] * (1 + threshold):
+            regressions.append(
+                f"{name}: p99 {result['p99_ms']:.3f} ms "
+                f"vs baseline {reference['p99_ms']:.3f} ms")
+        if "peak_alloc_mb" in result and "peak_alloc_mb" in reference and (
+                result["peak_alloc_mb"] > reference["peak_alloc_mb"] * (1 + threshold)
+                + MIN_ALLOC_REGRESSION_MB):
+            regressions.append(
+                f"{name}: peak allocation {result['peak_alloc_mb']:.1f} MiB "
+                f"vs baseline {reference['peak_alloc_mb']:.1f} MiB")
+    return regressions
+
+
+def environment() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+    }
+
+
+def _sizes(text: str) -> List[int]:
+    return [int(value) for value in text.split(",") if value]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the AI engine.")
+    parser.add_argument("--games", type=_sizes, default=list(GAME_COUNTS),
+                        help="comma separated batch sizes (default: 1,100,10000)")
+    parser.add_argument("--history", type=_sizes, default=list(HISTORY_DEPTHS),
+                        help="comma separated history depths (default: 10,1000)")
+    parser.add_argument("--min-time", type=float, default=1.0,
+                        help="seconds to spend timing each case")
+    parser.add_argument("--executor", default=DEFAULT_EXECUTOR,
+                        help="inline, thread or process")
+    parser.add_argument("--filter", help="only run cases whose name contains this")
+    parser.add_argument("--output", help="write results as a JSON baseline")
+    parser.add_argument("--compare", help="compare against a JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="relative change that counts as a regression")
+    args = parser.parse_args(argv)
+
+    def report(name: str, result: Dict[str, float]) -> None:
+        print(f"{name:<72} {result['throughput']:>12.1f}/s "
+              f"p50 {result['p50_ms']:>9.3f} ms  p99 {result['p99_ms']:>9.3f} ms  "
+              f"alloc {result['peak_alloc_mb']:>7.1f} MiB", flush=True)
+
+    results = asyncio.run(run_benchmarks(
+        args.games, args.history, args.min_time, args.executor, args.filter, report))
+
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump({"environment": environment(), "results": results},
+                      handle, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as handle:
+            baseline = json.load(handle)
+        regressions = compare(results, baseline["results"], args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print(f"No regressions against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,384 @@
+"""Load test for the FastAPI service with in-process stand-ins.
+
+The application is served in process over ``httpx.ASGITransport``, so no
+network, PostgreSQL, Redis or LLM provider is needed: ``core.database``
+is pointed at a throwaway SQLite file, Celery runs tasks eagerly with
+in-memory transports, and outbound LLM calls return a canned response
+after a configurable delay. Concurrent clients replay a weighted mix of
+requests for a fixed duration and the run reports requests per second,
+tail latency per scenario, and how far the event loop fell behind::
+
+    python -m benchmarks.load --concurrency 64 --duration 30 \\
+        --mix predict=6,profile=2,me=1,login=1
+
+SQLite needs the ``aiosqlite`` driver installed.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import numpy as np
+import httpx
+
+Scenario = Callable[[httpx.AsyncClient, Dict[str, Any]], Awaitable[httpx.Response]]
+
+DEFAULT_MIX = "predict=6,profile=2,me=1,login=1"
+DEFAULT_CONCURRENCY = 32
+DEFAULT_DURATION = 10.0
+DEFAULT_USERS = 8
+# Simulated round trip of an outbound LLM call, in seconds
+DEFAULT_LLM_LATENCY = 0.05
+# How often the event loop lag monitor wakes up, in seconds
+LAG_INTERVAL = 0.01
+PASSWORD = "load-test-password"
+
+
+def install_stand_ins(workdir: str, llm_latency: float = DEFAULT_LLM_LATENCY) -> None:
+    """Swap external services for in-process stand-ins.
+
+    Must run before the application is imported: ``core.database`` and
+    ``core.auth`` read their settings at import time.
+    """
+    from sqlalchemy.dialects.postgresql import JSONB
+    from sqlalchemy.ext.compiler import compiles
+
+    os.environ.setdefault(
+        "DATABASE_URL", f"sqlite+aiosqlite:///{os.path.join(workdir, 'loadtest.db')}")
+    os.environ.setdefault("SECRET_KEY", "load-test-secret")
+
+    @compiles(JSONB, "sqlite")
+    def _compile_jsonb(type_, compiler, **kw):
+        return "JSON"
+
+    from core.celery_app import celery_app
+    celery_app.conf.update(
+        task_always_eager=True,
+        task_eager_propagates=True,
+        broker_url="memory://",
+        result_backend="cache+memory://",
+    )
+
+    from llm_service.service import LLMService
+
+    def generate_response(self, prompt: str) -> str:
+        time.sleep(llm_latency)
+        return f"stub response to {len(prompt)} characters"
+
+    LLMService.generate_response = generate_response
+
+
+async def create_schema() -> None:
+    """Create every table on the stand-in database."""
+    from core import database
+    from models.user import Base
+    import models.ai_model  # noqa: F401
+    import models.cognitive_profile  # noqa: F401
+    import models.game_definition  # noqa: F401
+    import models.game_instance  # noqa: F401
+    import llm_service.models  # noqa: F401
+
+    # Statement echo would dominate the measurements
+    database.engine.echo = False
+    async with database.engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+
+
+def load_app(path: str) -> Any:
+    """Import an ASGI application given as ``module:attribute``."""
+    module_name, _, attribute = path.partition(":")
+    return getattr(importlib.import_module(module_name), attribute or "app")
+
+
+def parse_mix(text: str, scenarios: Dict[str, Scenario]) -> Dict[str, float]:
+    """Parse ``name=weight,...`` into normalized scenario weights."""
+    weights: Dict[str, float] = {}
+    for item in text.split(","):
+        if not item.strip():
+            continue
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in scenarios:
+            raise ValueError(f"Unknown scenario: {name}")
+        weights[name] = float(weight) if weight else 1.0
+        if weights[name] < 0:
+            raise ValueError(f"Negative weight for scenario: {name}")
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("Request mix must have a positive total weight")
+    return {name: weight / total for name, weight in weights.items() if weight > 0}
+
+
+def _auth(session: Dict[str, Any]) -> Dict[str, str]:
+    return {"Authorization": f"Bearer {session['token']}"}
+
+
+def _game_state(session: Dict[str, Any]) -> Dict[str, Any]:
+    rng: random.Random = session["rng"]
+    return {
+        "game_id": f"game-{rng.randrange(1000)}",
+        "state_type": "in_progress",
+        "player_states": {
+            session["email"]: {"score": rng.uniform(0, 100), "moves": rng.randrange(50)}
+        },
+        "game_variables": {
+            "complexity": rng.uniform(0, 1),
+            "turn": rng.randrange(100),
+        },
+    }
+
+
+async def _predict(client: httpx.AsyncClient, session: Dict[str, Any]) -> httpx.Response:
+    return await client.post("/ai/predict", json=_game_state(session), headers=_auth(session))
+
+
+async def _login(client: httpx.AsyncClient, session: Dict[str, Any]) -> httpx.Response:
+    return await client.post(
+        "/auth/login", json={"email": session["email"], "password": PASSWORD})
+
+
+async def _me(client: httpx.AsyncClient, session: Dict[str, Any]) -> httpx.Response:
+    return await client.get("/auth/me", headers=_auth(session))
+
+
+async def _profile(client: httpx.AsyncClient, session: Dict[str, Any]) -> httpx.Response:
+    return await client.get("/users/me/profile", headers=_auth(session))
+
+
+async def _cognitive_profile(client: httpx.AsyncClient, session: Dict[str, Any]) -> httpx.Response:
+    return await client.get("/users/me/cognitive-profile", headers=_auth(session))
+
+
+async def _llm_call(client: httpx.AsyncClient, session: Dict[str, Any]) -> httpx.Response:
+    return await client.post("/llm/call", headers=_auth(session), json={
+        "provider": "openai",
+        "model": "load-test",
+        "prompt": "Summarize the current game state.",
+    })
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "predict": _predict,
+    "login": _login,
+    "me": _me,
+    "profile": _profile,
+    "cognitive_profile": _cognitive_profile,
+    "llm_call": _llm_call,
+}
+
+
+async def create_sessions(client: httpx.AsyncClient, users: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Register and log in ``users`` users, returning their client sessions."""
+    sessions = []
+    for index in range(users):
+        email = f"load-{index}@example.com"
+        response = await client.post("/auth/register", json={
+            "username": f"load-{index}", "email": email, "password": PASSWORD})
+        if response.status_code not in (201, 400):
+            response.raise_for_status()
+        response = await client.post("/auth/login", json={"email": email, "password": PASSWORD})
+        response.raise_for_status()
+        sessions.append({
+            "email": email,
+            "token": response.json()["access_token"],
+            "rng": random.Random(seed + index),
+        })
+    return sessions
+
+
+class LoopLagMonitor:
+    """Samples how late the event loop wakes a sleeping task.
+
+    A task asks to sleep ``interval`` seconds; anything beyond that before
+    it runs again is time the loop spent blocked on other work.
+    """
+
+    def __init__(self, interval: float = LAG_INTERVAL):
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+        self._sleeping_since: Optional[float] = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._sleeping_since = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - self._sleeping_since - self.interval))
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            # A loop starved until now never woke the monitor; count that too
+            if self._sleeping_since is not None:
+                overdue = asyncio.get_running_loop().time() - self._sleeping_since - self.interval
+                if overdue > 0:
+                    self.samples.append(overdue)
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def summary(self) -> Dict[str, float]:
+        if not self.samples:
+            return {"samples": 0, "p50_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+        return {
+            "samples": len(self.samples),
+            "p50_ms": float(np.percentile(self.samples, 50) * 1000),
+            "p99_ms": float(np.percentile(self.samples, 99) * 1000),
+            "max_ms": float(max(self.samples) * 1000),
+        }
+
+
+def summarize(
+    latencies: Dict[str, List[float]],
+    errors: Dict[str, int],
+    elapsed: float
+) -> Dict[str, Dict[str, float]]:
+    """Return count, errors, RPS and latency percentiles per scenario and overall."""
+    def stats(values: Sequence[float], failed: int) -> Dict[str, float]:
+        result = {
+            "requests": len(values),
+            "errors": failed,
+            "rps": len(values) / elapsed if elapsed > 0 else 0.0,
+        }
+        for percentile in (50, 95, 99):
+            result[f"p{percentile}_ms"] = (
+                float(np.percentile(values, percentile) * 1000) if values else 0.0)
+        return result
+
+    report = {name: stats(values, errors.get(name, 0)) for name, values in sorted(latencies.items())}
+    report["total"] = stats(
+        [value for values in latencies.values() for value in values], sum(errors.values()))
+    return report
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    sessions: Sequence[Dict[str, Any]],
+    mix: Dict[str, float],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    duration: float = DEFAULT_DURATION,
+    scenarios: Dict[str, Scenario] = SCENARIOS,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """Drive ``concurrency`` clients through the request mix for ``duration`` seconds.
+
+    A request fails when it raises or answers with a 4xx/5xx status; its
+    latency is recorded either way.
+    """
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    latencies: Dict[str, List[float]] = {name: [] for name in names}
+    errors: Dict[str, int] = {}
+    monitor = LoopLagMonitor()
+
+    async def worker(index: int, deadline: float) -> None:
+        rng = random.Random(seed + index)
+        session = sessions[index % len(sessions)]
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            start = time.perf_counter()
+            try:
+                response = await scenarios[name](client, session)
+                failed = response.status_code >= 400
+            except Exception:
+                failed = True
+            latencies[name].append(time.perf_counter() - start)
+            if failed:
+                errors[name] = errors.get(name, 0) + 1
+            # In-process requests can complete without suspending; yield so
+            # the other clients and the lag monitor get their turn
+            await asyncio.sleep(0)
+
+    monitor.start()
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(
+            worker(index, started + duration) for index in range(concurrency)))
+    finally:
+        await monitor.stop()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "concurrency": concurrency,
+        "duration": elapsed,
+        "scenarios": summarize(latencies, errors, elapsed),
+        "loop_lag": monitor.summary(),
+    }
+
+
+async def load_test(
+    app_path: str = "main:app",
+    mix: str = DEFAULT_MIX,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    duration: float = DEFAULT_DURATION,
+    users: int = DEFAULT_USERS,
+    llm_latency: float = DEFAULT_LLM_LATENCY,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """Boot the application on stand-ins, seed users and run the load."""
+    weights = parse_mix(mix, SCENARIOS)
+    with tempfile.TemporaryDirectory(prefix="loadtest-") as workdir:
+        install_stand_ins(workdir, llm_latency)
+        app = load_app(app_path)
+        await create_schema()
+
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+                sessions = await create_sessions(client, users, seed)
+                return await run_load(client, sessions, weights, concurrency, duration, seed=seed)
+
+
+def report(result: Dict[str, Any]) -> None:
+    print(f"{'scenario':<20} {'requests':>9} {'errors':>7} {'rps':>10} "
+          f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, stats in result["scenarios"].items():
+        print(f"{name:<20} {stats['requests']:>9} {stats['errors']:>7} {stats['rps']:>10.1f} "
+              f"{stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f}")
+    lag = result["loop_lag"]
+    print(f"event loop lag: p50 {lag['p50_ms']:.2f} ms  p99 {lag['p99_ms']:.2f} ms  "
+          f"max {lag['max_ms']:.2f} ms over {lag['samples']} samples")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load test the API in process.")
+    parser.add_argument("--app", default="main:app", help="ASGI application as module:attribute")
+    parser.add_argument("--mix", default=DEFAULT_MIX,
+                        help=f"weighted scenarios, from: {', '.join(SCENARIOS)}")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION,
+                        help="seconds to generate load for")
+    parser.add_argument("--users", type=int, default=DEFAULT_USERS,
+                        help="registered users the clients share")
+    parser.add_argument("--llm-latency", type=float, default=DEFAULT_LLM_LATENCY,
+                        help="seconds each stubbed LLM call takes")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write results as JSON")
+    args = parser.parse_args(argv)
+
+    result = asyncio.run(load_test(
+        args.app, args.mix, args.concurrency, args.duration,
+        args.users, args.llm_latency, args.seed))
+    report(result)
+
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(result, handle, indent=2, sort_keys=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,6 +15,7 @@ from .cognitive import CognitiveModelBuilder
 from .quantum import QuantumUncertaintyGenerator
 from .collective import CollectiveWisdomAggregator
 from .xai import ExplainableAI
+from .history import HistoryStore
 
 __all__ = [
     'AIEngine',
@@ -23,4 +24,5 @@ __all__ = [
     'QuantumUncertaintyGenerator',
     'CollectiveWisdomAggregator',
     'ExplainableAI',
+    'HistoryStore',
 ]
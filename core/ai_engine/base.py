@@ -1,9 +1,19 @@
 """Base class for the AI Engine components."""
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Hashable, List, NamedTuple, Optional, Tuple
 from abc import ABC, abstractmethod
+import asyncio
+import copy
+import functools
 import logging
+import time
+import numpy as np
 from pydantic import BaseModel
+from core.metrics import REGISTRY, SIZE_BUCKETS
+from .checkpoint import CheckpointError, load_checkpoint, save_checkpoint
+from .executors import DEFAULT_EXECUTOR, ComponentExecutor, create_executor
+from .feedback import merge_feedback
+from .shared import SharedWeights
 
 logger = logging.getLogger(__name__)
 
@@ -21,21 +31,165 @@ class AIComponent(ABC):
         """Process input data and return results."""
         pass
 
+    async def process_batch(self, inputs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Process several inputs at once, returning one result per input.
+
+        Components override this with a vectorized implementation; the
+        default simply processes the inputs one after another.
+        """
+        return [await self.process(input_data) for input_data in inputs]
+
     @abstractmethod
     async def update(self, feedback: Dict[str, Any]) -> None:
         """Update the component based on feedback."""
         pass
 
+    async def update_batch(self, feedbacks: List[Dict[str, Any]]) -> None:
+        """Apply several feedback records with a single weight update.
+
+        The default averages the records' signals (see ``merge_feedback``)
+        and applies them once; components whose feedback cannot simply be
+        averaged override this.
+        """
+        await self.update(merge_feedback(feedbacks))
+
+    def validate_feedback(self, feedback: Dict[str, Any]) -> None:
+        """Raise ``ValueError`` if ``update`` could not apply a feedback record."""
+        pass
+
+    def get_parameters(self) -> Dict[str, np.ndarray]:
+        """Return the component's learned parameters by name."""
+        return {}
+
+    def stores(self) -> Dict[str, Any]:
+        """Return the component's per-game stores by name, for metrics.
+
+        Stores are sized containers that count their ``evictions``.
+        """
+        return {}
+
+    def set_parameters(self, parameters: Dict[str, np.ndarray]) -> None:
+        """Replace learned parameters, e.g. with arrays from a checkpoint.
+
+        Components keep the given arrays rather than copying them, so
+        memory-mapped checkpoints stay shared between processes.
+        """
+        pass
+
+    def shared_state(self) -> List[Any]:
+        """Return the state a staged copy shares instead of copying.
+
+        Defaults to the per-game stores, which requests keep writing to
+        while an update is being staged.
+        """
+        return list(self.stores().values())
+
+    def stage(self) -> "AIComponent":
+        """Return a private copy of the component to apply feedback to.
+
+        The copy owns its parameters, so requests keep being served with
+        the current weights until ``adopt`` takes the updated ones, and a
+        failed update leaves the component untouched.
+        """
+        memo = {id(value): value for value in self.shared_state()}
+        staged = copy.deepcopy(self, memo)
+        staged.set_parameters({
+            name: np.array(value) for name, value in self.get_parameters().items()
+        })
+        return staged
+
+    def adopt(self, staged: "AIComponent") -> None:
+        """Take the parameters a staged copy (see ``stage``) was updated to.
+
+        Parameters are rebound rather than written in place, so a request
+        sees either the old weights or the new ones, never a mix.
+        """
+        self.set_parameters(staged.get_parameters())
+
+
+class PipelineStage(NamedTuple):
+    """A node in the game state processing graph.
+
+    The stage's output is stored under ``name`` and handed to every
+    downstream stage that lists it in ``depends_on``.
+    """
+    name: str
+    component: str
+    depends_on: Tuple[str, ...] = ()
+    offload: bool = True
+
+
+# Stages are listed in topological order. Dependencies reflect the inputs
+# each component actually reads: the cognitive builder ignores uncertainty
+# and the XAI system ignores aggregated wisdom, so both can run alongside
+# their former predecessors.
+PIPELINE_STAGES: Tuple[PipelineStage, ...] = (
+    PipelineStage("uncertainty", "quantum_generator"),
+    PipelineStage("cognitive_state", "cognitive_builder", offload=False),
+    PipelineStage(
+        "predictions", "prediction_engine", ("cognitive_state", "uncertainty")),
+    PipelineStage(
+        "aggregated_wisdom", "wisdom_aggregator", ("predictions", "cognitive_state")),
+    PipelineStage(
+        "explanations", "xai_system", ("predictions", "cognitive_state")),
+)
+
+# Key order of the result returned by ``AIEngine.process_game_state``.
+RESULT_KEYS: Tuple[str, ...] = (
+    "predictions",
+    "cognitive_state",
+    "uncertainty",
+    "aggregated_wisdom",
+    "explanations",
+)
+
+# Components in the order feedback is applied to them.
+UPDATE_ORDER: Tuple[str, ...] = (
+    "prediction_engine",
+    "cognitive_builder",
+    "quantum_generator",
+    "wisdom_aggregator",
+    "xai_system",
+)
+
+STAGE_LATENCY = REGISTRY.histogram(
+    "ai_engine_stage_latency_seconds",
+    "Wall time of a pipeline stage call.",
+    ("stage", "mode"))
+STAGE_INPUT_SIZE = REGISTRY.histogram(
+    "ai_engine_stage_input_size",
+    "Games handed to a pipeline stage per call.",
+    ("stage", "mode"), SIZE_BUCKETS)
+STAGE_ERRORS = REGISTRY.counter(
+    "ai_engine_stage_errors",
+    "Pipeline stage calls that raised an exception.",
+    ("stage", "mode"))
+PIPELINE_LATENCY = REGISTRY.histogram(
+    "ai_engine_pipeline_latency_seconds",
+    "Wall time of processing game states through the whole pipeline.",
+    ("mode",))
+
 
 class AIEngine:
     """Main AI Engine class that orchestrates all AI components."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        executor: Optional[ComponentExecutor] = None
+    ):
         self.prediction_engine: Optional['AdaptivePredictionEngine'] = None
         self.cognitive_builder: Optional['CognitiveModelBuilder'] = None
         self.quantum_generator: Optional['QuantumUncertaintyGenerator'] = None
         self.wisdom_aggregator: Optional['CollectiveWisdomAggregator'] = None
         self.xai_system: Optional['ExplainableAI'] = None
+        self.stages: Tuple[PipelineStage, ...] = PIPELINE_STAGES
+        self.max_workers = max_workers
+        # Where offloaded stages run: inline, on threads or in worker processes
+        self.executor: ComponentExecutor = executor or create_executor(
+            DEFAULT_EXECUTOR, max_workers)
+        self.shared_weights: Optional[SharedWeights] = None
+        self._parameters_changed = False
 
     async def initialize_components(self) -> None:
         """Initialize all AI components."""
@@ -59,61 +213,247 @@ class AIEngine:
 
         logger.info("All AI components initialized successfully")
 
+    async def shutdown(self) -> None:
+        """Release the executor's workers and detach from shared weights."""
+        self.executor.shutdown()
+        if self.shared_weights is not None:
+            self.shared_weights.close(self)
+            self.shared_weights = None
+
+    def share_weights(self, name: str, grace_period: float = 1.0) -> None:
+        """Serve model weights from a shared memory segment.
+
+        Every worker process attaching to the same ``name`` reads the same
+        weights without copying them, and feedback updates applied by any
+        worker become visible to all of them.
+        """
+        self.shared_weights = SharedWeights.open(name, self, grace_period)
+
+    @property
+    def components(self) -> Dict[str, AIComponent]:
+        """Initialized components by attribute name."""
+        names = dict.fromkeys(stage.component for stage in self.stages)
+        return {name: getattr(self, name) for name in names
+                if getattr(self, name) is not None}
+
+    def store_stats(self) -> Dict[Tuple[str, str], Tuple[int, int]]:
+        """Return the size and eviction count of every per-game store.
+
+        Keys are ``(component, store)``. With a process executor the stores
+        of offloaded components live in the worker processes, and their
+        stats are those the workers last reported.
+        """
+        return self.executor.store_stats(self)
+
+    async def latest(self, component: str, store: str, game_id: Hashable) -> Any:
+        """Return the latest entry for a game in a component's per-game store.
+
+        With a process executor the lookup runs in the worker owning the game.
+        """
+        return await self.executor.latest(self, component, store, game_id)
+
+    def save_checkpoint(self, root: str, metadata: Optional[Dict[str, Any]] = None) -> str:
+        """Write all component parameters as a new checkpoint version."""
+        parameters = {name: component.get_parameters()
+                      for name, component in self.components.items()}
+        return save_checkpoint(parameters, root, metadata)
+
+    def load_checkpoint(self, path: str) -> None:
+        """Replace component parameters with those of a checkpoint.
+
+        Every array is checked against the current parameters before any
+        component is modified, so an incompatible checkpoint leaves the
+        engine untouched.
+        """
+        checkpoint = load_checkpoint(path)
+        components = self.components
+        for name, parameters in checkpoint.items():
+            if name not in components:
+                raise CheckpointError(f"Checkpoint has unknown component {name}")
+            current = components[name].get_parameters()
+            for key, value in parameters.items():
+                if key not in current or np.shape(current[key]) != value.shape:
+                    raise CheckpointError(
+                        f"Checkpoint parameter {name}.{key} does not fit the component")
+
+        for name, parameters in checkpoint.items():
+            components[name].set_parameters(parameters)
+        self._parameters_changed = True
+        logger.info(f"Loaded AI Engine checkpoint from {path}")
+
     async def process_game_state(self, game_state: Dict[str, Any]) -> Dict[str, Any]:
-        """Process the current game state through all AI components."""
+        """Process the current game state through all AI components.
+
+        Stages are scheduled as soon as their dependencies resolve, so
+        independent stages run concurrently and the latency of a call
+        tracks the critical path of the graph rather than its sum.
+        """
+        start = time.perf_counter()
+        await self._refresh_weights()
+        tasks: Dict[str, asyncio.Future] = {}
         try:
-            # Generate quantum uncertainty factors
-            uncertainty = await self.quantum_generator.process(game_state)
+            for stage in self.stages:
+                tasks[stage.name] = asyncio.ensure_future(
+                    self._run_stage(stage, game_state, tasks))
 
-            # Build/update cognitive model
-            cognitive_state = await self.cognitive_builder.process({
-                **game_state,
-                "uncertainty": uncertainty
-            })
+            outputs = await asyncio.gather(*tasks.values())
+            results = dict(zip(tasks, outputs))
 
-            # Make predictions
-            predictions = await self.prediction_engine.process({
-                **game_state,
-                "cognitive_state": cognitive_state,
-                "uncertainty": uncertainty
-            })
+            return {key: results[key] for key in RESULT_KEYS}
 
-            # Aggregate collective wisdom
-            aggregated_wisdom = await self.wisdom_aggregator.process({
-                **game_state,
-                "predictions": predictions,
-                "cognitive_state": cognitive_state
-            })
+        except Exception as e:
+            for task in tasks.values():
+                task.cancel()
+            logger.error(f"Error processing game state: {str(e)}")
+            raise
+
+        finally:
+            PIPELINE_LATENCY.observe(time.perf_counter() - start, "single")
+
+    async def process_game_states(
+        self,
+        game_states: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Process a batch of game states through all AI components.
+
+        Each stage runs once for the whole batch via the components'
+        ``process_batch``, so features are stacked into matrices instead of
+        being scored one game at a time.
+        """
+        start = time.perf_counter()
+        await self._refresh_weights()
+        tasks: Dict[str, asyncio.Future] = {}
+        try:
+            for stage in self.stages:
+                tasks[stage.name] = asyncio.ensure_future(
+                    self._run_batch_stage(stage, game_states, tasks))
+
+            outputs = await asyncio.gather(*tasks.values())
+            results = dict(zip(tasks, outputs))
+
+            return [
+                {key: results[key][index] for key in RESULT_KEYS}
+                for index in range(len(game_states))
+            ]
+
+        except Exception as e:
+            for task in tasks.values():
+                task.cancel()
+            logger.error(f"Error processing game state batch: {str(e)}")
+            raise
 
-            # Generate explanations
-            explanations = await self.xai_system.process({
+        finally:
+            PIPELINE_LATENCY.observe(time.perf_counter() - start, "batch")
+
+    async def _run_stage(
+        self,
+        stage: PipelineStage,
+        game_state: Dict[str, Any],
+        tasks: Dict[str, asyncio.Future]
+    ) -> Dict[str, Any]:
+        """Wait for a stage's dependencies, then run its component."""
+        upstream = await asyncio.gather(*(tasks[dep] for dep in stage.depends_on))
+        input_data = {**game_state, **dict(zip(stage.depends_on, upstream))}
+
+        return await self._call(stage, "process", input_data)
+
+    async def _run_batch_stage(
+        self,
+        stage: PipelineStage,
+        game_states: List[Dict[str, Any]],
+        tasks: Dict[str, asyncio.Future]
+    ) -> List[Dict[str, Any]]:
+        """Wait for a stage's dependencies, then run its component on the batch."""
+        upstream = await asyncio.gather(*(tasks[dep] for dep in stage.depends_on))
+        inputs = [
+            {
                 **game_state,
-                "predictions": predictions,
-                "cognitive_state": cognitive_state,
-                "aggregated_wisdom": aggregated_wisdom
-            })
-
-            return {
-                "predictions": predictions,
-                "cognitive_state": cognitive_state,
-                "uncertainty": uncertainty,
-                "aggregated_wisdom": aggregated_wisdom,
-                "explanations": explanations
+                **{dep: outputs[index] for dep, outputs in zip(stage.depends_on, upstream)}
             }
+            for index, game_state in enumerate(game_states)
+        ]
 
-        except Exception as e:
-            logger.error(f"Error processing game state: {str(e)}")
+        return await self._call(stage, "process_batch", inputs)
+
+    async def _call(
+        self,
+        stage: PipelineStage,
+        method: str,
+        input_data: Any
+    ) -> Any:
+        """Run a component method, offloading it to the executor if allowed.
+
+        Every call is timed and counted per stage for the metrics endpoint.
+        """
+        mode = "batch" if method == "process_batch" else "single"
+        STAGE_INPUT_SIZE.observe(
+            len(input_data) if mode == "batch" else 1, stage.name, mode)
+        start = time.perf_counter()
+        try:
+            if stage.offload:
+                return await self.executor.run(self, stage.component, method, input_data)
+            return await getattr(getattr(self, stage.component), method)(input_data)
+        except Exception:
+            STAGE_ERRORS.inc(stage.name, mode)
             raise
+        finally:
+            STAGE_LATENCY.observe(time.perf_counter() - start, stage.name, mode)
+
+    async def _refresh_weights(self) -> None:
+        """Pick up weights published by other workers or loaded from a checkpoint."""
+        if self.shared_weights is not None and self.shared_weights.refresh(self):
+            self._parameters_changed = True
+        if self._parameters_changed:
+            self._parameters_changed = False
+            await self.executor.sync_parameters(self)
+
+    def validate_feedback(self, feedback: Dict[str, Any]) -> None:
+        """Raise ``ValueError`` if any component could not apply a feedback record."""
+        for component in self.components.values():
+            component.validate_feedback(feedback)
 
     async def update_components(self, feedback: Dict[str, Any]) -> None:
-        """Update all components based on feedback."""
+        """Update all components based on feedback.
+
+        With shared weights the update is applied by a single writer at a
+        time and published to every worker.
+        """
+        await self._update_components("update", feedback)
+
+    async def update_components_batch(self, feedbacks: List[Dict[str, Any]]) -> None:
+        """Update all components with a batch of feedback records.
+
+        Each component writes its weights once for the whole batch.
+        """
+        await self._update_components("update_batch", feedbacks)
+
+    async def _update_components(self, method: str, feedback: Any) -> None:
+        """Stage an update on copies of the components, then adopt it.
+
+        The update either reaches every component or, if any of them
+        fails, none of them.
+        """
+        if self.shared_weights is not None:
+            await self.shared_weights.update(
+                self, functools.partial(self._stage_update, method), feedback)
+        else:
+            self.adopt(await self._stage_update(method, feedback))
+        await self.executor.update(self, method, feedback)
+
+    async def _stage_update(self, method: str, feedback: Any) -> Dict[str, AIComponent]:
+        """Apply feedback to staged copies of every component (see ``AIComponent.stage``)."""
         try:
-            await self.prediction_engine.update(feedback)
-            await self.cognitive_builder.update(feedback)
-            await self.quantum_generator.update(feedback)
-            await self.wisdom_aggregator.update(feedback)
-            await self.xai_system.update(feedback)
+            staged = {name: component.stage() for name, component in self.components.items()}
+            for name in UPDATE_ORDER:
+                await getattr(staged[name], method)(feedback)
             logger.info("All AI components updated successfully")
+            return staged
         except Exception as e:
             logger.error(f"Error updating AI components: {str(e)}")
             raise
+
+    def adopt(self, staged: Dict[str, AIComponent]) -> None:
+        """Switch every component to the parameters of its staged copy."""
+        components = self.components
+        for name, component in staged.items():
+            components[name].adopt(component)
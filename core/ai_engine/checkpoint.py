@@ -0,0 +1,128 @@
+"""Versioned on-disk checkpoints of AI Engine component parameters."""
+
+from typing import Any, Dict, Optional
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+import time
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FORMAT_NAME = "npy-dir"
+FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+
+_VERSION_PATTERN = re.compile(r"^v(\d+)$")
+
+
+class CheckpointError(ValueError):
+    """Raised when a checkpoint is missing, malformed or incompatible."""
+
+
+def save_checkpoint(
+    parameters: Dict[str, Dict[str, np.ndarray]],
+    root: str,
+    metadata: Optional[Dict[str, Any]] = None
+) -> str:
+    """Write component parameters as a new checkpoint version under ``root``.
+
+    Each array is stored as its own ``.npy`` file so it can later be memory
+    mapped, next to a JSON manifest describing names, shapes and dtypes.
+    The version directory is written under a temporary name and renamed
+    into place, so readers never observe a partial checkpoint.
+
+    Returns the path of the new checkpoint directory.
+    """
+    os.makedirs(root, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".checkpoint-", dir=root)
+    try:
+        manifest: Dict[str, Any] = {
+            "format": FORMAT_NAME,
+            "format_version": FORMAT_VERSION,
+            "created_at": time.time(),
+            "metadata": metadata or {},
+            "components": {}
+        }
+        for component, arrays in parameters.items():
+            os.makedirs(os.path.join(staging, component))
+            entries = {}
+            for name, value in arrays.items():
+                array = np.asarray(value)
+                file_name = os.path.join(component, f"{name}.npy")
+                np.save(os.path.join(staging, file_name), array)
+                entries[name] = {
+                    "file": file_name,
+                    "shape": list(array.shape),
+                    "dtype": array.dtype.str
+                }
+            manifest["components"][component] = entries
+
+        with open(os.path.join(staging, MANIFEST_FILE), "w") as handle:
+            json.dump(manifest, handle, indent=2)
+
+        # Claim the next version; retry if another writer got there first
+        while True:
+            path = os.path.join(root, f"v{latest_version(root) + 1:06d}")
+            try:
+                os.rename(staging, path)
+                break
+            except OSError:
+                if not os.path.exists(path):
+                    raise
+        logger.info(f"Saved AI Engine checkpoint to {path}")
+        return path
+
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+
+def load_checkpoint(path: str, mmap_mode: Optional[str] = "c") -> Dict[str, Dict[str, np.ndarray]]:
+    """Load component parameters from a checkpoint directory.
+
+    Arrays are memory mapped copy-on-write by default: processes loading
+    the same checkpoint share its pages through the OS page cache until a
+    process modifies a parameter, which then only affects its own copy.
+    """
+    manifest = read_manifest(path)
+    parameters: Dict[str, Dict[str, np.ndarray]] = {}
+    for component, entries in manifest["components"].items():
+        arrays = {}
+        for name, entry in entries.items():
+            array = np.load(os.path.join(path, entry["file"]), mmap_mode=mmap_mode)
+            if list(array.shape) != entry["shape"] or array.dtype.str != entry["dtype"]:
+                raise CheckpointError(
+                    f"Checkpoint array {component}.{name} does not match its manifest")
+            arrays[name] = array
+        parameters[component] = arrays
+    return parameters
+
+
+def read_manifest(path: str) -> Dict[str, Any]:
+    """Read and validate the manifest of a checkpoint directory."""
+    try:
+        with open(os.path.join(path, MANIFEST_FILE)) as handle:
+            manifest = json.load(handle)
+    except (OSError, ValueError) as e:
+        raise CheckpointError(f"Cannot read checkpoint manifest in {path}: {e}")
+
+    if manifest.get("format") != FORMAT_NAME:
+        raise CheckpointError(f"Unknown checkpoint format in {path}")
+    if manifest.get("format_version", 0) > FORMAT_VERSION:
+        raise CheckpointError(
+            f"Checkpoint format version {manifest['format_version']} is newer "
+            f"than supported version {FORMAT_VERSION}")
+    return manifest
+
+
+def latest_version(root: str) -> int:
+    """Return the highest checkpoint version under ``root``, or 0 if none."""
+    if not os.path.isdir(root):
+        return 0
+    versions = [int(match.group(1)) for match in
+                (_VERSION_PATTERN.match(name) for name in os.listdir(root)) if match]
+    return max(versions, default=0)
@@ -5,6 +5,7 @@ import logging
 import numpy as np
 from pydantic import BaseModel
 from .base import AIComponent
+from .feedback import check_shapes, merge_feedback
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +21,21 @@ class CognitiveProfile(BaseModel):
     last_updated: float
 
 
+LEARNING_STYLES = ["visual", "kinesthetic", "analytical"]
+
+# Rows follow the learning extractor's features: improvement_rate,
+# error_correction, pattern_recognition, knowledge_retention, adaptation_speed.
+LEARNING_STYLE_WEIGHTS = np.array([
+    [0.0, 0.5, 0.0],
+    [0.0, 0.0, 0.7],
+    [0.6, 0.0, 0.3],
+    [0.4, 0.0, 0.0],
+    [0.0, 0.5, 0.0],
+])
+
+ADAPTABILITY_WEIGHTS = np.array([0.3, 0.3, 0.0, 0.0, 0.4])
+
+
 class CognitiveModelBuilder(AIComponent):
     """Component for building and updating cognitive models of players."""
 
@@ -57,6 +73,13 @@ class CognitiveModelBuilder(AIComponent):
                 "knowledge_retention",
                 "adaptation_speed"
             ],
+            "sources": [
+                "performance_delta",
+                "error_correction_rate",
+                "pattern_recognition_score",
+                "knowledge_retention_rate",
+                "adaptation_speed"
+            ],
             "weights": self.feature_weights["learning"]
         }
 
@@ -69,6 +92,12 @@ class CognitiveModelBuilder(AIComponent):
                 "strategic_depth",
                 "tactical_awareness"
             ],
+            "sources": [
+                "avg_reaction_time",
+                "risk_taking_score",
+                "strategic_depth_score",
+                "tactical_awareness_score"
+            ],
             "weights": self.feature_weights["decision"]
         }
 
@@ -80,6 +109,11 @@ class CognitiveModelBuilder(AIComponent):
                 "distraction_resistance",
                 "multi_tasking"
             ],
+            "sources": [
+                "focus_duration",
+                "distraction_resistance",
+                "multi_tasking_score"
+            ],
             "weights": self.feature_weights["attention"]
         }
 
@@ -94,194 +128,83 @@ class CognitiveModelBuilder(AIComponent):
                 "timing_precision",
                 "coordination"
             ],
+            "sources": [
+                "mechanical_skill_score",
+                "strategic_planning_score",
+                "resource_management_score",
+                "spatial_awareness_score",
+                "timing_precision_score",
+                "coordination_score"
+            ],
             "weights": self.feature_weights["skill"]
         }
 
     async def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Process player data and update cognitive model."""
+        return (await self.process_batch([input_data]))[0]
+
+    async def process_batch(self, inputs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Process data for several players and update their cognitive models."""
         try:
-            player_id = input_data.get("player_id")
-            game_state = input_data.get("game_state", {})
-
-            # Extract cognitive features
-            learning_features = self._extract_learning_features(game_state)
-            decision_features = self._extract_decision_features(game_state)
-            attention_features = self._extract_attention_features(game_state)
-            skill_features = self._extract_skill_features(game_state)
-
-            # Update or create cognitive profile
-            profile = self._update_cognitive_profile(
-                player_id,
-                learning_features,
-                decision_features,
-                attention_features,
-                skill_features
-            )
-
-            return profile.dict()
+            game_states = [item.get("game_state", {}) for item in inputs]
+
+            # Extract cognitive features, one row per player
+            learning_features = self._extract_features("learning", game_states)
+            decision_features = self._extract_features("decision", game_states)
+            attention_features = self._extract_features("attention", game_states)
+            skill_features = self._extract_features("skill", game_states)
+
+            learning_styles = self._determine_learning_styles(learning_features)
+            adaptability = self._calculate_adaptability(learning_features)
+
+            # Update or create cognitive profiles
+            results = []
+            for index, item in enumerate(inputs):
+                profile = self._update_cognitive_profile(
+                    item.get("player_id"),
+                    learning_styles[index],
+                    self._to_dict("decision", decision_features[index]),
+                    self._to_dict("attention", attention_features[index]),
+                    self._to_dict("skill", skill_features[index]),
+                    float(adaptability[index])
+                )
+                results.append(profile.dict())
+
+            return results
 
         except Exception as e:
             logger.error(f"Error in cognitive model processing: {str(e)}")
             raise
 
-    def _extract_learning_features(self, game_state: Dict[str, Any]) -> Dict[str, float]:
-        """Extract learning-related features from game state."""
-        features = {}
-        extractor = self.extractors["learning"]
-
-        for feature in extractor["features"]:
-            value = self._calculate_learning_metric(feature, game_state)
-            features[feature] = float(value)
-
-        return features
-
-    def _extract_decision_features(self, game_state: Dict[str, Any]) -> Dict[str, float]:
-        """Extract decision-making features from game state."""
-        features = {}
-        extractor = self.extractors["decision"]
-
-        for feature in extractor["features"]:
-            value = self._calculate_decision_metric(feature, game_state)
-            features[feature] = float(value)
-
-        return features
-
-    def _extract_attention_features(self, game_state: Dict[str, Any]) -> Dict[str, float]:
-        """Extract attention-related features from game state."""
-        features = {}
-        extractor = self.extractors["attention"]
-
-        for feature in extractor["features"]:
-            value = self._calculate_attention_metric(feature, game_state)
-            features[feature] = float(value)
-
-        return features
-
-    def _extract_skill_features(self, game_state: Dict[str, Any]) -> Dict[str, float]:
-        """Extract skill-related features from game state."""
-        features = {}
-        extractor = self.extractors["skill"]
-
-        for feature in extractor["features"]:
-            value = self._calculate_skill_metric(feature, game_state)
-            features[feature] = float(value)
-
+    def _extract_features(
+        self,
+        extractor_name: str,
+        game_states: List[Dict[str, Any]]
+    ) -> np.ndarray:
+        """Extract one extractor's features from each game state into a matrix."""
+        sources = self.extractors[extractor_name]["sources"]
+        features = np.zeros((len(game_states), len(sources)))
+        for row, game_state in enumerate(game_states):
+            for column, source in enumerate(sources):
+                features[row, column] = float(game_state.get(source, 0.0))
         return features
 
-    def _calculate_learning_metric(self, feature: str, game_state: Dict[str, Any]) -> float:
-        """Calculate specific learning-related metric."""
-        metrics = {
-            "improvement_rate": lambda: self._calc_improvement_rate(game_state),
-            "error_correction": lambda: self._calc_error_correction(game_state),
-            "pattern_recognition": lambda: self._calc_pattern_recognition(game_state),
-            "knowledge_retention": lambda: self._calc_knowledge_retention(game_state),
-            "adaptation_speed": lambda: self._calc_adaptation_speed(game_state)
-        }
-        return metrics.get(feature, lambda: 0.0)()
-
-    def _calculate_decision_metric(self, feature: str, game_state: Dict[str, Any]) -> float:
-        """Calculate specific decision-making metric."""
-        metrics = {
-            "reaction_time": lambda: self._calc_reaction_time(game_state),
-            "risk_taking": lambda: self._calc_risk_taking(game_state),
-            "strategic_depth": lambda: self._calc_strategic_depth(game_state),
-            "tactical_awareness": lambda: self._calc_tactical_awareness(game_state)
-        }
-        return metrics.get(feature, lambda: 0.0)()
-
-    def _calculate_attention_metric(self, feature: str, game_state: Dict[str, Any]) -> float:
-        """Calculate specific attention-related metric."""
-        metrics = {
-            "focus_duration": lambda: self._calc_focus_duration(game_state),
-            "distraction_resistance": lambda: self._calc_distraction_resistance(game_state),
-            "multi_tasking": lambda: self._calc_multi_tasking(game_state)
-        }
-        return metrics.get(feature, lambda: 0.0)()
-
-    def _calculate_skill_metric(self, feature: str, game_state: Dict[str, Any]) -> float:
-        """Calculate specific skill-related metric."""
-        metrics = {
-            "mechanical_skill": lambda: self._calc_mechanical_skill(game_state),
-            "strategic_planning": lambda: self._calc_strategic_planning(game_state),
-            "resource_management": lambda: self._calc_resource_management(game_state),
-            "spatial_awareness": lambda: self._calc_spatial_awareness(game_state),
-            "timing_precision": lambda: self._calc_timing_precision(game_state),
-            "coordination": lambda: self._calc_coordination(game_state)
-        }
-        return metrics.get(feature, lambda: 0.0)()
-
-    # Calculation methods for learning metrics
-    def _calc_improvement_rate(self, game_state: Dict[str, Any]) -> float:
-        return float(game_state.get("performance_delta", 0.0))
-
-    def _calc_error_correction(self, game_state: Dict[str, Any]) -> float:
-        return float(game_state.get("error_correction_rate", 0.0))
-
-    def _calc_pattern_recognition(self, game_state: Dict[str, Any]) -> float:
-        return float(game_state.get("pattern_recognition_score", 0.0))
-
-    def _calc_knowledge_retention(self, game_state: Dict[str, Any]) -> float:
-        return float(game_state.get("knowledge_retention_rate", 0.0))
-
-    def _calc_adaptation_speed(self, game_state: Dict[str, Any]) -> float:
-        return float(game_state.get("adaptation_speed", 0.0))
-
-    # Calculation methods for decision metrics
-    def _calc_reaction_time(self, game_state: Dict[str, Any]) -> float:
-        return float(game_state.get("avg_reaction_time", 0.0))
-
-    def _calc_risk_taking(self, game_state: Dict[str, Any]) -> float:
-        return float(game_state.get("risk_taking_score", 0.0))
-
-    def _calc_strategic_depth(self, game_state: Dict[str, Any]) -> float:
-        return float(game_state.get("strategic_depth_score", 0.0))
-
-    def _calc_tactical_awareness(self, game_state: Dict[str, Any]) -> float:
-        return float(game_state.get("tactical_awareness_score", 0.0))
-
-    # Calculation methods for attention metrics
-    def _calc_focus_duration(self, game_state: Dict[str, Any]) -> float:
-        return float(game_state.get("focus_duration", 0.0))
-
-    def _calc_distraction_resistance(self, game_state: Dict[str, Any]) -> float:
-        return float(game_state.get("distraction_resistance", 0.0))
-
-    def _calc_multi_tasking(self, game_state: Dict[str, Any]) -> float:
-        return float(game_state.get("multi_tasking_score", 0.0))
-
-    # Calculation methods for skill metrics
-    def _calc_mechanical_skill(self, game_state: Dict[str, Any]) -> float:
-        return float(game_state.get("mechanical_skill_score", 0.0))
-
-    def _calc_strategic_planning(self, game_state: Dict[str, Any]) -> float:
-        return float(game_state.get("strategic_planning_score", 0.0))
-
-    def _calc_resource_management(self, game_state: Dict[str, Any]) -> float:
-        return float(game_state.get("resource_management_score", 0.0))
-
-    def _calc_spatial_awareness(self, game_state: Dict[str, Any]) -> float:
-        return float(game_state.get("spatial_awareness_score", 0.0))
-
-    def _calc_timing_precision(self, game_state: Dict[str, Any]) -> float:
-        return float(game_state.get("timing_precision_score", 0.0))
-
-    def _calc_coordination(self, game_state: Dict[str, Any]) -> float:
-        return float(game_state.get("coordination_score", 0.0))
+    def _to_dict(self, extractor_name: str, values: np.ndarray) -> Dict[str, float]:
+        """Label a row of extracted features with its feature names."""
+        return dict(zip(self.extractors[extractor_name]["features"], values.tolist()))
 
     def _update_cognitive_profile(
         self,
         player_id: str,
-        learning_features: Dict[str, float],
+        learning_style: str,
         decision_features: Dict[str, float],
         attention_features: Dict[str, float],
-        skill_features: Dict[str, float]
+        skill_features: Dict[str, float],
+        adaptability: float
     ) -> CognitiveProfile:
         """Update or create cognitive profile for player."""
         import time
 
-        # Calculate learning style
-        learning_style = self._determine_learning_style(learning_features)
-
         # Create or update profile
         profile = CognitiveProfile(
             player_id=player_id,
@@ -289,48 +212,21 @@ class CognitiveModelBuilder(AIComponent):
             decision_making=decision_features,
             attention_patterns=attention_features,
             skill_levels=skill_features,
-            adaptability=self._calculate_adaptability(learning_features),
+            adaptability=adaptability,
             last_updated=time.time()
         )
 
         self.profiles[player_id] = profile
         return profile
 
-    def _determine_learning_style(self, learning_features: Dict[str, float]) -> str:
-        """Determine player's learning style based on features."""
-        styles = {
-            "visual": self._calc_visual_score(learning_features),
-            "kinesthetic": self._calc_kinesthetic_score(learning_features),
-            "analytical": self._calc_analytical_score(learning_features)
-        }
-        return max(styles.items(), key=lambda x: x[1])[0]
-
-    def _calc_visual_score(self, features: Dict[str, float]) -> float:
-        """Calculate score for visual learning style."""
-        return features.get("pattern_recognition", 0.0) * 0.6 + features.get("knowledge_retention", 0.0) * 0.4
-
-    def _calc_kinesthetic_score(self, features: Dict[str, float]) -> float:
-        """Calculate score for kinesthetic learning style."""
-        return features.get("improvement_rate", 0.0) * 0.5 + features.get("adaptation_speed", 0.0) * 0.5
-
-    def _calc_analytical_score(self, features: Dict[str, float]) -> float:
-        """Calculate score for analytical learning style."""
-        return features.get("error_correction", 0.0) * 0.7 + features.get("pattern_recognition", 0.0) * 0.3
-
-    def _calculate_adaptability(self, learning_features: Dict[str, float]) -> float:
-        """Calculate player's adaptability score."""
-        weights = {
-            "improvement_rate": 0.3,
-            "adaptation_speed": 0.4,
-            "error_correction": 0.3
-        }
+    def _determine_learning_styles(self, learning_features: np.ndarray) -> List[str]:
+        """Determine each player's learning style based on features."""
+        scores = learning_features @ LEARNING_STYLE_WEIGHTS
+        return [LEARNING_STYLES[index] for index in np.argmax(scores, axis=1)]
 
-        adaptability = sum(
-            learning_features.get(feature, 0.0) * weight
-            for feature, weight in weights.items()
-        )
-
-        return float(max(0.0, min(1.0, adaptability)))
+    def _calculate_adaptability(self, learning_features: np.ndarray) -> np.ndarray:
+        """Calculate each player's adaptability score."""
+        return np.clip(learning_features @ ADAPTABILITY_WEIGHTS, 0.0, 1.0)
 
     async def update(self, feedback: Dict[str, Any]) -> None:
         """Update cognitive model based on feedback."""
@@ -353,6 +249,38 @@ class CognitiveModelBuilder(AIComponent):
             logger.error(f"Error updating cognitive model: {str(e)}")
             raise
 
+    async def update_batch(self, feedbacks: List[Dict[str, Any]]) -> None:
+        """Update the cognitive model once from feedback on known players."""
+        known = [feedback for feedback in feedbacks
+                 if feedback.get("player_id") in self.profiles]
+        if not known:
+            logger.warning("No cognitive profiles found for feedback batch")
+            return
+        await self.update(merge_feedback(known))
+
+    def validate_feedback(self, feedback: Dict[str, Any]) -> None:
+        """Check gradient lengths; feedback on unknown players is ignored anyway."""
+        if feedback.get("player_id") in self.profiles:
+            check_shapes(feedback, {
+                f"{feature_type}_gradient": weights
+                for feature_type, weights in self.feature_weights.items()
+            })
+
+    def get_parameters(self) -> Dict[str, np.ndarray]:
+        """Return the feature weights of each extractor."""
+        return dict(self.feature_weights)
+
+    def shared_state(self) -> List[Any]:
+        """Share the player profiles, which requests keep building, with staged copies."""
+        return [self.profiles]
+
+    def set_parameters(self, parameters: Dict[str, np.ndarray]) -> None:
+        """Replace feature weights and rebind the extractors to them."""
+        for feature_type in self.feature_weights:
+            if feature_type in parameters:
+                self.feature_weights[feature_type] = parameters[feature_type]
+        self._initialize_feature_extractors()
+
     def _update_feature_weights(self, feedback: Dict[str, Any]) -> None:
         """Update feature weights based on feedback."""
         learning_rate = 0.01
@@ -5,6 +5,9 @@ import logging
 import numpy as np
 from pydantic import BaseModel
 from .base import AIComponent
+from .feedback import check_shapes
+from .history import HistoryStore
+from .rolling import RollingWindowStore, RunningCorrelation
 
 logger = logging.getLogger(__name__)
 
@@ -19,11 +22,96 @@ class CollectiveKnowledge(BaseModel):
     confidence_scores: Dict[str, float]
 
 
+# Output names in column order of the pattern and strategy score matrices.
+PATTERN_NAMES = [
+    "aggression_pattern",
+    "cooperation_pattern",
+    "risk_pattern",
+    "learning_pattern",
+    "adaptation_pattern",
+    "cycle_pattern",
+    "progression_pattern",
+    "timing_pattern",
+    "sequence_pattern",
+    "clustering_pattern",
+    "distribution_pattern",
+    "movement_pattern",
+    "territory_pattern",
+    "position_pattern",
+    "formation_pattern",
+    "resource_pattern",
+    "combat_pattern",
+    "development_pattern",
+    "social_pattern",
+]
+
+STRATEGY_NAMES = [
+    "aggressive_strategy",
+    "tactical_strategy",
+    "opportunistic_strategy",
+    "protective_strategy",
+    "reactive_strategy",
+    "preventive_strategy",
+    "gathering_strategy",
+    "conservation_strategy",
+    "investment_strategy",
+    "distribution_strategy",
+    "cooperative_strategy",
+    "competitive_strategy",
+    "diplomatic_strategy",
+]
+
+# Column names of the combined pattern and strategy matrix.
+COMBINED_NAMES = np.array(PATTERN_NAMES + STRATEGY_NAMES)
+
+# Game state keys read by each pattern and strategy group. Every key scores
+# exactly one output, so feature column ``i`` produces ``COMBINED_NAMES[i]``.
+PATTERN_FEATURES: Dict[str, Tuple[str, ...]] = {
+    "behavioral": ("aggression_level", "cooperation_level", "risk_level",
+                   "learning_rate", "adaptation_rate"),
+    "temporal": ("cycle_phase", "progression_rate", "timing_accuracy",
+                 "sequence_position"),
+    "spatial": ("clustering_density", "distribution_spread", "movement_speed",
+                "territory_control", "position_advantage", "formation_cohesion"),
+    "strategic": ("resource_efficiency", "combat_effectiveness",
+                  "development_progress", "social_influence"),
+}
+
+STRATEGY_FEATURES: Dict[str, Tuple[str, ...]] = {
+    "offensive": ("attack_frequency", "tactical_advantage", "opportunity_usage"),
+    "defensive": ("protection_level", "reaction_speed", "prevention_effectiveness"),
+    "resource": ("gathering_rate", "conservation_rate", "investment_ratio",
+                 "distribution_efficiency"),
+    "social": ("cooperation_rate", "competition_level", "diplomatic_influence"),
+}
+
+
+def _compile_feature_schema() -> Tuple[Dict[str, int], Dict[str, slice], Dict[str, slice]]:
+    """Assign each game state key a column and each group a column range."""
+    index: Dict[str, int] = {}
+    group_slices = []
+    for groups in (PATTERN_FEATURES, STRATEGY_FEATURES):
+        slices = {}
+        for group, keys in groups.items():
+            start = len(index)
+            index.update((key, start + offset) for offset, key in enumerate(keys))
+            slices[group] = slice(start, len(index))
+        group_slices.append(slices)
+    return index, group_slices[0], group_slices[1]
+
+
+FEATURE_INDEX, PATTERN_SLICES, STRATEGY_SLICES = _compile_feature_schema()
+FEATURE_COUNT = len(FEATURE_INDEX)
+assert FEATURE_COUNT == len(COMBINED_NAMES)
+
+
 class CollectiveWisdomAggregator(AIComponent):
     """Component for aggregating and analyzing collective game knowledge."""
 
     def __init__(self):
-        self.knowledge_base: List[CollectiveKnowledge] = []
+        self.knowledge_base: HistoryStore[CollectiveKnowledge] = HistoryStore()
+        # Per-group weights are views into one vector scored in a single pass
+        self.feature_weights: np.ndarray = np.zeros(FEATURE_COUNT)
         self.pattern_weights: Dict[str, np.ndarray] = {}
         self.strategy_weights: Dict[str, np.ndarray] = {}
         self.meta_analyzers: Dict[str, Any] = {}
@@ -38,20 +126,29 @@ class CollectiveWisdomAggregator(AIComponent):
 
     def _initialize_pattern_recognition(self) -> None:
         """Initialize pattern recognition components."""
-        self.pattern_weights = {
-            "behavioral": np.random.randn(5),  # Behavioral patterns
-            "temporal": np.random.randn(4),    # Time-based patterns
-            "spatial": np.random.randn(6),     # Spatial patterns
-            "strategic": np.random.randn(4)    # Strategic patterns
-        }
+        # Behavioral, temporal, spatial and strategic patterns
+        for columns in PATTERN_SLICES.values():
+            self.feature_weights[columns] = np.random.randn(
+                columns.stop - columns.start)
+        self._bind_group_weights()
 
     def _initialize_strategy_analysis(self) -> None:
         """Initialize strategy analysis components."""
+        # Offensive, defensive, resource management and social strategies
+        for columns in STRATEGY_SLICES.values():
+            self.feature_weights[columns] = np.random.randn(
+                columns.stop - columns.start)
+        self._bind_group_weights()
+
+    def _bind_group_weights(self) -> None:
+        """Point the per-group weights at their slices of feature_weights."""
+        self.pattern_weights = {
+            group: self.feature_weights[columns]
+            for group, columns in PATTERN_SLICES.items()
+        }
         self.strategy_weights = {
-            "offensive": np.random.randn(3),   # Offensive strategies
-            "defensive": np.random.randn(3),   # Defensive strategies
-            "resource": np.random.randn(4),    # Resource management strategies
-            "social": np.random.randn(3)       # Social interaction strategies
+            group: self.feature_weights[columns]
+            for group, columns in STRATEGY_SLICES.items()
         }
 
     def _initialize_meta_analyzers(self) -> None:
@@ -64,480 +161,283 @@ class CollectiveWisdomAggregator(AIComponent):
 
     def _create_trend_analyzer(self) -> Dict[str, Any]:
         """Create trend analysis component."""
+        window_size = 10
         return {
-            "window_size": 10,
-            "weights": np.random.randn(10),
-            "threshold": 0.5
+            "window_size": window_size,
+            "weights": np.random.randn(window_size),
+            "threshold": 0.5,
+            "windows": RollingWindowStore(
+                window_size, len(PATTERN_NAMES) + len(STRATEGY_NAMES))
         }
 
     def _create_correlation_analyzer(self) -> Dict[str, Any]:
         """Create correlation analysis component."""
+        size = len(PATTERN_NAMES) + len(STRATEGY_NAMES)
         return {
-            "matrix_size": 8,
-            "correlation_matrix": np.random.randn(8, 8),
-            "significance_threshold": 0.3
+            "matrix_size": size,
+            "correlation_matrix": np.random.randn(size, size),
+            "significance_threshold": 0.3,
+            # Strongest significant pairs reported with each result
+            "top_k": 10,
+            # Feature pairs above the diagonal, in row-major order
+            "pairs": np.triu_indices(size, k=1),
+            # Use correlations observed in processed games instead of the
+            # configured matrix
+            "empirical": False,
+            "running": RunningCorrelation(size, decay=0.99)
         }
 
     def _create_anomaly_detector(self) -> Dict[str, Any]:
         """Create anomaly detection component."""
+        history_size = 100
+        width = len(PATTERN_NAMES) + len(STRATEGY_NAMES)
         return {
-            "baseline": np.zeros(5),
+            "baseline": np.zeros(width),
             "variance_threshold": 2.0,
-            "history_size": 100
+            "history_size": history_size,
+            "windows": RollingWindowStore(history_size, width)
         }
 
     async def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Process game data and aggregate collective wisdom."""
+        return (await self.process_batch([input_data]))[0]
+
+    async def process_batch(self, inputs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Process data for several games and aggregate collective wisdom."""
         try:
-            game_id = input_data.get("game_id")
-            game_state = input_data.get("game_state", {})
-            predictions = input_data.get("predictions", {})
-            cognitive_state = input_data.get("cognitive_state", {})
+            game_states = [item.get("game_state", {}) for item in inputs]
 
-            # Analyze patterns
-            patterns = self._analyze_patterns(game_state, predictions)
+            # Score patterns and strategies in one pass over the features
+            scores = self._score_features(self._extract_features(game_states))
+            patterns = scores[:, :len(PATTERN_NAMES)]
+            strategies = scores[:, len(PATTERN_NAMES):]
 
-            # Analyze strategies
-            strategies = self._analyze_strategies(game_state, cognitive_state)
+            # Correlations do not depend on the game, so they are computed
+            # once per batch and shared by every game's result
+            correlations = self._analyze_correlations()
 
             # Perform meta-analysis
-            meta_insights = self._perform_meta_analysis(patterns, strategies)
+            game_ids = [item.get("game_id") for item in inputs]
+            meta_insights = self._perform_meta_analysis(
+                game_ids, patterns, strategies)
 
             # Calculate confidence scores
             confidence_scores = self._calculate_confidence_scores(
                 patterns,
                 strategies,
-                meta_insights
+                meta_insights,
+                correlations
             )
 
-            # Create collective knowledge model
+            # Create collective knowledge models
             import time
-            knowledge = CollectiveKnowledge(
-                game_id=game_id,
-                timestamp=time.time(),
-                patterns=patterns,
-                strategies=strategies,
-                meta_insights=meta_insights,
-                confidence_scores=confidence_scores
-            )
-
-            self.knowledge_base.append(knowledge)
-
-            return knowledge.dict()
+            timestamp = time.time()
+            results = []
+            for index, item in enumerate(inputs):
+                knowledge = CollectiveKnowledge(
+                    game_id=game_ids[index],
+                    timestamp=timestamp,
+                    patterns=dict(zip(PATTERN_NAMES, patterns[index].tolist())),
+                    strategies=dict(zip(STRATEGY_NAMES, strategies[index].tolist())),
+                    meta_insights=meta_insights[index],
+                    confidence_scores=confidence_scores[index]
+                )
+                results.append(knowledge)
+
+            # The history keeps per-game insights only; the shared
+            # correlations are added to the returned results
+            for knowledge in results:
+                self.knowledge_base.append(knowledge.game_id, knowledge)
+            self._record_history(game_ids, np.hstack([patterns, strategies]))
+
+            outputs = []
+            for knowledge in results:
+                output = knowledge.dict()
+                output["meta_insights"]["correlations"] = correlations
+                outputs.append(output)
+            return outputs
 
         except Exception as e:
             logger.error(f"Error in collective wisdom processing: {str(e)}")
             raise
 
-    def _analyze_patterns(
-        self,
-        game_state: Dict[str, Any],
-        predictions: Dict[str, Any]
-    ) -> Dict[str, float]:
-        """Analyze various patterns in game data."""
-        patterns = {}
-
-        # Analyze behavioral patterns
-        behavioral = self._analyze_behavioral_patterns(game_state, predictions)
-        patterns.update(behavioral)
-
-        # Analyze temporal patterns
-        temporal = self._analyze_temporal_patterns(game_state)
-        patterns.update(temporal)
-
-        # Analyze spatial patterns
-        spatial = self._analyze_spatial_patterns(game_state)
-        patterns.update(spatial)
-
-        # Analyze strategic patterns
-        strategic = self._analyze_strategic_patterns(game_state, predictions)
-        patterns.update(strategic)
-
-        return patterns
-
-    def _analyze_behavioral_patterns(
-        self,
-        game_state: Dict[str, Any],
-        predictions: Dict[str, Any]
-    ) -> Dict[str, float]:
-        """Analyze behavioral patterns."""
-        features = self._extract_behavioral_features(game_state, predictions)
-        weights = self.pattern_weights["behavioral"]
-        scores = np.dot(features, weights)
-
-        return {
-            "aggression_pattern": float(self._sigmoid(scores[0])),
-            "cooperation_pattern": float(self._sigmoid(scores[1])),
-            "risk_pattern": float(self._sigmoid(scores[2])),
-            "learning_pattern": float(self._sigmoid(scores[3])),
-            "adaptation_pattern": float(self._sigmoid(scores[4]))
-        }
-
-    def _analyze_temporal_patterns(self, game_state: Dict[str, Any]) -> Dict[str, float]:
-        """Analyze temporal patterns."""
-        features = self._extract_temporal_features(game_state)
-        weights = self.pattern_weights["temporal"]
-        scores = np.dot(features, weights)
-
-        return {
-            "cycle_pattern": float(self._sigmoid(scores[0])),
-            "progression_pattern": float(self._sigmoid(scores[1])),
-            "timing_pattern": float(self._sigmoid(scores[2])),
-            "sequence_pattern": float(self._sigmoid(scores[3]))
-        }
+    def _score_features(self, features: np.ndarray) -> np.ndarray:
+        """Score every pattern and strategy, one row per game.
 
-    def _analyze_spatial_patterns(self, game_state: Dict[str, Any]) -> Dict[str, float]:
-        """Analyze spatial patterns."""
-        features = self._extract_spatial_features(game_state)
-        weights = self.pattern_weights["spatial"]
-        scores = np.dot(features, weights)
-
-        return {
-            "clustering_pattern": float(self._sigmoid(scores[0])),
-            "distribution_pattern": float(self._sigmoid(scores[1])),
-            "movement_pattern": float(self._sigmoid(scores[2])),
-            "territory_pattern": float(self._sigmoid(scores[3])),
-            "position_pattern": float(self._sigmoid(scores[4])),
-            "formation_pattern": float(self._sigmoid(scores[5]))
-        }
-
-    def _analyze_strategic_patterns(
-        self,
-        game_state: Dict[str, Any],
-        predictions: Dict[str, Any]
-    ) -> Dict[str, float]:
-        """Analyze strategic patterns."""
-        features = self._extract_strategic_features(game_state, predictions)
-        weights = self.pattern_weights["strategic"]
-        scores = np.dot(features, weights)
-
-        return {
-            "resource_pattern": float(self._sigmoid(scores[0])),
-            "combat_pattern": float(self._sigmoid(scores[1])),
-            "development_pattern": float(self._sigmoid(scores[2])),
-            "social_pattern": float(self._sigmoid(scores[3]))
-        }
-
-    def _analyze_strategies(
-        self,
-        game_state: Dict[str, Any],
-        cognitive_state: Dict[str, Any]
-    ) -> Dict[str, float]:
-        """Analyze various strategies in game data."""
-        strategies = {}
-
-        # Analyze offensive strategies
-        offensive = self._analyze_offensive_strategies(game_state)
-        strategies.update(offensive)
-
-        # Analyze defensive strategies
-        defensive = self._analyze_defensive_strategies(game_state)
-        strategies.update(defensive)
-
-        # Analyze resource strategies
-        resource = self._analyze_resource_strategies(game_state)
-        strategies.update(resource)
-
-        # Analyze social strategies
-        social = self._analyze_social_strategies(game_state, cognitive_state)
-        strategies.update(social)
-
-        return strategies
-
-    def _analyze_offensive_strategies(self, game_state: Dict[str, Any]) -> Dict[str, float]:
-        """Analyze offensive strategies."""
-        features = self._extract_offensive_features(game_state)
-        weights = self.strategy_weights["offensive"]
-        scores = np.dot(features, weights)
-
-        return {
-            "aggressive_strategy": float(self._sigmoid(scores[0])),
-            "tactical_strategy": float(self._sigmoid(scores[1])),
-            "opportunistic_strategy": float(self._sigmoid(scores[2]))
-        }
-
-    def _analyze_defensive_strategies(self, game_state: Dict[str, Any]) -> Dict[str, float]:
-        """Analyze defensive strategies."""
-        features = self._extract_defensive_features(game_state)
-        weights = self.strategy_weights["defensive"]
-        scores = np.dot(features, weights)
-
-        return {
-            "protective_strategy": float(self._sigmoid(scores[0])),
-            "reactive_strategy": float(self._sigmoid(scores[1])),
-            "preventive_strategy": float(self._sigmoid(scores[2]))
-        }
-
-    def _analyze_resource_strategies(self, game_state: Dict[str, Any]) -> Dict[str, float]:
-        """Analyze resource management strategies."""
-        features = self._extract_resource_features(game_state)
-        weights = self.strategy_weights["resource"]
-        scores = np.dot(features, weights)
-
-        return {
-            "gathering_strategy": float(self._sigmoid(scores[0])),
-            "conservation_strategy": float(self._sigmoid(scores[1])),
-            "investment_strategy": float(self._sigmoid(scores[2])),
-            "distribution_strategy": float(self._sigmoid(scores[3]))
-        }
-
-    def _analyze_social_strategies(
-        self,
-        game_state: Dict[str, Any],
-        cognitive_state: Dict[str, Any]
-    ) -> Dict[str, float]:
-        """Analyze social interaction strategies."""
-        features = self._extract_social_features(game_state, cognitive_state)
-        weights = self.strategy_weights["social"]
-        scores = np.dot(features, weights)
-
-        return {
-            "cooperative_strategy": float(self._sigmoid(scores[0])),
-            "competitive_strategy": float(self._sigmoid(scores[1])),
-            "diplomatic_strategy": float(self._sigmoid(scores[2]))
-        }
+        Each group's weights form a diagonal block of the combined weight
+        matrix, so the block product reduces to a single broadcast multiply.
+        """
+        return self._sigmoid(features * self.feature_weights)
 
     def _perform_meta_analysis(
         self,
-        patterns: Dict[str, float],
-        strategies: Dict[str, float]
-    ) -> Dict[str, Any]:
+        game_ids: List[str],
+        patterns: np.ndarray,
+        strategies: np.ndarray
+    ) -> List[Dict[str, Any]]:
         """Perform meta-analysis on patterns and strategies."""
-        meta_insights = {}
+        combined = np.hstack([patterns, strategies])
 
-        # Analyze trends
-        trends = self._analyze_trends(patterns, strategies)
-        meta_insights["trends"] = trends
-
-        # Analyze correlations
-        correlations = self._analyze_correlations(patterns, strategies)
-        meta_insights["correlations"] = correlations
-
-        # Detect anomalies
-        anomalies = self._detect_anomalies(patterns, strategies)
-        meta_insights["anomalies"] = anomalies
+        meta_insights = []
+        for game_id, game_data in zip(game_ids, combined):
+            meta_insights.append({
+                # Analyze trends
+                "trends": self._analyze_trends(game_id),
+                # Detect anomalies
+                "anomalies": self._detect_anomalies(game_id, game_data)
+            })
 
         return meta_insights
 
-    def _analyze_trends(
-        self,
-        patterns: Dict[str, float],
-        strategies: Dict[str, float]
-    ) -> Dict[str, List[float]]:
-        """Analyze trends in patterns and strategies."""
+    def _analyze_trends(self, game_id: str) -> Dict[str, List[float]]:
+        """Analyze trends in a game's patterns and strategies."""
         analyzer = self.meta_analyzers["trend_analyzer"]
-        combined_data = list(patterns.values()) + list(strategies.values())
-
-        if len(self.knowledge_base) >= analyzer["window_size"]:
-            historical_data = np.array([
-                list(k.patterns.values()) + list(k.strategies.values())
-                for k in self.knowledge_base[-analyzer["window_size"]:]
-            ])
-
-            trends = np.mean(
-                (historical_data - np.mean(historical_data, axis=0)) *
-                analyzer["weights"][:len(combined_data)],
-                axis=0
-            )
+        window = analyzer["windows"].get(game_id)
+
+        if window is not None and window.full:
+            # Mean over the window of (x_t - mean) * w_t, with one weight per
+            # window step, expanded so it only needs running sums
+            weights = analyzer["weights"]
+            trends = (
+                window.weighted_sum(weights) - window.mean * weights.sum()
+            ) / window.capacity
         else:
-            trends = np.zeros(len(combined_data))
+            trends = np.zeros(len(PATTERN_NAMES) + len(STRATEGY_NAMES))
 
         return {
-            "pattern_trends": trends[:len(patterns)].tolist(),
-            "strategy_trends": trends[len(patterns):].tolist()
+            "pattern_trends": trends[:len(PATTERN_NAMES)].tolist(),
+            "strategy_trends": trends[len(PATTERN_NAMES):].tolist()
         }
 
-    def _analyze_correlations(
-        self,
-        patterns: Dict[str, float],
-        strategies: Dict[str, float]
-    ) -> Dict[str, List[Tuple[str, str, float]]]:
-        """Analyze correlations between patterns and strategies."""
+    def _analyze_correlations(self) -> Dict[str, Any]:
+        """Analyze correlations between patterns and strategies.
+
+        Only the ``top_k`` strongest significant pairs are listed; the
+        count and mean strength of all significant pairs summarize the rest.
+        """
         analyzer = self.meta_analyzers["correlation_analyzer"]
-        combined_data = list(patterns.items()) + list(strategies.items())
-        significant_correlations = []
+        if analyzer["empirical"]:
+            matrix = analyzer["running"].correlation()
+        else:
+            matrix = analyzer["correlation_matrix"]
 
-        for i, (name1, value1) in enumerate(combined_data):
-            for j, (name2, value2) in enumerate(combined_data[i+1:], i+1):
-                correlation = analyzer["correlation_matrix"][i, j]
-                if abs(correlation) > analyzer["significance_threshold"]:
-                    significant_correlations.append(
-                        (name1, name2, float(correlation)))
+        rows, cols = analyzer["pairs"]
+        values = matrix[rows, cols]
+        strengths = np.abs(values)
+        significant = np.flatnonzero(strengths > analyzer["significance_threshold"])
+        # Strongest first; the stable sort keeps row-major order among ties
+        top = significant[np.argsort(-strengths[significant], kind="stable")][:analyzer["top_k"]]
 
         return {
-            "significant_correlations": significant_correlations
+            "significant_correlations": list(zip(
+                COMBINED_NAMES[rows[top]].tolist(),
+                COMBINED_NAMES[cols[top]].tolist(),
+                values[top].tolist()
+            )),
+            "significant_count": int(significant.size),
+            "mean_strength": float(strengths[significant].mean()) if significant.size else 0.0
         }
 
     def _detect_anomalies(
         self,
-        patterns: Dict[str, float],
-        strategies: Dict[str, float]
+        game_id: str,
+        combined_data: np.ndarray
     ) -> Dict[str, List[str]]:
-        """Detect anomalies in patterns and strategies."""
+        """Detect anomalies in a game's patterns and strategies.
+
+        Deviations from the game's rolling baseline are measured in standard
+        deviations of its window; without enough history to estimate the
+        spread, the raw deviation is used.
+        """
         analyzer = self.meta_analyzers["anomaly_detector"]
-        combined_data = np.array(
-            list(patterns.values()) + list(strategies.values()))
+        window = analyzer["windows"].get(game_id)
+
+        # Use the game's own history as baseline when there is any
+        baseline = window.mean if window is not None else analyzer["baseline"]
+        deviations = np.abs(combined_data - baseline)
 
-        # Update baseline if enough history
-        if len(self.knowledge_base) > 0:
-            historical_data = np.array([
-                list(k.patterns.values()) + list(k.strategies.values())
-                for k in self.knowledge_base[-analyzer["history_size"]:]
-            ])
-            analyzer["baseline"] = np.mean(historical_data, axis=0)
+        if window is not None and window.count > 1:
+            spread = np.sqrt(window.variance())
+            deviations = np.divide(
+                deviations, spread, out=deviations, where=spread > 0)
 
         # Detect anomalies
-        deviations = np.abs(combined_data - analyzer["baseline"])
-        anomaly_indices = np.where(
-            deviations > analyzer["variance_threshold"])[0]
+        anomaly_indices = np.flatnonzero(
+            deviations > analyzer["variance_threshold"])
 
         # Map anomalies to pattern/strategy names
-        combined_names = list(patterns.keys()) + list(strategies.keys())
+        combined_names = PATTERN_NAMES + STRATEGY_NAMES
         anomalies = [combined_names[i] for i in anomaly_indices]
 
         return {
             "detected_anomalies": anomalies
         }
 
+    def _record_history(self, game_ids: List[str], combined: np.ndarray) -> None:
+        """Push processed games into the rolling trend and anomaly windows."""
+        trend_windows = self.meta_analyzers["trend_analyzer"]["windows"]
+        anomaly_windows = self.meta_analyzers["anomaly_detector"]["windows"]
+        for game_id, game_data in zip(game_ids, combined):
+            trend_windows.push(game_id, game_data)
+            anomaly_windows.push(game_id, game_data)
+
+        correlation_analyzer = self.meta_analyzers["correlation_analyzer"]
+        if correlation_analyzer["empirical"]:
+            correlation_analyzer["running"].update(combined)
+
     def _calculate_confidence_scores(
         self,
-        patterns: Dict[str, float],
-        strategies: Dict[str, float],
-        meta_insights: Dict[str, Any]
-    ) -> Dict[str, float]:
+        patterns: np.ndarray,
+        strategies: np.ndarray,
+        meta_insights: List[Dict[str, Any]],
+        correlations: Dict[str, Any]
+    ) -> List[Dict[str, float]]:
         """Calculate confidence scores for different aspects."""
-        confidence_scores = {}
-
-        # Pattern confidence
-        pattern_confidence = np.mean(list(patterns.values()))
-        confidence_scores["pattern_confidence"] = float(pattern_confidence)
-
-        # Strategy confidence
-        strategy_confidence = np.mean(list(strategies.values()))
-        confidence_scores["strategy_confidence"] = float(strategy_confidence)
-
-        # Trend confidence
-        trend_confidence = self._calculate_trend_confidence(
-            meta_insights["trends"])
-        confidence_scores["trend_confidence"] = float(trend_confidence)
-
-        # Correlation confidence
-        correlation_confidence = self._calculate_correlation_confidence(
-            meta_insights["correlations"]
-        )
-        confidence_scores["correlation_confidence"] = float(
-            correlation_confidence)
-
-        # Overall confidence
-        confidence_scores["overall_confidence"] = float(np.mean([
-            pattern_confidence,
-            strategy_confidence,
-            trend_confidence,
-            correlation_confidence
-        ]))
-
-        return confidence_scores
+        # Pattern and strategy confidence
+        pattern_confidence = patterns.mean(axis=1)
+        strategy_confidence = strategies.mean(axis=1)
+        # Correlation confidence is the same for every game
+        correlation_confidence = correlations["mean_strength"]
+
+        results = []
+        for index, insights in enumerate(meta_insights):
+            # Trend confidence
+            trend_confidence = self._calculate_trend_confidence(
+                insights["trends"])
+
+            results.append({
+                "pattern_confidence": float(pattern_confidence[index]),
+                "strategy_confidence": float(strategy_confidence[index]),
+                "trend_confidence": float(trend_confidence),
+                "correlation_confidence": float(correlation_confidence),
+                # Overall confidence
+                "overall_confidence": float(np.mean([
+                    pattern_confidence[index],
+                    strategy_confidence[index],
+                    trend_confidence,
+                    correlation_confidence
+                ]))
+            })
+
+        return results
 
     def _calculate_trend_confidence(self, trends: Dict[str, List[float]]) -> float:
         """Calculate confidence in trend analysis."""
         all_trends = trends["pattern_trends"] + trends["strategy_trends"]
         return float(np.mean(np.abs(all_trends)))
 
-    def _calculate_correlation_confidence(
-        self,
-        correlations: Dict[str, List[Tuple[str, str, float]]]
-    ) -> float:
-        """Calculate confidence in correlation analysis."""
-        if not correlations["significant_correlations"]:
-            return 0.0
-        return float(np.mean([abs(c[2]) for c in correlations["significant_correlations"]]))
-
-    def _extract_behavioral_features(
-        self,
-        game_state: Dict[str, Any],
-        predictions: Dict[str, Any]
-    ) -> np.ndarray:
-        """Extract behavioral features from game state."""
-        return np.array([
-            float(game_state.get("aggression_level", 0.0)),
-            float(game_state.get("cooperation_level", 0.0)),
-            float(game_state.get("risk_level", 0.0)),
-            float(game_state.get("learning_rate", 0.0)),
-            float(game_state.get("adaptation_rate", 0.0))
-        ])
-
-    def _extract_temporal_features(self, game_state: Dict[str, Any]) -> np.ndarray:
-        """Extract temporal features from game state."""
-        return np.array([
-            float(game_state.get("cycle_phase", 0.0)),
-            float(game_state.get("progression_rate", 0.0)),
-            float(game_state.get("timing_accuracy", 0.0)),
-            float(game_state.get("sequence_position", 0.0))
-        ])
-
-    def _extract_spatial_features(self, game_state: Dict[str, Any]) -> np.ndarray:
-        """Extract spatial features from game state."""
-        return np.array([
-            float(game_state.get("clustering_density", 0.0)),
-            float(game_state.get("distribution_spread", 0.0)),
-            float(game_state.get("movement_speed", 0.0)),
-            float(game_state.get("territory_control", 0.0)),
-            float(game_state.get("position_advantage", 0.0)),
-            float(game_state.get("formation_cohesion", 0.0))
-        ])
-
-    def _extract_strategic_features(
-        self,
-        game_state: Dict[str, Any],
-        predictions: Dict[str, Any]
-    ) -> np.ndarray:
-        """Extract strategic features from game state."""
-        return np.array([
-            float(game_state.get("resource_efficiency", 0.0)),
-            float(game_state.get("combat_effectiveness", 0.0)),
-            float(game_state.get("development_progress", 0.0)),
-            float(game_state.get("social_influence", 0.0))
-        ])
-
-    def _extract_offensive_features(self, game_state: Dict[str, Any]) -> np.ndarray:
-        """Extract offensive strategy features."""
-        return np.array([
-            float(game_state.get("attack_frequency", 0.0)),
-            float(game_state.get("tactical_advantage", 0.0)),
-            float(game_state.get("opportunity_usage", 0.0))
-        ])
-
-    def _extract_defensive_features(self, game_state: Dict[str, Any]) -> np.ndarray:
-        """Extract defensive strategy features."""
-        return np.array([
-            float(game_state.get("protection_level", 0.0)),
-            float(game_state.get("reaction_speed", 0.0)),
-            float(game_state.get("prevention_effectiveness", 0.0))
-        ])
-
-    def _extract_resource_features(self, game_state: Dict[str, Any]) -> np.ndarray:
-        """Extract resource strategy features."""
-        return np.array([
-            float(game_state.get("gathering_rate", 0.0)),
-            float(game_state.get("conservation_rate", 0.0)),
-            float(game_state.get("investment_ratio", 0.0)),
-            float(game_state.get("distribution_efficiency", 0.0))
-        ])
-
-    def _extract_social_features(
-        self,
-        game_state: Dict[str, Any],
-        cognitive_state: Dict[str, Any]
-    ) -> np.ndarray:
-        """Extract social strategy features."""
-        return np.array([
-            float(game_state.get("cooperation_rate", 0.0)),
-            float(game_state.get("competition_level", 0.0)),
-            float(game_state.get("diplomatic_influence", 0.0))
-        ])
-
-    def _sigmoid(self, x: float) -> float:
-        """Apply sigmoid function to scalar value."""
+    def _extract_features(self, game_states: List[Dict[str, Any]]) -> np.ndarray:
+        """Fill the feature matrix from game states using the compiled schema."""
+        features = np.zeros((len(game_states), FEATURE_COUNT))
+        for row, game_state in zip(features, game_states):
+            for key, value in game_state.items():
+                column = FEATURE_INDEX.get(key)
+                if column is not None:
+                    row[column] = value
+        return features
+
+    def _sigmoid(self, x: np.ndarray) -> np.ndarray:
+        """Apply sigmoid function element-wise."""
         return 1 / (1 + np.exp(-x))
 
     async def update(self, feedback: Dict[str, Any]) -> None:
@@ -558,6 +458,72 @@ class CollectiveWisdomAggregator(AIComponent):
             logger.error(f"Error updating collective wisdom model: {str(e)}")
             raise
 
+    def training_feedback(
+        self,
+        game_states: List[Dict[str, Any]],
+        targets: np.ndarray
+    ) -> Dict[str, Any]:
+        """Build a feedback record that fits the scores to observed targets.
+
+        Every pattern and strategy score of a game is pushed towards its
+        target (e.g. whether the game was won) under log loss. Gradients
+        point uphill, as ``update`` adds them to the weights.
+        """
+        features = self._extract_features(game_states)
+        residuals = self._score_features(features) - targets[:, np.newaxis]
+        gradient = -(residuals * features).mean(axis=0)
+        feedback: Dict[str, Any] = {}
+        for group, columns in {**PATTERN_SLICES, **STRATEGY_SLICES}.items():
+            feedback[f"{group}_accuracy"] = 1.0
+            feedback[f"{group}_gradient"] = gradient[columns].tolist()
+        return feedback
+
+    def stores(self) -> Dict[str, Any]:
+        """Return per-game stores for metrics."""
+        return {
+            "knowledge_base": self.knowledge_base,
+            "trend_windows": self.meta_analyzers["trend_analyzer"]["windows"],
+            "anomaly_windows": self.meta_analyzers["anomaly_detector"]["windows"]
+        }
+
+    def shared_state(self) -> List[Any]:
+        """Share the stores and running correlation statistics with staged copies."""
+        return [*self.stores().values(), self.meta_analyzers["correlation_analyzer"]["running"]]
+
+    def validate_feedback(self, feedback: Dict[str, Any]) -> None:
+        """Check gradient lengths and the correlation update's shape."""
+        check_shapes(feedback, {
+            **{f"{group}_gradient": weights
+               for group, weights in {**self.pattern_weights, **self.strategy_weights}.items()},
+            "correlation_matrix_update":
+                self.meta_analyzers["correlation_analyzer"]["correlation_matrix"]
+        })
+
+    def get_parameters(self) -> Dict[str, np.ndarray]:
+        """Return scoring weights and meta-analyzer parameters."""
+        return {
+            "feature_weights": self.feature_weights,
+            "trend_weights": self.meta_analyzers["trend_analyzer"]["weights"],
+            "correlation_matrix":
+                self.meta_analyzers["correlation_analyzer"]["correlation_matrix"],
+            "variance_threshold": np.array(
+                self.meta_analyzers["anomaly_detector"]["variance_threshold"])
+        }
+
+    def set_parameters(self, parameters: Dict[str, np.ndarray]) -> None:
+        """Replace scoring weights and meta-analyzer parameters."""
+        if "feature_weights" in parameters:
+            self.feature_weights = parameters["feature_weights"]
+            self._bind_group_weights()
+        if "trend_weights" in parameters:
+            self.meta_analyzers["trend_analyzer"]["weights"] = parameters["trend_weights"]
+        if "correlation_matrix" in parameters:
+            self.meta_analyzers["correlation_analyzer"]["correlation_matrix"] = \
+                parameters["correlation_matrix"]
+        if "variance_threshold" in parameters:
+            self.meta_analyzers["anomaly_detector"]["variance_threshold"] = float(
+                parameters["variance_threshold"])
+
     def _update_pattern_weights(self, feedback: Dict[str, Any]) -> None:
         """Update pattern recognition weights based on feedback."""
         learning_rate = 0.01
@@ -0,0 +1,284 @@
+"""Execution backends that run AI Engine component methods."""
+
+from typing import TYPE_CHECKING, Any, Callable, Coroutine, Dict, Hashable, List, Optional, Tuple, Type
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+import zlib
+import numpy as np
+
+if TYPE_CHECKING:
+    from .base import AIComponent, AIEngine
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXECUTOR = os.getenv("AI_EXECUTOR", "thread")
+DEFAULT_WORKERS = int(os.getenv("AI_EXECUTOR_WORKERS", "0")) or None
+
+_worker_state = threading.local()
+
+# Size and eviction count of each per-game store, by (component, store)
+StoreStats = Dict[Tuple[str, str], Tuple[int, int]]
+
+# Component replicas owned by a process executor worker
+_worker_components: Dict[str, "AIComponent"] = {}
+
+
+def _worker_loop() -> asyncio.AbstractEventLoop:
+    """Return the event loop of the current worker thread."""
+    loop = getattr(_worker_state, "loop", None)
+    if loop is None:
+        loop = asyncio.new_event_loop()
+        _worker_state.loop = loop
+    return loop
+
+
+def _run_in_worker(
+    method: Callable[[Any], Coroutine[Any, Any, Any]],
+    input_data: Any
+) -> Any:
+    """Drive a component coroutine to completion on a worker thread."""
+    return _worker_loop().run_until_complete(method(input_data))
+
+
+def _initialize_worker(
+    component_types: Dict[str, Type["AIComponent"]],
+    parameters: Dict[str, Dict[str, np.ndarray]]
+) -> None:
+    """Build this worker's component replicas from the engine's parameters."""
+    for name, component_type in component_types.items():
+        component = component_type()
+        _worker_loop().run_until_complete(component.initialize())
+        component.set_parameters(parameters[name])
+        _worker_components[name] = component
+
+
+def _call_in_worker(component: str, method: str, input_data: Any) -> Tuple[Any, StoreStats]:
+    """Run a component method, returning its result and this worker's store stats."""
+    result = _run_in_worker(getattr(_worker_components[component], method), input_data)
+    return result, _store_stats(_worker_components)
+
+
+def _latest_in_worker(component: str, store: str, game_id: Hashable) -> Any:
+    return getattr(_worker_components[component], store).latest(game_id)
+
+
+def _update_in_worker(method: str, feedback: Any) -> None:
+    for component in _worker_components.values():
+        _run_in_worker(getattr(component, method), feedback)
+
+
+def _set_parameters_in_worker(parameters: Dict[str, Dict[str, np.ndarray]]) -> None:
+    for name, values in parameters.items():
+        _worker_components[name].set_parameters(values)
+
+
+class ComponentExecutor(ABC):
+    """Runs component methods on behalf of the engine.
+
+    Methods are named rather than passed bound, so executors that keep
+    their own component replicas can look them up where they run.
+    """
+
+    @abstractmethod
+    async def run(self, engine: "AIEngine", component: str, method: str, input_data: Any) -> Any:
+        """Run ``engine.<component>.<method>(input_data)``."""
+        pass
+
+    async def update(self, engine: "AIEngine", method: str, feedback: Any) -> None:
+        """Apply feedback already applied to the engine to any replicas."""
+        pass
+
+    async def sync_parameters(self, engine: "AIEngine") -> None:
+        """Copy the engine's current parameters to any replicas."""
+        pass
+
+    async def latest(self, engine: "AIEngine", component: str, store: str, game_id: Hashable) -> Any:
+        """Return the latest entry for a game in ``engine.<component>.<store>``."""
+        return getattr(getattr(engine, component), store).latest(game_id)
+
+    def store_stats(self, engine: "AIEngine") -> StoreStats:
+        """Return the stats of every per-game store the components use."""
+        return _store_stats(engine.components)
+
+    def shutdown(self) -> None:
+        """Release worker threads or processes."""
+        pass
+
+
+class InlineExecutor(ComponentExecutor):
+    """Runs components on the event loop itself."""
+
+    async def run(self, engine: "AIEngine", component: str, method: str, input_data: Any) -> Any:
+        return await getattr(getattr(engine, component), method)(input_data)
+
+
+class ThreadExecutor(ComponentExecutor):
+    """Runs components on a thread pool sharing the engine's components.
+
+    NumPy releases the GIL in its heavier kernels, so independent stages
+    overlap while the event loop keeps serving requests.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers
+        self.pool: Optional[ThreadPoolExecutor] = None
+
+    async def run(self, engine: "AIEngine", component: str, method: str, input_data: Any) -> Any:
+        if self.pool is None:
+            self.pool = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="ai-engine")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.pool, _run_in_worker,
+            getattr(getattr(engine, component), method), input_data)
+
+    def shutdown(self) -> None:
+        if self.pool is not None:
+            self.pool.shutdown(wait=True)
+            self.pool = None
+
+
+class ProcessExecutor(ComponentExecutor):
+    """Runs components in pinned worker processes, routing games by id.
+
+    Each worker keeps its own replicas of the offloaded components, seeded
+    with the engine's parameters when the executor first runs. A game is
+    always served by the same worker (``crc32`` of its ``game_id``), so
+    per-game state such as quantum states and histories lives in a single
+    process, and only inputs and results cross process boundaries. A batch
+    is split by worker and the shards run in parallel.
+
+    Feedback is replayed on every worker after the engine applies it, so
+    replicas stay in step with the engine's weights. Cross-game state, like
+    the collective wisdom correlations, is kept per worker. Lookups in the
+    per-game stores go to the worker owning the game, and store stats are
+    summed over the workers as each reported them with its last result.
+    """
+
+    def __init__(self, workers: Optional[int] = None, start_method: str = "spawn"):
+        self.workers = workers or os.cpu_count() or 1
+        self.start_method = start_method
+        self.pools: List[ProcessPoolExecutor] = []
+        self.worker_stats: Dict[int, StoreStats] = {}
+
+    def worker_for(self, game_id: Any) -> int:
+        """Return the index of the worker that owns a game."""
+        return zlib.crc32(str(game_id).encode()) % self.workers
+
+    def start(self, engine: "AIEngine") -> None:
+        """Start the workers with replicas of the engine's offloaded components."""
+        if self.pools:
+            return
+        components = {name: getattr(engine, name) for name in _offloaded(engine)}
+        component_types = {name: type(component) for name, component in components.items()}
+        parameters = {name: _snapshot(component) for name, component in components.items()}
+        context = multiprocessing.get_context(self.start_method)
+        self.pools = [
+            ProcessPoolExecutor(
+                max_workers=1, mp_context=context,
+                initializer=_initialize_worker, initargs=(component_types, parameters))
+            for _ in range(self.workers)
+        ]
+        logger.info(f"Started {self.workers} AI Engine worker processes")
+
+    async def run(self, engine: "AIEngine", component: str, method: str, input_data: Any) -> Any:
+        self.start(engine)
+        loop = asyncio.get_running_loop()
+        if not isinstance(input_data, list):
+            worker = self.worker_for(input_data.get("game_id"))
+            result, self.worker_stats[worker] = await loop.run_in_executor(
+                self.pools[worker], _call_in_worker, component, method, input_data)
+            return result
+
+        shards: Dict[int, List[int]] = {}
+        for index, item in enumerate(input_data):
+            shards.setdefault(self.worker_for(item.get("game_id")), []).append(index)
+        outputs = await asyncio.gather(*(
+            loop.run_in_executor(
+                self.pools[worker], _call_in_worker, component, method,
+                [input_data[index] for index in indices])
+            for worker, indices in shards.items()
+        ))
+
+        results: List[Any] = [None] * len(input_data)
+        for (worker, indices), (shard, stats) in zip(shards.items(), outputs):
+            self.worker_stats[worker] = stats
+            for index, result in zip(indices, shard):
+                results[index] = result
+        return results
+
+    async def update(self, engine: "AIEngine", method: str, feedback: Any) -> None:
+        await self._broadcast(_update_in_worker, method, feedback)
+
+    async def sync_parameters(self, engine: "AIEngine") -> None:
+        if self.pools:
+            await self._broadcast(_set_parameters_in_worker, {
+                name: _snapshot(getattr(engine, name)) for name in _offloaded(engine)})
+
+    async def latest(self, engine: "AIEngine", component: str, store: str, game_id: Hashable) -> Any:
+        if not self.pools or component not in _offloaded(engine):
+            return await super().latest(engine, component, store, game_id)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.pools[self.worker_for(game_id)], _latest_in_worker, component, store, game_id)
+
+    def store_stats(self, engine: "AIEngine") -> StoreStats:
+        offloaded = _offloaded(engine)
+        stats = {key: value for key, value in super().store_stats(engine).items()
+                 if key[0] not in offloaded}
+        for worker_stats in self.worker_stats.values():
+            for key, (size, evictions) in worker_stats.items():
+                total_size, total_evictions = stats.get(key, (0, 0))
+                stats[key] = (total_size + size, total_evictions + evictions)
+        return stats
+
+    def shutdown(self) -> None:
+        for pool in self.pools:
+            pool.shutdown(wait=True)
+        self.pools = []
+        self.worker_stats = {}
+
+    async def _broadcast(self, function: Callable[..., None], *args: Any) -> None:
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(
+            loop.run_in_executor(pool, function, *args) for pool in self.pools))
+
+
+def _offloaded(engine: "AIEngine") -> List[str]:
+    """Names of the components that process executors run in their workers."""
+    return list(dict.fromkeys(stage.component for stage in engine.stages if stage.offload))
+
+
+def _store_stats(components: Dict[str, "AIComponent"]) -> StoreStats:
+    return {
+        (name, store_name): (len(store), store.evictions)
+        for name, component in components.items()
+        for store_name, store in component.stores().items()
+    }
+
+
+def _snapshot(component: "AIComponent") -> Dict[str, np.ndarray]:
+    """Copy parameters so memory maps and shared views pickle as plain arrays."""
+    return {name: np.array(value) for name, value in component.get_parameters().items()}
+
+
+EXECUTORS: Dict[str, Type[ComponentExecutor]] = {
+    "inline": InlineExecutor,
+    "thread": ThreadExecutor,
+    "process": ProcessExecutor,
+}
+
+
+def create_executor(name: str = DEFAULT_EXECUTOR, workers: Optional[int] = DEFAULT_WORKERS) -> ComponentExecutor:
+    """Create an executor by name ("inline", "thread" or "process")."""
+    if name == "inline":
+        return InlineExecutor()
+    try:
+        return EXECUTORS[name](workers)
+    except KeyError:
+        raise ValueError(f"Unknown executor: {name}")
@@ -0,0 +1,193 @@
+"""Feedback ingestion queue applying model updates in mini-batches."""
+
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional
+import asyncio
+import logging
+import os
+import numpy as np
+
+if TYPE_CHECKING:
+    from .base import AIEngine
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = int(os.getenv("AI_FEEDBACK_BATCH_SIZE", "256"))
+DEFAULT_MAX_DELAY = float(os.getenv("AI_FEEDBACK_MAX_DELAY_SECONDS", "0.05"))
+DEFAULT_MAX_PENDING = int(os.getenv("AI_FEEDBACK_MAX_PENDING", "10000"))
+
+
+def merge_feedback(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine feedback records into one record with averaged signals.
+
+    Numeric values (scalars and arrays) are averaged over the records that
+    carry them. ``<name>_gradient`` values are first scaled by the record's
+    ``<name>_accuracy``, matching how components apply them, and the merged
+    accuracy becomes 1.0. Any other value is taken from the last record
+    providing it.
+    """
+    merged: Dict[str, Any] = {}
+    numeric: Dict[str, List[np.ndarray]] = {}
+    gradients: Dict[str, List[np.ndarray]] = {}
+
+    for record in records:
+        for key, value in record.items():
+            if key.endswith("_gradient"):
+                prefix = key[:-len("_gradient")]
+                if f"{prefix}_accuracy" in record:
+                    accuracy = float(record[f"{prefix}_accuracy"])
+                    gradients.setdefault(prefix, []).append(
+                        accuracy * np.asarray(value, dtype=float))
+            elif _is_numeric(value):
+                numeric.setdefault(key, []).append(np.asarray(value, dtype=float))
+            else:
+                merged[key] = value
+
+    for key, values in numeric.items():
+        merged[key] = _to_value(np.mean(values, axis=0))
+    for prefix, values in gradients.items():
+        merged[f"{prefix}_gradient"] = _to_value(np.mean(values, axis=0))
+        merged[f"{prefix}_accuracy"] = 1.0
+
+    return merged
+
+
+def check_shapes(feedback: Dict[str, Any], parameters: Mapping[str, np.ndarray]) -> None:
+    """Raise ``ValueError`` unless feedback values match the parameters they update.
+
+    ``parameters`` maps feedback keys (e.g. ``outcome_gradient``) to the
+    arrays the values are added to.
+    """
+    for key, parameter in parameters.items():
+        if key in feedback and np.shape(feedback[key]) != np.shape(parameter):
+            raise ValueError(
+                f"{key} must have shape {np.shape(parameter)}, "
+                f"got {np.shape(feedback[key])}")
+
+
+def _is_numeric(value: Any) -> bool:
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, (int, float)):
+        return True
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return np.asarray(value).dtype.kind in "iuf"
+    return False
+
+
+def _to_value(array: np.ndarray) -> Any:
+    return float(array) if array.ndim == 0 else array.tolist()
+
+
+class FeedbackQueue:
+    """Accumulates feedback and applies it to the engine in mini-batches.
+
+    ``submit`` only enqueues, so request handlers return immediately. A
+    background task waits for the first record, collects up to
+    ``batch_size`` records or whatever arrives within ``max_delay``
+    seconds, and hands the batch to ``AIEngine.update_components_batch``,
+    which writes each component's weights once per batch. Records should
+    be checked with ``AIEngine.validate_feedback`` before they are
+    submitted; a batch that still fails is retried record by record.
+    """
+
+    def __init__(
+        self,
+        engine: "AIEngine",
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        max_pending: int = DEFAULT_MAX_PENDING
+    ):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=max_pending)
+        self.applied = 0
+        self.batches = 0
+        self.failed = 0
+        self._task: Optional[asyncio.Task] = None
+        self._inflight: Optional[asyncio.Future] = None
+
+    def submit(self, feedback: Dict[str, Any]) -> None:
+        """Enqueue a feedback record.
+
+        Raises ``asyncio.QueueFull`` when ``max_pending`` records are
+        already waiting.
+        """
+        self.queue.put_nowait(feedback)
+
+    @property
+    def pending(self) -> int:
+        return self.queue.qsize()
+
+    def start(self) -> None:
+        """Start applying queued feedback in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task after applying everything queued."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._inflight is not None:
+            # A batch that was being applied when the task was cancelled
+            await self._inflight
+            self._inflight = None
+        while not self.queue.empty():
+            await self._apply(self._drain([]))
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self.queue.get()]
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+                self._drain(batch)
+            # Shielded so that stopping never abandons a batch halfway
+            self._inflight = asyncio.ensure_future(self._apply(batch))
+            await asyncio.shield(self._inflight)
+            self._inflight = None
+
+    def _drain(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Move already queued records into the batch without waiting."""
+        while len(batch) < self.batch_size and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        return batch
+
+    async def _apply(self, batch: List[Dict[str, Any]]) -> None:
+        """Apply a batch, falling back to one record at a time if it fails.
+
+        A failed update changes no component, so retrying the records on
+        their own only loses the ones that fail again.
+        """
+        try:
+            await self.engine.update_components_batch(batch)
+            self.applied += len(batch)
+        except Exception as e:
+            logger.error(f"Error applying feedback batch of {len(batch)}: {str(e)}")
+            if len(batch) == 1:
+                self.failed += 1
+            else:
+                for record in batch:
+                    await self._apply_record(record)
+        finally:
+            self.batches += 1
+
+    async def _apply_record(self, record: Dict[str, Any]) -> None:
+        try:
+            await self.engine.update_components_batch([record])
+            self.applied += 1
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"Error applying feedback record: {str(e)}")
@@ -0,0 +1,132 @@
+"""Bounded, game-indexed history storage for AI Engine components."""
+
+from typing import Callable, Deque, Dict, Generic, Hashable, Iterator, List, Optional, Tuple, TypeVar
+from collections import OrderedDict, deque
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_MAX_ENTRIES = int(os.getenv("AI_HISTORY_MAX_ENTRIES", "100"))
+DEFAULT_MAX_AGE = float(os.getenv("AI_HISTORY_MAX_AGE_SECONDS", "3600"))
+DEFAULT_MAX_GAMES = int(os.getenv("AI_HISTORY_MAX_GAMES", "10000"))
+
+
+class HistoryStore(Generic[T]):
+    """Per-game ring buffers with retention by count and age.
+
+    Each game keeps at most ``max_entries`` entries, entries older than
+    ``max_age`` seconds are dropped, and once more than ``max_games`` games
+    are tracked the least recently written game is evicted. Looking up the
+    latest entry for a game is O(1).
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_age: Optional[float] = DEFAULT_MAX_AGE,
+        max_games: Optional[int] = DEFAULT_MAX_GAMES,
+        clock: Callable[[], float] = time.time
+    ):
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.max_games = max_games
+        self.clock = clock
+        self.evictions = 0
+        self._games: "OrderedDict[Hashable, Deque[Tuple[float, T]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def append(self, game_id: Hashable, entry: T) -> None:
+        """Record an entry as the newest one for a game."""
+        now = self.clock()
+        with self._lock:
+            buffer = self._games.get(game_id)
+            if buffer is None:
+                buffer = deque(maxlen=self.max_entries)
+                self._games[game_id] = buffer
+            else:
+                self._games.move_to_end(game_id)
+                if len(buffer) == self.max_entries:
+                    self.evictions += 1
+            buffer.append((now, entry))
+            self._evict(now)
+
+    def latest(self, game_id: Hashable) -> Optional[T]:
+        """Return the newest live entry for a game, if any."""
+        with self._lock:
+            buffer = self._games.get(game_id)
+            if not buffer:
+                return None
+            timestamp, entry = buffer[-1]
+            if self._expired(timestamp, self.clock()):
+                return None
+            return entry
+
+    def recent(self, game_id: Hashable, limit: Optional[int] = None) -> List[T]:
+        """Return up to ``limit`` live entries for a game, oldest first."""
+        with self._lock:
+            buffer = self._games.get(game_id)
+            if not buffer:
+                return []
+            now = self.clock()
+            entries = [entry for timestamp, entry in buffer
+                       if not self._expired(timestamp, now)]
+        return entries if limit is None else entries[-limit:]
+
+    def count(self, game_id: Hashable) -> int:
+        """Return the number of stored entries for a game."""
+        with self._lock:
+            return len(self._games.get(game_id, ()))
+
+    def prune(self) -> None:
+        """Drop every expired entry and every game left empty."""
+        now = self.clock()
+        with self._lock:
+            for game_id in list(self._games):
+                buffer = self._games[game_id]
+                while buffer and self._expired(buffer[0][0], now):
+                    buffer.popleft()
+                    self.evictions += 1
+                if not buffer:
+                    del self._games[game_id]
+
+    def clear(self) -> None:
+        """Remove all stored history."""
+        with self._lock:
+            self._games.clear()
+
+    @property
+    def games(self) -> int:
+        """Number of games currently tracked."""
+        return len(self._games)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(buffer) for buffer in self._games.values())
+
+    def __iter__(self) -> Iterator[T]:
+        with self._lock:
+            snapshot = [entry for buffer in self._games.values()
+                        for _, entry in buffer]
+        return iter(snapshot)
+
+    def _expired(self, timestamp: float, now: float) -> bool:
+        return self.max_age is not None and now - timestamp > self.max_age
+
+    def _evict(self, now: float) -> None:
+        """Evict the least recently written games beyond the limits.
+
+        Games are ordered by last write, so stale games sit at the front and
+        each call does O(1) amortized work.
+        """
+        while self._games:
+            game_id, buffer = next(iter(self._games.items()))
+            too_many = self.max_games is not None and len(self._games) > self.max_games
+            if not too_many and not self._expired(buffer[-1][0], now):
+                break
+            self.evictions += len(buffer)
+            del self._games[game_id]
@@ -0,0 +1,89 @@
+"""Gradient-based optimizers for AI Engine model parameters."""
+
+from typing import Dict, Optional, Type
+from abc import ABC, abstractmethod
+import numpy as np
+
+
+class Optimizer(ABC):
+    """Updates a parameter array in place from its gradient.
+
+    Optimizers keep per-parameter state (e.g. momentum), so one instance
+    should always be stepped with parameters of the same shape.
+    """
+
+    @abstractmethod
+    def step(self, parameters: np.ndarray, gradient: np.ndarray, learning_rate: float) -> None:
+        """Move ``parameters`` against ``gradient``, in place."""
+        pass
+
+    def reset(self) -> None:
+        """Forget accumulated state."""
+        pass
+
+
+class SGD(Optimizer):
+    """Plain stochastic gradient descent."""
+
+    def step(self, parameters: np.ndarray, gradient: np.ndarray, learning_rate: float) -> None:
+        parameters -= learning_rate * gradient
+
+
+class Momentum(Optimizer):
+    """Gradient descent with heavy-ball momentum."""
+
+    def __init__(self, beta: float = 0.9):
+        self.beta = beta
+        self.velocity: Optional[np.ndarray] = None
+
+    def step(self, parameters: np.ndarray, gradient: np.ndarray, learning_rate: float) -> None:
+        if self.velocity is None:
+            self.velocity = np.zeros_like(gradient)
+        self.velocity *= self.beta
+        self.velocity += gradient
+        parameters -= learning_rate * self.velocity
+
+    def reset(self) -> None:
+        self.velocity = None
+
+
+class Adam(Optimizer):
+    """Adam with bias-corrected first and second moment estimates."""
+
+    def __init__(self, beta1: float = 0.9, beta2: float = 0.999, epsilon: float = 1e-8):
+        self.beta1 = beta1
+        self.beta2 = beta2
+        self.epsilon = epsilon
+        self.steps = 0
+        self.first_moment: Optional[np.ndarray] = None
+        self.second_moment: Optional[np.ndarray] = None
+
+    def step(self, parameters: np.ndarray, gradient: np.ndarray, learning_rate: float) -> None:
+        if self.first_moment is None:
+            self.first_moment = np.zeros_like(gradient)
+            self.second_moment = np.zeros_like(gradient)
+        self.steps += 1
+        self.first_moment = self.beta1 * self.first_moment + (1 - self.beta1) * gradient
+        self.second_moment = self.beta2 * self.second_moment + (1 - self.beta2) * gradient ** 2
+        first = self.first_moment / (1 - self.beta1 ** self.steps)
+        second = self.second_moment / (1 - self.beta2 ** self.steps)
+        parameters -= learning_rate * first / (np.sqrt(second) + self.epsilon)
+
+    def reset(self) -> None:
+        self.steps = 0
+        self.first_moment = self.second_moment = None
+
+
+OPTIMIZERS: Dict[str, Type[Optimizer]] = {
+    "sgd": SGD,
+    "momentum": Momentum,
+    "adam": Adam,
+}
+
+
+def create_optimizer(name: str, **options: float) -> Optimizer:
+    """Create an optimizer by name ("sgd", "momentum" or "adam")."""
+    try:
+        return OPTIMIZERS[name](**options)
+    except KeyError:
+        raise ValueError(f"Unknown optimizer: {name}")
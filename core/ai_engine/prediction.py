@@ -1,13 +1,28 @@
 """Adaptive Prediction Engine for HAGAME."""
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import logging
+import os
 import numpy as np
 from pydantic import BaseModel
 from .base import AIComponent
+from .history import HistoryStore
+from .optim import Optimizer, create_optimizer
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_OPTIMIZER = os.getenv("AI_PREDICTION_OPTIMIZER", "sgd")
+
+# Context each model reads its features from, besides the game state
+MODEL_CONTEXTS = {
+    "behavior": "cognitive_state",
+    "outcome": "uncertainty",
+    "strategy": "cognitive_state"
+}
+
+# Models whose scores are read through a sigmoid as probabilities
+LOGISTIC_MODELS = ("outcome", "strategy")
+
 
 class PredictionModel(BaseModel):
     """Model for prediction data."""
@@ -24,8 +39,9 @@ class AdaptivePredictionEngine(AIComponent):
 
     def __init__(self):
         self.models: Dict[str, Any] = {}  # Game-specific prediction models
-        self.history: List[PredictionModel] = []
+        self.history: HistoryStore[PredictionModel] = HistoryStore()
         self.learning_rate: float = 0.01
+        self.optimizer: Optimizer = create_optimizer(DEFAULT_OPTIMIZER)
 
     async def initialize(self) -> None:
         """Initialize prediction models and parameters."""
@@ -39,117 +55,168 @@ class AdaptivePredictionEngine(AIComponent):
 
     def _create_behavior_model(self) -> Dict[str, Any]:
         """Create model for predicting player behavior."""
+        features = ["action_history", "cognitive_state", "game_context"]
         return {
-            "weights": np.random.randn(10),  # Initial random weights
+            "weights": np.random.randn(len(features)),  # One weight per feature
             "bias": np.random.randn(),
-            "features": ["action_history", "cognitive_state", "game_context"]
+            "features": features
         }
 
     def _create_outcome_model(self) -> Dict[str, Any]:
         """Create model for predicting game outcomes."""
+        features = ["game_state", "player_stats", "uncertainty"]
         return {
-            "weights": np.random.randn(8),
+            "weights": np.random.randn(len(features)),
             "bias": np.random.randn(),
-            "features": ["game_state", "player_stats", "uncertainty"]
+            "features": features
         }
 
     def _create_strategy_model(self) -> Dict[str, Any]:
         """Create model for predicting optimal strategies."""
+        features = ["game_state", "player_profile", "historical_patterns"]
         return {
-            "weights": np.random.randn(12),
+            "weights": np.random.randn(len(features)),
             "bias": np.random.randn(),
-            "features": ["game_state", "player_profile", "historical_patterns"]
+            "features": features
         }
 
     async def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Process current game state and make predictions."""
+        return (await self.process_batch([input_data]))[0]
+
+    async def process_batch(self, inputs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Make predictions for several games with one matrix product per model."""
         try:
-            game_id = input_data.get("game_id")
-            player_id = input_data.get("player_id")
-            game_state = input_data.get("game_state", {})
-            cognitive_state = input_data.get("cognitive_state", {})
-            uncertainty = input_data.get("uncertainty", {})
+            game_states = [item.get("game_state", {}) for item in inputs]
+            cognitive_states = [item.get("cognitive_state", {}) for item in inputs]
+            uncertainties = [item.get("uncertainty", {}) for item in inputs]
 
             # Make different types of predictions
-            behavior_pred = self._predict_behavior(game_state, cognitive_state)
-            outcome_pred = self._predict_outcome(game_state, uncertainty)
-            strategy_pred = self._predict_strategy(game_state, cognitive_state)
-
-            prediction = PredictionModel(
-                game_id=game_id,
-                player_id=player_id,
-                prediction_type="composite",
-                confidence=self._calculate_confidence(
-                    behavior_pred, outcome_pred, strategy_pred),
-                predicted_values={
-                    "behavior": behavior_pred,
-                    "outcome": outcome_pred,
-                    "strategy": strategy_pred
-                },
-                context={
-                    "game_state": game_state,
-                    "cognitive_state": cognitive_state,
-                    "uncertainty": uncertainty
-                }
-            )
-
-            self.history.append(prediction)
-
-            return prediction.dict()
+            behavior_preds = self._predict_behavior(game_states, cognitive_states)
+            outcome_preds = self._predict_outcome(game_states, uncertainties)
+            strategy_preds = self._predict_strategy(game_states, cognitive_states)
+
+            results = []
+            for index, item in enumerate(inputs):
+                behavior_pred = behavior_preds[index]
+                outcome_pred = outcome_preds[index]
+                strategy_pred = strategy_preds[index]
+
+                prediction = PredictionModel(
+                    game_id=item.get("game_id"),
+                    player_id=item.get("player_id"),
+                    prediction_type="composite",
+                    confidence=self._calculate_confidence(
+                        behavior_pred, outcome_pred, strategy_pred),
+                    predicted_values={
+                        "behavior": behavior_pred,
+                        "outcome": outcome_pred,
+                        "strategy": strategy_pred
+                    },
+                    context={
+                        "game_state": game_states[index],
+                        "cognitive_state": cognitive_states[index],
+                        "uncertainty": uncertainties[index]
+                    }
+                )
+
+                self.history.append(prediction.game_id, prediction)
+                results.append(prediction.dict())
+
+            return results
 
         except Exception as e:
             logger.error(f"Error in prediction processing: {str(e)}")
             raise
 
-    def _predict_behavior(self, game_state: Dict[str, Any], cognitive_state: Dict[str, Any]) -> Dict[str, Any]:
+    def _predict_behavior(
+        self,
+        game_states: List[Dict[str, Any]],
+        cognitive_states: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
         """Predict player behavior based on game state and cognitive state."""
-        features = self._extract_features(
-            game_state, cognitive_state, self.models["behavior"]["features"])
-        prediction = np.dot(
-            features, self.models["behavior"]["weights"]) + self.models["behavior"]["bias"]
-        return {
-            "predicted_actions": self._normalize_prediction(prediction),
-            "confidence": float(np.mean(np.abs(prediction)))
-        }
+        prediction = self._score_model("behavior", game_states, cognitive_states)
+        actions = self._normalize_prediction(prediction[:, np.newaxis])
+        confidence = np.abs(prediction)
+        return [
+            {
+                "predicted_actions": actions[index].tolist(),
+                "confidence": float(confidence[index])
+            }
+            for index in range(len(prediction))
+        ]
 
-    def _predict_outcome(self, game_state: Dict[str, Any], uncertainty: Dict[str, Any]) -> Dict[str, Any]:
+    def _predict_outcome(
+        self,
+        game_states: List[Dict[str, Any]],
+        uncertainties: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
         """Predict game outcome based on current state and uncertainty."""
-        features = self._extract_features(
-            game_state, uncertainty, self.models["outcome"]["features"])
-        prediction = np.dot(
-            features, self.models["outcome"]["weights"]) + self.models["outcome"]["bias"]
-        return {
-            "win_probability": float(self._sigmoid(prediction)),
-            "confidence": float(self._calculate_outcome_confidence(prediction, uncertainty))
-        }
+        prediction = self._score_model("outcome", game_states, uncertainties)
+        win_probability = self._sigmoid(prediction)
+        confidence = self._calculate_outcome_confidence(prediction, uncertainties)
+        return [
+            {
+                "win_probability": float(win_probability[index]),
+                "confidence": float(confidence[index])
+            }
+            for index in range(len(prediction))
+        ]
 
-    def _predict_strategy(self, game_state: Dict[str, Any], cognitive_state: Dict[str, Any]) -> Dict[str, Any]:
+    def _predict_strategy(
+        self,
+        game_states: List[Dict[str, Any]],
+        cognitive_states: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
         """Predict optimal strategy based on game state and cognitive state."""
-        features = self._extract_features(
-            game_state, cognitive_state, self.models["strategy"]["features"])
-        prediction = np.dot(
-            features, self.models["strategy"]["weights"]) + self.models["strategy"]["bias"]
-        return {
-            "recommended_actions": self._strategy_to_actions(prediction),
-            "confidence": float(self._calculate_strategy_confidence(prediction, cognitive_state))
-        }
+        prediction = self._score_model("strategy", game_states, cognitive_states)
+        actions = self._strategy_to_actions(prediction)
+        confidence = self._calculate_strategy_confidence(prediction, cognitive_states)
+        return [
+            {
+                "recommended_actions": actions[index],
+                "confidence": float(confidence[index])
+            }
+            for index in range(len(prediction))
+        ]
 
-    def _extract_features(self, state: Dict[str, Any], context: Dict[str, Any], feature_list: List[str]) -> np.ndarray:
-        """Extract relevant features from state and context."""
-        features = []
-        for feature in feature_list:
-            value = state.get(feature, 0) or context.get(feature, 0)
-            features.append(float(value) if isinstance(
-                value, (int, float)) else 0.0)
-        return np.array(features)
-
-    def _normalize_prediction(self, prediction: np.ndarray) -> List[float]:
-        """Normalize prediction values to probabilities."""
-        exp_pred = np.exp(prediction - np.max(prediction))
-        return (exp_pred / exp_pred.sum()).tolist()
-
-    def _sigmoid(self, x: float) -> float:
-        """Apply sigmoid function to scalar value."""
+    def _score_model(
+        self,
+        model_name: str,
+        states: List[Dict[str, Any]],
+        contexts: List[Dict[str, Any]]
+    ) -> np.ndarray:
+        """Score every state against a model with a single matrix-vector product."""
+        model = self.models[model_name]
+        features = self._extract_features(states, contexts, model["features"])
+        return features @ model["weights"] + model["bias"]
+
+    def _extract_features(
+        self,
+        states: List[Dict[str, Any]],
+        contexts: List[Dict[str, Any]],
+        feature_list: List[str]
+    ) -> np.ndarray:
+        """Extract relevant features from states and contexts into a matrix.
+
+        Column ``i`` holds ``feature_list[i]``, lining up with the model's
+        weight vector; missing or non-numeric values stay zero.
+        """
+        features = np.zeros((len(states), len(feature_list)))
+        for row, (state, context) in enumerate(zip(states, contexts)):
+            for column, feature in enumerate(feature_list):
+                value = state.get(feature, 0) or context.get(feature, 0)
+                if isinstance(value, (int, float)):
+                    features[row, column] = value
+        return features
+
+    def _normalize_prediction(self, prediction: np.ndarray) -> np.ndarray:
+        """Normalize each row of prediction values to probabilities."""
+        exp_pred = np.exp(prediction - np.max(prediction, axis=1, keepdims=True))
+        return exp_pred / exp_pred.sum(axis=1, keepdims=True)
+
+    def _sigmoid(self, x: np.ndarray) -> np.ndarray:
+        """Apply sigmoid function element-wise."""
         return 1 / (1 + np.exp(-x))
 
     def _calculate_confidence(self, *predictions: Dict[str, Any]) -> float:
@@ -157,72 +224,230 @@ class AdaptivePredictionEngine(AIComponent):
         confidences = [p.get("confidence", 0.0) for p in predictions]
         return float(np.mean(confidences))
 
-    def _calculate_outcome_confidence(self, prediction: float, uncertainty: Dict[str, Any]) -> float:
-        """Calculate confidence in outcome prediction."""
-        base_confidence = self._sigmoid(abs(prediction))
-        uncertainty_factor = uncertainty.get("outcome_uncertainty", 0.5)
+    def _calculate_outcome_confidence(
+        self,
+        prediction: np.ndarray,
+        uncertainties: List[Dict[str, Any]]
+    ) -> np.ndarray:
+        """Calculate confidence in outcome predictions."""
+        base_confidence = self._sigmoid(np.abs(prediction))
+        uncertainty_factor = np.array(
+            [u.get("outcome_uncertainty", 0.5) for u in uncertainties], dtype=float)
         return base_confidence * (1 - uncertainty_factor)
 
-    def _calculate_strategy_confidence(self, prediction: float, cognitive_state: Dict[str, Any]) -> float:
-        """Calculate confidence in strategy prediction."""
-        base_confidence = self._sigmoid(abs(prediction))
-        cognitive_factor = cognitive_state.get("certainty", 0.5)
+    def _calculate_strategy_confidence(
+        self,
+        prediction: np.ndarray,
+        cognitive_states: List[Dict[str, Any]]
+    ) -> np.ndarray:
+        """Calculate confidence in strategy predictions."""
+        base_confidence = self._sigmoid(np.abs(prediction))
+        cognitive_factor = np.array(
+            [c.get("certainty", 0.5) for c in cognitive_states], dtype=float)
         return base_confidence * cognitive_factor
 
-    def _strategy_to_actions(self, prediction: float) -> List[Dict[str, Any]]:
-        """Convert strategy prediction to concrete actions."""
+    def _strategy_to_actions(self, prediction: np.ndarray) -> List[List[Dict[str, Any]]]:
+        """Convert strategy predictions to concrete actions."""
+        move_probability = self._sigmoid(prediction)
+        attack_probability = self._sigmoid(-prediction)
         return [
-            {
-                "action_type": "move",
-                "probability": self._sigmoid(prediction),
-                "parameters": {"direction": "optimal"}
-            },
-            {
-                "action_type": "attack",
-                "probability": self._sigmoid(-prediction),
-                "parameters": {"target": "nearest"}
-            }
+            [
+                {
+                    "action_type": "move",
+                    "probability": float(move_probability[index]),
+                    "parameters": {"direction": "optimal"}
+                },
+                {
+                    "action_type": "attack",
+                    "probability": float(attack_probability[index]),
+                    "parameters": {"target": "nearest"}
+                }
+            ]
+            for index in range(len(prediction))
         ]
 
     async def update(self, feedback: Dict[str, Any]) -> None:
         """Update prediction models based on feedback."""
-        try:
-            actual_outcome = feedback.get("actual_outcome", {})
-            predicted_outcome = feedback.get("predicted_outcome", {})
+        await self.update_batch([feedback])
 
-            # Calculate prediction error
-            error = self._calculate_prediction_error(
-                actual_outcome, predicted_outcome)
+    async def update_batch(self, feedbacks: List[Dict[str, Any]]) -> None:
+        """Update prediction models with one training step over several records.
 
-            # Update model weights
-            self._update_weights(error, feedback)
+        A record's ``actual_outcome["value"]`` is the outcome model's target;
+        targets for other models may be given in its ``targets`` mapping.
+        """
+        try:
+            examples = [
+                {
+                    "game_state": feedback.get("game_state", {}),
+                    "cognitive_state": feedback.get("context", {}),
+                    "uncertainty": feedback.get("context", {}),
+                    "targets": self._feedback_targets(feedback)
+                }
+                for feedback in feedbacks
+            ]
+            features, targets = self.build_training_batch(examples)
+            losses = self.train_batch(features, targets)
 
-            # Adjust learning rate based on error
-            self._adjust_learning_rate(error)
+            # Adjust learning rate based on loss
+            if losses:
+                self._adjust_learning_rate(float(np.mean(list(losses.values()))))
 
-            logger.info(f"Updated prediction models with error: {error}")
+            logger.info(f"Updated prediction models with loss: {losses}")
 
         except Exception as e:
             logger.error(f"Error updating prediction models: {str(e)}")
             raise
 
-    def _calculate_prediction_error(self, actual: Dict[str, Any], predicted: Dict[str, Any]) -> float:
-        """Calculate error between actual and predicted outcomes."""
-        actual_value = actual.get("value", 0.0)
-        predicted_value = predicted.get("value", 0.0)
-        return float(abs(actual_value - predicted_value))
-
-    def _update_weights(self, error: float, feedback: Dict[str, Any]) -> None:
-        """Update model weights based on prediction error."""
+    def build_training_batch(
+        self,
+        examples: List[Dict[str, Any]]
+    ) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+        """Turn logged examples into per-model feature matrices and targets.
+
+        Each example holds the ``game_state``, ``cognitive_state`` and
+        ``uncertainty`` seen at prediction time and a ``targets`` mapping from
+        model name to the observed value. Missing targets become NaN.
+        """
+        game_states = [example.get("game_state", {}) for example in examples]
+        features = {}
+        targets = {}
+        for model_name, model in self.models.items():
+            contexts = [example.get(MODEL_CONTEXTS[model_name], {}) for example in examples]
+            features[model_name] = self._extract_features(
+                game_states, contexts, model["features"])
+            targets[model_name] = np.array([
+                example.get("targets", {}).get(model_name, np.nan)
+                for example in examples
+            ], dtype=float)
+        return features, targets
+
+    def train_batch(
+        self,
+        features: Dict[str, np.ndarray],
+        targets: Dict[str, np.ndarray]
+    ) -> Dict[str, float]:
+        """Take one optimizer step on a mini-batch of (features, target) pairs.
+
+        ``features`` maps each model name to an N x width matrix and
+        ``targets`` to N values, NaN where a row has no target for that
+        model. All models are stacked into one zero-padded parameter matrix
+        (bias in the last column), so scores, residuals and gradients for
+        every model come from a single pass. Outcome and strategy scores are
+        read as probabilities and trained with log loss; behavior scores
+        with squared error.
+
+        Returns the mean loss of each model that had targets.
+        """
+        names = list(self.models)
+        width = max(len(model["weights"]) for model in self.models.values())
+        rows = len(next(iter(targets.values()))) if targets else 0
+        if rows == 0:
+            return {}
+
+        inputs = np.zeros((len(names), rows, width + 1))
+        parameters = np.zeros((len(names), width + 1))
+        labels = np.full((len(names), rows), np.nan)
+        for index, model_name in enumerate(names):
+            model = self.models[model_name]
+            size = len(model["weights"])
+            if model_name in features:
+                inputs[index, :, :size] = features[model_name]
+            inputs[index, :, -1] = 1.0
+            parameters[index, :size] = model["weights"]
+            parameters[index, -1] = model["bias"]
+            if model_name in targets:
+                labels[index] = targets[model_name]
+
+        labeled = ~np.isnan(labels)
+        labels = np.where(labeled, labels, 0.0)
+        logistic = np.array([name in LOGISTIC_MODELS for name in names])[:, np.newaxis]
+
+        scores = np.einsum("mnf,mf->mn", inputs, parameters)
+        outputs = np.where(logistic, self._sigmoid(scores), scores)
+        residuals = np.where(labeled, outputs - labels, 0.0)
+        counts = labeled.sum(axis=1)
+        gradient = np.einsum("mn,mnf->mf", residuals, inputs) / np.maximum(counts, 1)[:, np.newaxis]
+
+        probabilities = np.clip(outputs, 1e-12, 1 - 1e-12)
+        log_loss = -(labels * np.log(probabilities) + (1 - labels) * np.log(1 - probabilities))
+        point_loss = np.where(logistic, log_loss, 0.5 * residuals ** 2)
+        point_loss = np.where(labeled, point_loss, 0.0)
+
+        self.optimizer.step(parameters, gradient, self.learning_rate)
+
+        losses = {}
+        for index, model_name in enumerate(names):
+            model = self.models[model_name]
+            size = len(model["weights"])
+            # In place, so weights shared with other processes stay bound
+            model["weights"][...] = parameters[index, :size]
+            model["bias"] = float(parameters[index, -1])
+            if counts[index]:
+                losses[model_name] = float(point_loss[index].sum() / counts[index])
+        return losses
+
+    def fit(
+        self,
+        features: Dict[str, np.ndarray],
+        targets: Dict[str, np.ndarray],
+        epochs: int = 1,
+        batch_size: int = 256,
+        shuffle: bool = True
+    ) -> List[Dict[str, float]]:
+        """Train on a whole dataset in mini-batches.
+
+        Returns each epoch's loss per model, averaged over its batches.
+        """
+        rows = len(next(iter(targets.values())))
+        history = []
+        for _ in range(epochs):
+            order = np.random.permutation(rows) if shuffle else np.arange(rows)
+            totals: Dict[str, List[float]] = {}
+            for start in range(0, rows, batch_size):
+                batch = order[start:start + batch_size]
+                losses = self.train_batch(
+                    {name: matrix[batch] for name, matrix in features.items()},
+                    {name: values[batch] for name, values in targets.items()})
+                for model_name, loss in losses.items():
+                    totals.setdefault(model_name, []).append(loss)
+            history.append({name: float(np.mean(values)) for name, values in totals.items()})
+        return history
+
+    def _feedback_targets(self, feedback: Dict[str, Any]) -> Dict[str, float]:
+        """Collect training targets from a feedback record."""
+        targets = dict(feedback.get("targets", {}))
+        actual = feedback.get("actual_outcome", {})
+        if "value" in actual:
+            targets.setdefault("outcome", actual["value"])
+        return targets
+
+    def stores(self) -> Dict[str, Any]:
+        """Return per-game stores for metrics."""
+        return {"history": self.history}
+
+    def get_parameters(self) -> Dict[str, np.ndarray]:
+        """Return model weights, biases and the learning rate."""
+        parameters = {"learning_rate": np.array(self.learning_rate)}
+        for model_name, model in self.models.items():
+            parameters[f"{model_name}.weights"] = model["weights"]
+            parameters[f"{model_name}.bias"] = np.array(model["bias"])
+        return parameters
+
+    def adopt(self, staged: AIComponent) -> None:
+        """Take the staged weights along with the optimizer state they were trained with."""
+        super().adopt(staged)
+        self.optimizer = staged.optimizer
+
+    def set_parameters(self, parameters: Dict[str, np.ndarray]) -> None:
+        """Replace model weights, biases and the learning rate."""
+        if "learning_rate" in parameters:
+            self.learning_rate = float(parameters["learning_rate"])
         for model_name, model in self.models.items():
-            features = self._extract_features(
-                feedback.get("game_state", {}),
-                feedback.get("context", {}),
-                model["features"]
-            )
-            gradient = error * features
-            model["weights"] -= self.learning_rate * gradient
-            model["bias"] -= self.learning_rate * error
+            if f"{model_name}.weights" in parameters:
+                model["weights"] = parameters[f"{model_name}.weights"]
+            if f"{model_name}.bias" in parameters:
+                model["bias"] = float(parameters[f"{model_name}.bias"])
 
     def _adjust_learning_rate(self, error: float) -> None:
         """Adjust learning rate based on prediction error."""
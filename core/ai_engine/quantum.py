@@ -1,13 +1,48 @@
 """Quantum Uncertainty Generator for HAGAME."""
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple
+from collections import OrderedDict
 import logging
+import threading
+import time
 import numpy as np
 from pydantic import BaseModel
 from .base import AIComponent
+from .feedback import check_shapes, merge_feedback
+from .history import DEFAULT_MAX_AGE, DEFAULT_MAX_GAMES, HistoryStore
 
 logger = logging.getLogger(__name__)
 
+# Game complexity is rounded to this many steps when caching evolution
+# operators, bounding the cache to a few hundred small matrices.
+COMPLEXITY_LEVELS = 64
+
+# Uncertainty factors in the order of the amplitudes of each state type.
+UNCERTAINTY_FACTORS: Dict[str, Tuple[str, ...]] = {
+    # Player-related uncertainties
+    "player": ("decision_uncertainty", "skill_uncertainty", "intention_uncertainty"),
+    # Game state uncertainties
+    "game": ("state_uncertainty", "outcome_uncertainty",
+             "interaction_uncertainty", "emergence_uncertainty"),
+    # Environmental uncertainties
+    "environment": ("external_uncertainty", "context_uncertainty"),
+}
+
+
+def _compile_state_layout() -> Dict[str, slice]:
+    """Assign each state type a column range in a game's packed state."""
+    layout = {}
+    start = 0
+    for state_type, factors in UNCERTAINTY_FACTORS.items():
+        layout[state_type] = slice(start, start + len(factors))
+        start += len(factors)
+    return layout
+
+
+# Columns of each state type within a game's packed state vector.
+STATE_LAYOUT = _compile_state_layout()
+STATE_WIDTH = sum(len(factors) for factors in UNCERTAINTY_FACTORS.values())
+
 
 class UncertaintyFactors(BaseModel):
     """Model for uncertainty factors."""
@@ -19,37 +54,140 @@ class UncertaintyFactors(BaseModel):
     composite_uncertainty: float
 
 
+class QuantumStatePool:
+    """Per-game quantum states packed into one contiguous complex array.
+
+    Each game owns a row of ``data`` holding its state types back to back
+    (see ``STATE_LAYOUT``). Games idle for longer than ``max_age`` or beyond
+    ``max_games`` (least recently used first) give their rows back to the
+    pool. Callers hold ``lock`` while working on rows, since the array is
+    reallocated when the pool grows.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        factory: Callable[[], np.ndarray],
+        max_games: Optional[int] = DEFAULT_MAX_GAMES,
+        max_age: Optional[float] = DEFAULT_MAX_AGE,
+        initial_capacity: int = 64,
+        clock: Callable[[], float] = time.time
+    ):
+        self.width = width
+        self.factory = factory
+        self.max_games = max_games
+        self.max_age = max_age
+        self.clock = clock
+        self.evictions = 0
+        self.data = np.zeros((initial_capacity, width), dtype=np.complex128)
+        self.lock = threading.RLock()
+        self._rows: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._updated_at = np.zeros(initial_capacity)
+        self._free: List[int] = list(range(initial_capacity - 1, -1, -1))
+
+    def acquire(self, game_ids: List[Hashable]) -> np.ndarray:
+        """Return the row of each game, creating fresh states for new games."""
+        now = self.clock()
+        with self.lock:
+            # Mark the batch as most recently used, then make room for the
+            # new games before allocating so freed rows are reused
+            batch = set(game_ids)
+            for game_id in batch & self._rows.keys():
+                self._rows.move_to_end(game_id)
+            self._evict(now, spare=batch, incoming=len(batch - self._rows.keys()))
+
+            rows = np.empty(len(game_ids), dtype=np.intp)
+            for index, game_id in enumerate(game_ids):
+                row = self._rows.get(game_id)
+                if row is None or self._expired(row, now):
+                    if row is None:
+                        row = self._allocate()
+                        self._rows[game_id] = row
+                    self.data[row] = self.factory()
+                self._updated_at[row] = now
+                rows[index] = row
+            return rows
+
+    def get(self, game_id: Hashable) -> Optional[np.ndarray]:
+        """Return a copy of a game's live state vector, if any."""
+        with self.lock:
+            row = self._rows.get(game_id)
+            if row is None or self._expired(row, self.clock()):
+                return None
+            return self.data[row].copy()
+
+    def active_rows(self) -> np.ndarray:
+        """Rows of every tracked game, least recently used first."""
+        with self.lock:
+            return np.fromiter(self._rows.values(), dtype=np.intp, count=len(self._rows))
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, game_id: Hashable) -> bool:
+        return game_id in self._rows
+
+    def _allocate(self) -> int:
+        if not self._free:
+            capacity = self.data.shape[0]
+            self.data = np.vstack([self.data, np.zeros_like(self.data)])
+            self._updated_at = np.concatenate([self._updated_at, np.zeros(capacity)])
+            self._free = list(range(2 * capacity - 1, capacity - 1, -1))
+        return self._free.pop()
+
+    def _expired(self, row: int, now: float) -> bool:
+        return self.max_age is not None and now - self._updated_at[row] > self.max_age
+
+    def _evict(self, now: float, spare: Set[Hashable], incoming: int) -> None:
+        """Release idle and least recently used rows, never those in ``spare``."""
+        while self._rows:
+            game_id, row = next(iter(self._rows.items()))
+            if game_id in spare:
+                break
+            too_many = (self.max_games is not None
+                        and len(self._rows) + incoming > self.max_games)
+            if not too_many and not self._expired(row, now):
+                break
+            self._rows.popitem(last=False)
+            self._free.append(row)
+            self.evictions += 1
+
+
 class QuantumUncertaintyGenerator(AIComponent):
     """Component for generating quantum-inspired uncertainty factors."""
 
     def __init__(self):
-        self.uncertainty_history: List[UncertaintyFactors] = []
-        self.quantum_states: Dict[str, np.ndarray] = {}
+        self.uncertainty_history: HistoryStore[UncertaintyFactors] = HistoryStore()
+        self.quantum_states = QuantumStatePool(STATE_WIDTH, self._create_game_state)
         self.entanglement_matrix: Optional[np.ndarray] = None
         self.decoherence_rate: float = 0.1
+        # Eigendecomposition of the Hamiltonian for each state size
+        self.hamiltonians: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        # Unitary operators by (size, complexity level, decoherence rate)
+        self.evolution_cache: Dict[Tuple[int, int, float], np.ndarray] = {}
+        # On a staged copy, feedback whose state blending waits for ``adopt``
+        self.deferred_blends: Optional[List[Dict[str, Any]]] = None
 
     async def initialize(self) -> None:
         """Initialize quantum uncertainty system."""
         logger.info("Initializing Quantum Uncertainty Generator")
-        self._initialize_quantum_states()
+        self._initialize_hamiltonians()
         self._initialize_entanglement_matrix()
 
-    def _initialize_quantum_states(self) -> None:
-        """Initialize quantum states for different uncertainty types."""
-        self.quantum_states = {
-            # Player-related uncertainties
-            "player": self._create_quantum_state(3),
-            # Game state uncertainties
-            "game": self._create_quantum_state(4),
-            # Environmental uncertainties
-            "environment": self._create_quantum_state(2)
-        }
+    def _initialize_hamiltonians(self) -> None:
+        """Draw a Hermitian generator per state size and diagonalize it once."""
+        self.hamiltonians = {}
+        self.evolution_cache.clear()
+        for columns in STATE_LAYOUT.values():
+            size = columns.stop - columns.start
+            h_matrix = np.random.randn(size, size) + \
+                1j * np.random.randn(size, size)
+            h_matrix = (h_matrix + h_matrix.T.conj()) / 2
+            self.hamiltonians[size] = np.linalg.eigh(h_matrix)
 
     def _initialize_entanglement_matrix(self) -> None:
         """Initialize entanglement matrix for uncertainty correlations."""
-        total_states = sum(state.shape[0]
-                           for state in self.quantum_states.values())
-        self.entanglement_matrix = np.random.randn(total_states, total_states)
+        self.entanglement_matrix = np.random.randn(STATE_WIDTH, STATE_WIDTH)
         # Make it symmetric for realistic entanglement
         self.entanglement_matrix = (
             self.entanglement_matrix + self.entanglement_matrix.T) / 2
@@ -59,146 +197,165 @@ class QuantumUncertaintyGenerator(AIComponent):
         state = np.random.randn(dimensions) + 1j * np.random.randn(dimensions)
         return state / np.linalg.norm(state)
 
+    def _create_game_state(self) -> np.ndarray:
+        """Create the packed quantum states of a newly seen game."""
+        return np.concatenate([
+            self._create_quantum_state(columns.stop - columns.start)
+            for columns in STATE_LAYOUT.values()
+        ])
+
     async def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Generate uncertainty factors for current game state."""
-        try:
-            game_id = input_data.get("game_id")
-            game_state = input_data.get("game_state", {})
-            player_state = input_data.get("player_state", {})
+        return (await self.process_batch([input_data]))[0]
 
-            # Apply quantum evolution
-            self._evolve_quantum_states(game_state)
+    async def process_batch(self, inputs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Generate uncertainty factors for several games.
 
-            # Calculate uncertainty factors
-            player_uncertainty = self._calculate_player_uncertainty(
-                player_state)
-            game_uncertainty = self._calculate_game_uncertainty(game_state)
-            env_uncertainty = self._calculate_environmental_uncertainty(
-                game_state)
+        Each game evolves its own quantum state, so results do not depend on
+        which other games were processed in between.
+        """
+        try:
+            game_ids = [item.get("game_id") for item in inputs]
+            game_states = [item.get("game_state", {}) for item in inputs]
+
+            # Apply quantum evolution and measure each game's states
+            probabilities = self._evolve_and_measure(game_ids, game_states)
 
             # Apply entanglement effects
-            self._apply_entanglement_effects(
-                player_uncertainty, game_uncertainty, env_uncertainty)
+            entangled = self._apply_entanglement_effects(probabilities)
 
             # Calculate composite uncertainty
-            composite = self._calculate_composite_uncertainty(
-                player_uncertainty,
-                game_uncertainty,
-                env_uncertainty
-            )
-
-            # Create uncertainty factors model
-            import time
-            factors = UncertaintyFactors(
-                game_id=game_id,
-                timestamp=time.time(),
-                player_uncertainty=player_uncertainty,
-                game_state_uncertainty=game_uncertainty,
-                environmental_uncertainty=env_uncertainty,
-                composite_uncertainty=composite
-            )
-
-            self.uncertainty_history.append(factors)
-
-            return factors.dict()
+            composite = self._calculate_composite_uncertainty(entangled)
+
+            # Create uncertainty factors models
+            timestamp = time.time()
+            results = []
+            for index, game_id in enumerate(game_ids):
+                uncertainties = {
+                    state_type: dict(zip(
+                        UNCERTAINTY_FACTORS[state_type],
+                        entangled[index, columns].tolist()))
+                    for state_type, columns in STATE_LAYOUT.items()
+                }
+                factors = UncertaintyFactors(
+                    game_id=game_id,
+                    timestamp=timestamp,
+                    player_uncertainty=uncertainties["player"],
+                    game_state_uncertainty=uncertainties["game"],
+                    environmental_uncertainty=uncertainties["environment"],
+                    composite_uncertainty=float(composite[index])
+                )
+                self.uncertainty_history.append(game_id, factors)
+                results.append(factors)
+
+            return [factors.dict() for factors in results]
 
         except Exception as e:
             logger.error(f"Error generating uncertainty factors: {str(e)}")
             raise
 
-    def _evolve_quantum_states(self, game_state: Dict[str, Any]) -> None:
-        """Evolve quantum states based on game state."""
+    def _evolve_and_measure(
+        self,
+        game_ids: List[str],
+        game_states: List[Dict[str, Any]]
+    ) -> np.ndarray:
+        """Evolve each game's states and return their probabilities.
+
+        A game listed several times is evolved once per occurrence, in
+        order, exactly as if the inputs had been processed one by one.
+        """
+        probabilities = np.empty((len(game_ids), STATE_WIDTH))
+
+        # Occurrences of the same game go into successive rounds
+        seen: Dict[str, int] = {}
+        rounds = np.empty(len(game_ids), dtype=np.intp)
+        for index, game_id in enumerate(game_ids):
+            rounds[index] = seen.get(game_id, 0)
+            seen[game_id] = rounds[index] + 1
+
+        pool = self.quantum_states
+        with pool.lock:
+            rows = pool.acquire(game_ids)
+            for current in range(int(rounds.max(initial=-1)) + 1):
+                selected = np.flatnonzero(rounds == current)
+                states = pool.data[rows[selected]]
+                self._evolve_quantum_states(
+                    states, [game_states[index] for index in selected])
+                pool.data[rows[selected]] = states
+                probabilities[selected] = np.abs(states) ** 2
+
+        return probabilities
+
+    def _evolve_quantum_states(
+        self,
+        states: np.ndarray,
+        game_states: List[Dict[str, Any]]
+    ) -> None:
+        """Evolve packed quantum states in place, one row per game state."""
         # Apply unitary evolution
-        for state_type, state in self.quantum_states.items():
-            evolution_matrix = self._create_evolution_matrix(
-                state.shape[0], game_state)
-            self.quantum_states[state_type] = evolution_matrix @ state
-            # Renormalize
-            self.quantum_states[state_type] /= np.linalg.norm(
-                self.quantum_states[state_type])
+        for columns in STATE_LAYOUT.values():
+            size = columns.stop - columns.start
+            operators = np.stack([
+                self._create_evolution_matrix(size, game_state)
+                for game_state in game_states
+            ])
+            states[:, columns] = np.einsum(
+                "nij,nj->ni", operators, states[:, columns])
+        self._normalize_states(states)
+
+    def evolve_active_games(self, game_state: Dict[str, Any]) -> None:
+        """Evolve every tracked game's states under one game state.
+
+        Intended for periodic ticks: each state type costs one matrix
+        product over all active games.
+        """
+        pool = self.quantum_states
+        with pool.lock:
+            rows = pool.active_rows()
+            states = pool.data[rows]
+            for columns in STATE_LAYOUT.values():
+                operator = self._create_evolution_matrix(
+                    columns.stop - columns.start, game_state)
+                states[:, columns] = states[:, columns] @ operator.T
+            self._normalize_states(states)
+            pool.data[rows] = states
+
+    def _normalize_states(self, states: np.ndarray) -> None:
+        """Renormalize each state type of each row in place."""
+        for columns in STATE_LAYOUT.values():
+            block = states[:, columns]
+            block /= np.linalg.norm(block, axis=1, keepdims=True)
 
     def _create_evolution_matrix(self, size: int, game_state: Dict[str, Any]) -> np.ndarray:
-        """Create unitary evolution matrix based on game state."""
-        # Create Hermitian matrix
-        h_matrix = np.random.randn(size, size) + \
-            1j * np.random.randn(size, size)
-        h_matrix = (h_matrix + h_matrix.T.conj()) / 2
+        """Create unitary evolution matrix based on game state.
 
-        # Add game state influence
+        With H = V diag(w) V*, exp(-i H t) = V diag(exp(-i w t)) V*, so a
+        cache miss costs one small matrix product and a hit costs nothing.
+        """
+        # Game state influence, quantized so operators can be reused
         game_factor = min(1.0, max(0.0, game_state.get("complexity", 0.5)))
-        h_matrix *= game_factor
-
-        # Convert to unitary matrix using matrix exponential
-        from scipy.linalg import expm
-        return expm(-1j * h_matrix * self.decoherence_rate)
-
-    def _calculate_player_uncertainty(self, player_state: Dict[str, Any]) -> Dict[str, float]:
-        """Calculate player-related uncertainty factors."""
-        state = self.quantum_states["player"]
-        probabilities = np.abs(state) ** 2
-
-        return {
-            "decision_uncertainty": float(probabilities[0]),
-            "skill_uncertainty": float(probabilities[1]),
-            "intention_uncertainty": float(probabilities[2])
-        }
-
-    def _calculate_game_uncertainty(self, game_state: Dict[str, Any]) -> Dict[str, float]:
-        """Calculate game state uncertainty factors."""
-        state = self.quantum_states["game"]
-        probabilities = np.abs(state) ** 2
-
-        return {
-            "state_uncertainty": float(probabilities[0]),
-            "outcome_uncertainty": float(probabilities[1]),
-            "interaction_uncertainty": float(probabilities[2]),
-            "emergence_uncertainty": float(probabilities[3])
-        }
-
-    def _calculate_environmental_uncertainty(self, game_state: Dict[str, Any]) -> Dict[str, float]:
-        """Calculate environmental uncertainty factors."""
-        state = self.quantum_states["environment"]
-        probabilities = np.abs(state) ** 2
-
-        return {
-            "external_uncertainty": float(probabilities[0]),
-            "context_uncertainty": float(probabilities[1])
-        }
-
-    def _apply_entanglement_effects(
-        self,
-        player_uncertainty: Dict[str, float],
-        game_uncertainty: Dict[str, float],
-        env_uncertainty: Dict[str, float]
-    ) -> None:
+        level = round(game_factor * COMPLEXITY_LEVELS)
+
+        key = (size, level, self.decoherence_rate)
+        operator = self.evolution_cache.get(key)
+        if operator is None:
+            eigenvalues, eigenvectors = self.hamiltonians[size]
+            time_scale = level / COMPLEXITY_LEVELS * self.decoherence_rate
+            phases = np.exp(-1j * eigenvalues * time_scale)
+            operator = (eigenvectors * phases) @ eigenvectors.conj().T
+            self.evolution_cache[key] = operator
+        return operator
+
+    def _apply_entanglement_effects(self, probabilities: np.ndarray) -> np.ndarray:
         """Apply quantum entanglement effects to uncertainty factors."""
-        # Combine all uncertainties into a vector
-        combined = np.array([
-            *player_uncertainty.values(),
-            *game_uncertainty.values(),
-            *env_uncertainty.values()
-        ])
-
         # Apply entanglement effects
-        entangled = self.entanglement_matrix @ combined
+        entangled = np.abs(probabilities @ self.entanglement_matrix.T)
 
-        # Normalize and update uncertainties
-        entangled = np.abs(entangled) / np.sum(np.abs(entangled))
+        # Normalize each game's uncertainties
+        return entangled / entangled.sum(axis=1, keepdims=True)
 
-        # Update individual uncertainties
-        idx = 0
-        for uncertainties in [player_uncertainty, game_uncertainty, env_uncertainty]:
-            for key in uncertainties:
-                uncertainties[key] = float(entangled[idx])
-                idx += 1
-
-    def _calculate_composite_uncertainty(
-        self,
-        player_uncertainty: Dict[str, float],
-        game_uncertainty: Dict[str, float],
-        env_uncertainty: Dict[str, float]
-    ) -> float:
-        """Calculate composite uncertainty score."""
+    def _calculate_composite_uncertainty(self, uncertainties: np.ndarray) -> np.ndarray:
+        """Calculate composite uncertainty score for each game."""
         # Weights for different uncertainty types
         weights = {
             "player": 0.4,
@@ -207,13 +364,10 @@ class QuantumUncertaintyGenerator(AIComponent):
         }
 
         # Calculate weighted averages
-        player_score = np.mean(
-            list(player_uncertainty.values())) * weights["player"]
-        game_score = np.mean(list(game_uncertainty.values())) * weights["game"]
-        env_score = np.mean(list(env_uncertainty.values())
-                            ) * weights["environment"]
-
-        return float(player_score + game_score + env_score)
+        return sum(
+            uncertainties[:, columns].mean(axis=1) * weights[state_type]
+            for state_type, columns in STATE_LAYOUT.items()
+        )
 
     async def update(self, feedback: Dict[str, Any]) -> None:
         """Update quantum uncertainty model based on feedback."""
@@ -233,12 +387,91 @@ class QuantumUncertaintyGenerator(AIComponent):
             logger.error(f"Error updating quantum uncertainty model: {str(e)}")
             raise
 
+    async def update_batch(self, feedbacks: List[Dict[str, Any]]) -> None:
+        """Update the uncertainty model once from several feedback records.
+
+        Model parameters use the averaged feedback; quantum states are
+        re-blended for each game the feedback names.
+        """
+        try:
+            merged = merge_feedback(feedbacks)
+            self._update_decoherence_rate(merged)
+            self._update_entanglement_matrix(merged)
+
+            game_ids = {feedback.get("game_id") for feedback in feedbacks}
+            if None in game_ids:
+                game_ids = {None}
+            for game_id in game_ids:
+                self._reinitialize_quantum_states({**merged, "game_id": game_id})
+
+            logger.info("Updated quantum uncertainty model")
+
+        except Exception as e:
+            logger.error(f"Error updating quantum uncertainty model: {str(e)}")
+            raise
+
+    def stores(self) -> Dict[str, Any]:
+        """Return per-game stores for metrics."""
+        return {
+            "uncertainty_history": self.uncertainty_history,
+            "quantum_states": self.quantum_states
+        }
+
+    def validate_feedback(self, feedback: Dict[str, Any]) -> None:
+        """Check the entanglement update's shape."""
+        check_shapes(feedback, {"correlation_feedback": self.entanglement_matrix})
+
+    def shared_state(self) -> List[Any]:
+        """Share the stores and cached evolution operators with staged copies."""
+        return [*self.stores().values(), self.evolution_cache]
+
+    def stage(self) -> AIComponent:
+        """Return a staged copy that defers re-blending quantum states to ``adopt``."""
+        staged = super().stage()
+        staged.deferred_blends = []
+        return staged
+
+    def adopt(self, staged: AIComponent) -> None:
+        """Take the staged parameters, then blend the states the feedback named."""
+        super().adopt(staged)
+        for feedback in staged.deferred_blends or ():
+            self._reinitialize_quantum_states(feedback)
+
+    def get_parameters(self) -> Dict[str, np.ndarray]:
+        """Return the Hamiltonians, entanglement matrix and decoherence rate."""
+        parameters = {
+            "entanglement_matrix": self.entanglement_matrix,
+            "decoherence_rate": np.array(self.decoherence_rate)
+        }
+        for size, (eigenvalues, eigenvectors) in self.hamiltonians.items():
+            parameters[f"hamiltonian_{size}.eigenvalues"] = eigenvalues
+            parameters[f"hamiltonian_{size}.eigenvectors"] = eigenvectors
+        return parameters
+
+    def set_parameters(self, parameters: Dict[str, np.ndarray]) -> None:
+        """Replace the model parameters, dropping cached evolution operators."""
+        if "entanglement_matrix" in parameters:
+            self.entanglement_matrix = parameters["entanglement_matrix"]
+        if "decoherence_rate" in parameters:
+            self.decoherence_rate = float(parameters["decoherence_rate"])
+        for size in self.hamiltonians:
+            prefix = f"hamiltonian_{size}"
+            if f"{prefix}.eigenvalues" in parameters:
+                self.hamiltonians[size] = (
+                    parameters[f"{prefix}.eigenvalues"],
+                    parameters[f"{prefix}.eigenvectors"]
+                )
+        self.evolution_cache.clear()
+
     def _update_decoherence_rate(self, feedback: Dict[str, Any]) -> None:
         """Update decoherence rate based on feedback."""
         accuracy = feedback.get("uncertainty_accuracy", 0.5)
         adjustment = 0.1 * (accuracy - 0.5)  # Adjust based on accuracy
-        self.decoherence_rate = max(
-            0.01, min(0.5, self.decoherence_rate + adjustment))
+        rate = max(0.01, min(0.5, self.decoherence_rate + adjustment))
+        if rate != self.decoherence_rate:
+            # Cached operators were built for the old rate
+            self.evolution_cache.clear()
+        self.decoherence_rate = rate
 
     def _update_entanglement_matrix(self, feedback: Dict[str, Any]) -> None:
         """Update entanglement matrix based on feedback."""
@@ -251,16 +484,32 @@ class QuantumUncertaintyGenerator(AIComponent):
                 self.entanglement_matrix + self.entanglement_matrix.T) / 2
 
     def _reinitialize_quantum_states(self, feedback: Dict[str, Any]) -> None:
-        """Reinitialize quantum states with feedback influence."""
-        feedback_factor = feedback.get("quantum_feedback", 1.0)
-        for state_type in self.quantum_states:
-            current_state = self.quantum_states[state_type]
-            new_state = self._create_quantum_state(current_state.shape[0])
+        """Reinitialize quantum states with feedback influence.
+
+        Feedback naming a game only affects that game; otherwise every
+        tracked game is blended.
+        """
+        feedback_factor = float(feedback.get("quantum_feedback", 1.0))
+        if self.deferred_blends is not None:
+            self.deferred_blends.append({**feedback, "quantum_feedback": feedback_factor})
+            return
+        pool = self.quantum_states
+        with pool.lock:
+            game_id = feedback.get("game_id")
+            if game_id is not None:
+                if game_id not in pool:
+                    return
+                rows = pool.acquire([game_id])
+            else:
+                rows = pool.active_rows()
+            if not len(rows):
+                return
+
+            current_states = pool.data[rows]
+            new_states = np.stack([self._create_game_state() for _ in rows])
             # Blend current and new states based on feedback
-            self.quantum_states[state_type] = (
-                current_state * (1 - feedback_factor) +
-                new_state * feedback_factor
-            )
+            states = current_states * (1 - feedback_factor) + \
+                new_states * feedback_factor
             # Renormalize
-            self.quantum_states[state_type] /= np.linalg.norm(
-                self.quantum_states[state_type])
+            self._normalize_states(states)
+            pool.data[rows] = states
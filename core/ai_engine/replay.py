@@ -0,0 +1,213 @@
+"""Offline training of AI Engine components by replaying stored games."""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from datetime import datetime
+import argparse
+import asyncio
+import logging
+import os
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.game_instance import GameInstance
+from .base import AIEngine
+from .checkpoint import FORMAT_NAME, FORMAT_VERSION
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = int(os.getenv("AI_REPLAY_CHUNK_SIZE", "1000"))
+AI_MODEL_NAME = os.getenv("AI_MODEL_NAME", "ai-engine")
+AI_CHECKPOINT_DIR = os.getenv("AI_CHECKPOINT_DIR", "checkpoints")
+
+
+def replay_target(game_state: Dict[str, Any], score: Optional[int]) -> Optional[float]:
+    """Return the outcome a stored game is trained towards, if it has one.
+
+    An explicit numeric ``outcome`` in the game state wins; otherwise a
+    scored game counts as won when its score is positive.
+    """
+    outcome = game_state.get("outcome")
+    if isinstance(outcome, (int, float)) and not isinstance(outcome, bool):
+        return float(outcome)
+    if score is not None:
+        return float(score > 0)
+    return None
+
+
+def replay_example(game_state: Dict[str, Any], target: float) -> Dict[str, Any]:
+    """Turn a stored game state into a training example for the components.
+
+    Cognitive state, uncertainty and predictions stored alongside the game
+    state are used as the contexts the components saw at serving time.
+    Targets for prediction models other than ``outcome`` may be stored in
+    the game state's ``targets`` mapping.
+    """
+    def context(key: str) -> Dict[str, Any]:
+        value = game_state.get(key)
+        return value if isinstance(value, dict) else {}
+
+    return {
+        "game_state": game_state,
+        "cognitive_state": context("cognitive_state"),
+        "uncertainty": context("uncertainty"),
+        "predictions": context("predictions"),
+        "targets": {"outcome": target, **context("targets")}
+    }
+
+
+class ReplayTrainer:
+    """Trains engine components on stored game instances, chunk by chunk.
+
+    Rows are fetched through a server-side cursor ``chunk_size`` at a time,
+    and only the current chunk and its feature matrices are held in memory,
+    so memory use does not grow with the size of the table. Each chunk is
+    one training step for the prediction engine, the collective wisdom
+    aggregator and the XAI system.
+
+    ``llm_call_logs`` (``llm_service.models.LLMCallLog``) is not replayed:
+    its rows hold prompt and response text with no game or outcome they
+    belong to, so they yield no feature or target the components train on.
+    """
+
+    def __init__(self, engine: AIEngine, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.engine = engine
+        self.chunk_size = chunk_size
+        self.games = 0
+        self.skipped = 0
+        self.chunks = 0
+        self.losses: Dict[str, List[float]] = {}
+
+    async def replay(
+        self,
+        session: AsyncSession,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """Stream game instances started in ``[since, until)`` and train on them."""
+        query = select(GameInstance.game_state, GameInstance.score)
+        if since is not None:
+            query = query.where(GameInstance.start_time >= since)
+        if until is not None:
+            query = query.where(GameInstance.start_time < until)
+
+        result = await session.stream(
+            query.execution_options(yield_per=self.chunk_size))
+        async for rows in result.partitions(self.chunk_size):
+            await self.train_chunk(rows)
+        return self.summary()
+
+    async def train_chunk(self, rows: Sequence[Tuple[Dict[str, Any], Optional[int]]]) -> Dict[str, float]:
+        """Apply one training step for a chunk of ``(game_state, score)`` rows.
+
+        Returns the prediction engine's loss per model on the chunk.
+        """
+        examples = []
+        for game_state, score in rows:
+            target = replay_target(game_state or {}, score)
+            if target is None:
+                self.skipped += 1
+                continue
+            examples.append(replay_example(game_state, target))
+        if not examples:
+            return {}
+
+        prediction = self.engine.prediction_engine
+        features, targets = prediction.build_training_batch(examples)
+        losses = prediction.train_batch(features, targets)
+
+        outcomes = targets["outcome"]
+        aggregator = self.engine.wisdom_aggregator
+        await aggregator.update(aggregator.training_feedback(
+            [example["game_state"] for example in examples], outcomes))
+        xai = self.engine.xai_system
+        await xai.update(xai.training_feedback(examples, outcomes))
+
+        self.games += len(examples)
+        self.chunks += 1
+        for model_name, loss in losses.items():
+            self.losses.setdefault(model_name, []).append(loss)
+        return losses
+
+    def summary(self) -> Dict[str, Any]:
+        """Return counters and the mean prediction loss per model so far."""
+        return {
+            "games": self.games,
+            "skipped": self.skipped,
+            "chunks": self.chunks,
+            "loss": {name: float(np.mean(values)) for name, values in self.losses.items()}
+        }
+
+
+async def run_replay(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    epochs: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    model_name: str = AI_MODEL_NAME,
+    checkpoint_dir: str = AI_CHECKPOINT_DIR
+) -> Dict[str, Any]:
+    """Train from the model's current checkpoint and publish a new one.
+
+    The new checkpoint is recorded on the model's ``ai_models`` row, so
+    workers started afterwards warm-start from the replayed weights.
+    """
+    from core.database import AsyncSessionLocal
+    from crud import ai_model as crud_ai_model
+
+    engine = AIEngine()
+    await engine.initialize_components()
+    try:
+        async with AsyncSessionLocal() as session:
+            model = await crud_ai_model.get_by_name(session, model_name)
+        if model is not None and model.file_path:
+            engine.load_checkpoint(model.file_path)
+
+        trainer = ReplayTrainer(engine, chunk_size)
+        for epoch in range(epochs):
+            async with AsyncSessionLocal() as session:
+                summary = await trainer.replay(session, since, until)
+            logger.info(f"Replay epoch {epoch + 1}/{epochs}: {summary}")
+
+        metadata = {"source": "replay", **trainer.summary()}
+        path = engine.save_checkpoint(checkpoint_dir, metadata=metadata)
+        async with AsyncSessionLocal() as session:
+            await crud_ai_model.record_checkpoint(
+                session,
+                model_name,
+                path,
+                config={"format": FORMAT_NAME, "format_version": FORMAT_VERSION},
+                metadata=metadata
+            )
+        return {**trainer.summary(), "checkpoint": path}
+
+    finally:
+        await engine.shutdown()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Train the AI engine by replaying stored game instances.")
+    parser.add_argument("--since", type=datetime.fromisoformat,
+                        help="only games started at or after this ISO timestamp")
+    parser.add_argument("--until", type=datetime.fromisoformat,
+                        help="only games started before this ISO timestamp")
+    parser.add_argument("--epochs", type=int, default=1)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--model-name", default=AI_MODEL_NAME)
+    parser.add_argument("--checkpoint-dir", default=AI_CHECKPOINT_DIR)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    summary = asyncio.run(run_replay(
+        since=args.since,
+        until=args.until,
+        epochs=args.epochs,
+        chunk_size=args.chunk_size,
+        model_name=args.model_name,
+        checkpoint_dir=args.checkpoint_dir
+    ))
+    print(summary)
+
+
+if __name__ == "__main__":
+    main()
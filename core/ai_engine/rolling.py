@@ -0,0 +1,166 @@
+"""Incremental rolling-window statistics for AI Engine components."""
+
+from typing import Callable, Hashable, Optional
+from collections import OrderedDict
+import threading
+import time
+import numpy as np
+
+from .history import DEFAULT_MAX_AGE, DEFAULT_MAX_GAMES
+
+
+class RollingWindow:
+    """Fixed-size window of feature vectors with running mean and variance.
+
+    Rows live in a preallocated ring buffer. The mean and the sum of squared
+    deviations are updated in place with Welford's sliding-window update, so
+    each push and each statistics read costs O(width).
+    """
+
+    def __init__(self, capacity: int, width: int):
+        self.capacity = capacity
+        self.width = width
+        self.data = np.zeros((capacity, width))
+        self.mean = np.zeros(width)
+        self.m2 = np.zeros(width)
+        self.count = 0
+        self.head = 0
+        self.updated_at = 0.0
+
+    @property
+    def full(self) -> bool:
+        return self.count == self.capacity
+
+    def push(self, row: np.ndarray) -> None:
+        """Add a row, replacing the oldest one once the window is full."""
+        slot = self.data[self.head]
+        if self.full:
+            delta = row - slot
+            old_mean = self.mean.copy()
+            self.mean += delta / self.count
+            self.m2 += delta * (row - self.mean + slot - old_mean)
+        else:
+            self.count += 1
+            delta = row - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (row - self.mean)
+        slot[:] = row
+        self.head = (self.head + 1) % self.capacity
+
+    def variance(self) -> np.ndarray:
+        """Population variance of each column over the window."""
+        if self.count == 0:
+            return np.zeros(self.width)
+        return np.maximum(self.m2, 0.0) / self.count
+
+    def weighted_sum(self, weights: np.ndarray) -> np.ndarray:
+        """Sum rows weighted by position, ``weights[0]`` being the oldest row.
+
+        Only meaningful once the window is full.
+        """
+        # When full, the oldest row sits at ``head``
+        return np.roll(weights, self.head) @ self.data
+
+
+class RollingWindowStore:
+    """Per-game rolling windows, evicting idle and least recently used games."""
+
+    def __init__(
+        self,
+        capacity: int,
+        width: int,
+        max_games: Optional[int] = DEFAULT_MAX_GAMES,
+        max_age: Optional[float] = DEFAULT_MAX_AGE,
+        clock: Callable[[], float] = time.time
+    ):
+        self.capacity = capacity
+        self.width = width
+        self.max_games = max_games
+        self.max_age = max_age
+        self.clock = clock
+        self.evictions = 0
+        self._windows: "OrderedDict[Hashable, RollingWindow]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, game_id: Hashable) -> Optional[RollingWindow]:
+        """Return the live window for a game, if any."""
+        with self._lock:
+            window = self._windows.get(game_id)
+            if window is None or self._expired(window, self.clock()):
+                return None
+            return window
+
+    def push(self, game_id: Hashable, row: np.ndarray) -> None:
+        """Append a row to a game's window, creating the window if needed."""
+        now = self.clock()
+        with self._lock:
+            window = self._windows.get(game_id)
+            if window is None or self._expired(window, now):
+                window = RollingWindow(self.capacity, self.width)
+                self._windows[game_id] = window
+            self._windows.move_to_end(game_id)
+            window.push(row)
+            window.updated_at = now
+            self._evict(now)
+
+    def __len__(self) -> int:
+        return len(self._windows)
+
+    def _expired(self, window: RollingWindow, now: float) -> bool:
+        return self.max_age is not None and now - window.updated_at > self.max_age
+
+    def _evict(self, now: float) -> None:
+        """Drop games beyond the size limit or idle for longer than max_age."""
+        while self._windows:
+            window = next(iter(self._windows.values()))
+            too_many = self.max_games is not None and len(self._windows) > self.max_games
+            if not too_many and not self._expired(window, now):
+                break
+            self._windows.popitem(last=False)
+            self.evictions += 1
+
+
+class RunningCorrelation:
+    """Exponentially weighted co-moments of feature vectors.
+
+    Batches are merged with the parallel form of Welford's algorithm: one
+    ``width x width`` product per batch, no stored history. ``decay`` scales
+    the accumulated weight before each merge so older batches fade out;
+    ``1.0`` keeps every observation.
+    """
+
+    def __init__(self, width: int, decay: float = 1.0):
+        self.width = width
+        self.decay = decay
+        self.weight = 0.0
+        self.mean = np.zeros(width)
+        self.comoment = np.zeros((width, width))
+        self._lock = threading.Lock()
+
+    def update(self, rows: np.ndarray) -> None:
+        """Fold a batch of rows into the running co-moments."""
+        rows = np.atleast_2d(rows)
+        count = rows.shape[0]
+        if count == 0:
+            return
+        batch_mean = rows.mean(axis=0)
+        centered = rows - batch_mean
+        batch_comoment = centered.T @ centered
+        with self._lock:
+            previous = self.weight * self.decay
+            total = previous + count
+            delta = batch_mean - self.mean
+            self.mean += delta * (count / total)
+            self.comoment *= self.decay
+            self.comoment += batch_comoment + np.outer(delta, delta) * (previous * count / total)
+            self.weight = total
+
+    def correlation(self) -> np.ndarray:
+        """Pearson correlation matrix; constant columns correlate with nothing."""
+        with self._lock:
+            comoment = self.comoment.copy()
+        scale = np.sqrt(np.maximum(np.diag(comoment), 0.0))
+        denominator = np.outer(scale, scale)
+        return np.divide(
+            comoment, denominator,
+            out=np.zeros_like(comoment), where=denominator > 1e-12)
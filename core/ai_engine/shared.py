@@ -0,0 +1,272 @@
+"""Model weights shared between worker processes through shared memory."""
+
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
+from contextlib import asynccontextmanager, contextmanager
+from multiprocessing import resource_tracker, shared_memory
+import asyncio
+import fcntl
+import logging
+import os
+import tempfile
+import time
+import numpy as np
+
+if TYPE_CHECKING:
+    from .base import AIComponent, AIEngine
+
+logger = logging.getLogger(__name__)
+
+# Parameters kept in shared memory, by component. ``None`` shares every
+# parameter the component reports; the collective aggregator's pattern and
+# strategy weights are views into its fused feature weights.
+SHARED_PARAMETERS: Dict[str, Optional[Tuple[str, ...]]] = {
+    "prediction_engine": None,
+    "wisdom_aggregator": ("feature_weights",),
+    "xai_system": None,
+}
+
+# Header words: sequence counter, active slot, last flip time (ns), slot size
+_SEQUENCE, _ACTIVE, _FLIPPED_AT, _SLOT_SIZE = range(4)
+_HEADER_WORDS = 4
+
+
+class SharedParameter(NamedTuple):
+    """Location of one parameter within a weights slot."""
+    component: str
+    name: str
+    shape: Tuple[int, ...]
+    offset: int
+    size: int
+
+
+def parameter_layout(engine: "AIEngine") -> List[SharedParameter]:
+    """Lay out the engine's shared parameters back to back as float64."""
+    layout = []
+    offset = 0
+    components = engine.components
+    for component, names in SHARED_PARAMETERS.items():
+        parameters = components[component].get_parameters()
+        for name in names or sorted(parameters):
+            shape = np.shape(parameters[name])
+            size = int(np.prod(shape, dtype=np.int64))
+            layout.append(SharedParameter(component, name, shape, offset, size))
+            offset += size
+    return layout
+
+
+class SharedWeights:
+    """Double-buffered model weights in a named shared memory segment.
+
+    The segment holds a small header followed by two slots, each large
+    enough for every shared parameter. Readers bind their components to
+    read-only views of the active slot, so serving requests never copies
+    weights; ``refresh`` only rebinds when the sequence counter moved.
+
+    Updates go through a single writer at a time, serialized by an
+    exclusive lock on ``lock_path``. The writer applies feedback to
+    private copies of the weights, writes them into the inactive slot and
+    flips the active slot. The flip is published seqlock style: the counter is odd while
+    the header changes, and readers retry until they see the same even
+    value before and after reading it. Flips are spaced at least
+    ``grace_period`` seconds apart, so a slot is never rewritten while a
+    request that bound to it before the previous flip may still use it.
+    """
+
+    def __init__(
+        self,
+        segment: shared_memory.SharedMemory,
+        layout: List[SharedParameter],
+        grace_period: float = 1.0,
+        lock_path: Optional[str] = None
+    ):
+        self.segment = segment
+        self.layout = layout
+        self.grace_period = grace_period
+        self.lock_path = lock_path or os.path.join(
+            tempfile.gettempdir(), f"{segment.name.lstrip('/')}.lock")
+        self.slot_size = sum(parameter.size for parameter in layout)
+        self.header = np.ndarray((_HEADER_WORDS,), dtype=np.int64, buffer=segment.buf)
+        self.slots = np.ndarray(
+            (2, self.slot_size), dtype=np.float64, buffer=segment.buf,
+            offset=self.header.nbytes)
+        self.sequence = 0
+        self._update_lock = asyncio.Lock()
+
+    @classmethod
+    def open(
+        cls,
+        name: str,
+        engine: "AIEngine",
+        grace_period: float = 1.0,
+        lock_path: Optional[str] = None
+    ) -> "SharedWeights":
+        """Attach to the named segment, creating and seeding it if needed.
+
+        The first process to open the segment publishes its current weights
+        (e.g. from a checkpoint); later processes adopt the shared ones.
+        The segment outlives the processes using it; see ``remove``.
+        """
+        layout = parameter_layout(engine)
+        slot_size = sum(parameter.size for parameter in layout)
+        size = 8 * (_HEADER_WORDS + 2 * slot_size)
+        try:
+            segment = _open_segment(name, create=True, size=size)
+            created = True
+        except FileExistsError:
+            segment = _open_segment(name)
+            created = False
+            if segment.size < size:
+                segment.close()
+                raise ValueError(
+                    f"Shared weights segment {name} is too small for this model")
+
+        shared = cls(segment, layout, grace_period, lock_path)
+        if created:
+            with shared._exclusive():
+                shared._write(0, engine.components)
+                shared.header[_SLOT_SIZE] = slot_size
+                shared._flip(0)
+        shared.refresh(engine)
+        return shared
+
+    def refresh(self, engine: "AIEngine") -> bool:
+        """Bind the engine to the active slot if it changed since last time.
+
+        Returns whether the engine was rebound.
+        """
+        while True:
+            sequence = int(self.header[_SEQUENCE])
+            if sequence == 0 or sequence == self.sequence:
+                # Nothing published yet, or already bound to this version
+                return False
+            if sequence & 1:
+                # A writer is flipping the active slot
+                continue
+            active = int(self.header[_ACTIVE])
+            slot_size = int(self.header[_SLOT_SIZE])
+            if int(self.header[_SEQUENCE]) == sequence:
+                break
+
+        if slot_size != self.slot_size:
+            raise ValueError(
+                f"Shared weights segment holds {slot_size} values, "
+                f"expected {self.slot_size}")
+        self._bind(active, engine, writeable=False)
+        self.sequence = sequence
+        return True
+
+    async def update(
+        self,
+        engine: "AIEngine",
+        stage: Callable[[Any], Awaitable[Dict[str, "AIComponent"]]],
+        feedback: Any
+    ) -> None:
+        """Apply a feedback update as the single writer and publish it.
+
+        ``stage`` applies the feedback to private copies of the components
+        (see ``AIComponent.stage``), so requests served by this process
+        meanwhile keep reading the active slot. The copies are written into
+        the inactive slot, and the engine adopts them only once the flip
+        is published.
+        """
+        async with self._update_lock, self._exclusive_async():
+            self.refresh(engine)
+
+            # Let readers still using the inactive slot finish first
+            elapsed = (time.time_ns() - int(self.header[_FLIPPED_AT])) / 1e9
+            if elapsed < self.grace_period:
+                await asyncio.sleep(self.grace_period - elapsed)
+
+            staged = await stage(feedback)
+            target = 1 - int(self.header[_ACTIVE])
+            self._write(target, staged)
+            self._flip(target)
+            # Unshared parameters come from the copies, shared ones from the slot
+            engine.adopt(staged)
+            self.refresh(engine)
+
+    def close(self, engine: "AIEngine") -> None:
+        """Detach from the segment, leaving it to the remaining workers.
+
+        The engine keeps private copies of the weights it was bound to.
+        """
+        components = engine.components
+        for component, names in SHARED_PARAMETERS.items():
+            parameters = components[component].get_parameters()
+            components[component].set_parameters({
+                name: np.array(parameters[name])
+                for name in names or parameters
+            })
+        self.header = self.slots = None
+        self.segment.close()
+
+    @staticmethod
+    def remove(name: str) -> None:
+        """Delete a named segment, e.g. when deploying a new model layout."""
+        try:
+            segment = _open_segment(name)
+        except FileNotFoundError:
+            return
+        segment.close()
+        segment.unlink()
+
+    def _bind(self, slot: int, engine: "AIEngine", writeable: bool) -> None:
+        """Hand views of a slot to the components that own the parameters."""
+        parameters: Dict[str, Dict[str, np.ndarray]] = {}
+        for parameter in self.layout:
+            view = self.slots[slot, parameter.offset:parameter.offset + parameter.size]
+            view = view.reshape(parameter.shape)
+            view.flags.writeable = writeable
+            parameters.setdefault(parameter.component, {})[parameter.name] = view
+        components = engine.components
+        for component, values in parameters.items():
+            components[component].set_parameters(values)
+
+    def _write(self, slot: int, components: Dict[str, "AIComponent"]) -> None:
+        """Copy the components' current parameters into a slot."""
+        current = {component: components[component].get_parameters()
+                   for component in SHARED_PARAMETERS}
+        for parameter in self.layout:
+            view = self.slots[slot, parameter.offset:parameter.offset + parameter.size]
+            value = np.asarray(current[parameter.component][parameter.name])
+            if not np.shares_memory(view, value):
+                view[:] = value.reshape(-1)
+
+    def _flip(self, slot: int) -> None:
+        """Publish a slot as the active one."""
+        self.header[_SEQUENCE] += 1
+        self.header[_ACTIVE] = slot
+        self.header[_FLIPPED_AT] = time.time_ns()
+        self.header[_SEQUENCE] += 1
+
+    @contextmanager
+    def _exclusive(self):
+        """Hold the cross-process writer lock."""
+        descriptor = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(descriptor, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(descriptor)
+
+    @asynccontextmanager
+    async def _exclusive_async(self):
+        """Hold the cross-process writer lock without blocking the event loop."""
+        descriptor = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            await asyncio.to_thread(fcntl.flock, descriptor, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(descriptor)
+
+
+def _open_segment(name: str, create: bool = False, size: int = 0) -> shared_memory.SharedMemory:
+    """Open a segment without tying its lifetime to this process."""
+    try:
+        return shared_memory.SharedMemory(name=name, create=create, size=size, track=False)
+    except TypeError:
+        # Before Python 3.13 the resource tracker would unlink the segment
+        # when this process exits, even though other workers still use it
+        segment = shared_memory.SharedMemory(name=name, create=create, size=size)
+        resource_tracker.unregister(segment._name, "shared_memory")
+        return segment
@@ -1,13 +1,43 @@
 """Explainable AI (XAI) component for HAGAME."""
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import logging
+import string
 import numpy as np
 from pydantic import BaseModel
 from .base import AIComponent
+from .feedback import check_shapes
+from .history import HistoryStore
 
 logger = logging.getLogger(__name__)
 
+# Fields each explanation template is formatted with
+TEMPLATE_FIELDS = {
+    "decision": frozenset({"main_factor", "secondary_factor", "context_factor"}),
+    "outcome": frozenset({"main_factor", "secondary_factor", "historical_factor"}),
+    "strategy": frozenset({"main_factor", "secondary_factor", "reasoning_factor"}),
+    "counterfactual": frozenset({"changed_factor", "alternative_value", "alternative_outcome"}),
+}
+
+
+def check_template(template_type: str, template: str) -> None:
+    """Raise ``ValueError`` unless ``template`` can replace the ``template_type`` template.
+
+    Only the fields that type is formatted with may appear, by plain name,
+    so an accepted template can never fail when explanations are built.
+    """
+    if template_type not in TEMPLATE_FIELDS:
+        raise ValueError(f"Unknown explanation template: {template_type}")
+    fields = TEMPLATE_FIELDS[template_type]
+    try:
+        names = {name for _, name, _, _ in string.Formatter().parse(template) if name is not None}
+        unknown = names - fields
+        if unknown:
+            raise ValueError(f"unknown fields {sorted(unknown)}")
+        template.format(**{field: "" for field in fields})
+    except (ValueError, IndexError, KeyError) as e:
+        raise ValueError(f"Invalid {template_type} explanation template: {e}") from e
+
 
 class Explanation(BaseModel):
     """Model for AI explanation data."""
@@ -23,7 +53,7 @@ class ExplainableAI(AIComponent):
     """Component for generating explanations of AI decisions."""
 
     def __init__(self):
-        self.explanation_history: List[Explanation] = []
+        self.explanation_history: HistoryStore[Explanation] = HistoryStore()
         self.feature_weights: Dict[str, np.ndarray] = {
             "decision": np.random.randn(5),
             "outcome": np.random.randn(4),
@@ -110,52 +140,60 @@ class ExplainableAI(AIComponent):
 
     async def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Generate explanations for AI decisions and predictions."""
+        return (await self.process_batch([input_data]))[0]
+
+    async def process_batch(self, inputs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Generate explanations for several games at once."""
         try:
-            game_id = input_data.get("game_id")
-            game_state = input_data.get("game_state", {})
-            predictions = input_data.get("predictions", {})
-            cognitive_state = input_data.get("cognitive_state", {})
+            game_states = [item.get("game_state", {}) for item in inputs]
+            predictions = [item.get("predictions", {}) for item in inputs]
+            cognitive_states = [item.get("cognitive_state", {}) for item in inputs]
+
+            # Weighted feature contributions, one row per game
+            importance = {
+                "decision": self._extract_decision_features(
+                    game_states, predictions) * self.analyzers["decision"]["weights"],
+                "outcome": self._extract_outcome_features(
+                    game_states, predictions) * self.analyzers["outcome"]["weights"],
+                "strategy": self._extract_strategy_features(
+                    game_states, cognitive_states) * self.analyzers["strategy"]["weights"]
+            }
 
             # Generate decision explanations
             decision_explanations = self._explain_decisions(
-                game_state,
-                predictions,
-                cognitive_state
+                game_states,
+                cognitive_states,
+                importance
             )
 
             # Calculate feature importance
-            feature_importance = self._calculate_feature_importance(
-                game_state,
-                predictions
-            )
+            feature_importance = self._calculate_feature_importance(importance)
 
             # Generate counterfactuals
-            counterfactuals = self._generate_counterfactuals(
-                game_state,
-                predictions
-            )
+            counterfactuals = self._generate_counterfactuals(importance)
 
             # Calculate confidence levels
-            confidence_levels = self._calculate_confidence_levels(
-                game_state,
-                predictions,
-                feature_importance
-            )
+            confidence_levels = self._calculate_confidence_levels(importance)
 
-            # Create explanation model
+            # Create explanation models
             import time
-            explanation = Explanation(
-                game_id=game_id,
-                timestamp=time.time(),
-                decision_explanations=decision_explanations,
-                feature_importance=feature_importance,
-                counterfactuals=counterfactuals,
-                confidence_levels=confidence_levels
-            )
-
-            self.explanation_history.append(explanation)
-
-            return explanation.dict()
+            timestamp = time.time()
+            results = []
+            for index, item in enumerate(inputs):
+                explanation = Explanation(
+                    game_id=item.get("game_id"),
+                    timestamp=timestamp,
+                    decision_explanations=decision_explanations[index],
+                    feature_importance=feature_importance[index],
+                    counterfactuals=counterfactuals[index],
+                    confidence_levels=confidence_levels[index]
+                )
+                results.append(explanation)
+
+            for explanation in results:
+                self.explanation_history.append(explanation.game_id, explanation)
+
+            return [explanation.dict() for explanation in results]
 
         except Exception as e:
             logger.error(f"Error generating explanations: {str(e)}")
@@ -163,237 +201,211 @@ class ExplainableAI(AIComponent):
 
     def _explain_decisions(
         self,
-        game_state: Dict[str, Any],
-        predictions: Dict[str, Any],
-        cognitive_state: Dict[str, Any]
-    ) -> Dict[str, str]:
+        game_states: List[Dict[str, Any]],
+        cognitive_states: List[Dict[str, Any]],
+        importance: Dict[str, np.ndarray]
+    ) -> List[Dict[str, str]]:
         """Generate natural language explanations for decisions."""
-        explanations = {}
-
-        # Explain decision making
-        decision_factors = self._analyze_decision_factors(
-            game_state, predictions)
-        explanations["decision"] = self._format_decision_explanation(
-            decision_factors)
-
-        # Explain outcome predictions
-        outcome_factors = self._analyze_outcome_factors(
-            game_state, predictions)
-        explanations["outcome"] = self._format_outcome_explanation(
-            outcome_factors)
-
-        # Explain strategy recommendations
-        strategy_factors = self._analyze_strategy_factors(
-            game_state, cognitive_state)
-        explanations["strategy"] = self._format_strategy_explanation(
-            strategy_factors)
+        # Rank factors for every game at once
+        decision_main, decision_secondary = self._rank_factors(
+            importance["decision"], self.analyzers["decision"]["features"])
+        outcome_main, outcome_secondary = self._rank_factors(
+            importance["outcome"], self.analyzers["outcome"]["features"])
+        strategy_main, strategy_secondary = self._rank_factors(
+            importance["strategy"], self.analyzers["strategy"]["features"])
+
+        explanations = []
+        for index, game_state in enumerate(game_states):
+            explanations.append({
+                # Explain decision making
+                "decision": self._format_explanation("decision", {
+                    "main_factor": decision_main[index],
+                    "secondary_factor": decision_secondary[index],
+                    "context_factor": self._get_context_factor(game_state)
+                }),
+                # Explain outcome predictions
+                "outcome": self._format_explanation("outcome", {
+                    "main_factor": outcome_main[index],
+                    "secondary_factor": outcome_secondary[index],
+                    "historical_factor": self._get_historical_factor(game_state)
+                }),
+                # Explain strategy recommendations
+                "strategy": self._format_explanation("strategy", {
+                    "main_factor": strategy_main[index],
+                    "secondary_factor": strategy_secondary[index],
+                    "reasoning_factor": self._get_reasoning_factor(
+                        cognitive_states[index])
+                })
+            })
 
         return explanations
 
-    def _analyze_decision_factors(
+    def _rank_factors(
         self,
-        game_state: Dict[str, Any],
-        predictions: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Analyze factors influencing decisions."""
-        analyzer = self.analyzers["decision"]
-        features = self._extract_decision_features(game_state, predictions)
-        importance = features * analyzer["weights"]
-
-        return {
-            "main_factor": self._get_most_important_factor(
-                importance,
-                analyzer["features"]
-            ),
-            "secondary_factor": self._get_secondary_factor(
-                importance,
-                analyzer["features"]
-            ),
-            "context_factor": self._get_context_factor(game_state)
-        }
-
-    def _analyze_outcome_factors(
-        self,
-        game_state: Dict[str, Any],
-        predictions: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Analyze factors influencing outcome predictions."""
-        analyzer = self.analyzers["outcome"]
-        features = self._extract_outcome_features(game_state, predictions)
-        importance = features * analyzer["weights"]
-
-        return {
-            "main_factor": self._get_most_important_factor(
-                importance,
-                analyzer["features"]
-            ),
-            "secondary_factor": self._get_secondary_factor(
-                importance,
-                analyzer["features"]
-            ),
-            "historical_factor": self._get_historical_factor(game_state)
-        }
-
-    def _analyze_strategy_factors(
-        self,
-        game_state: Dict[str, Any],
-        cognitive_state: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Analyze factors influencing strategy recommendations."""
-        analyzer = self.analyzers["strategy"]
-        features = self._extract_strategy_features(game_state, cognitive_state)
-        importance = features * analyzer["weights"]
-
-        return {
-            "main_factor": self._get_most_important_factor(
-                importance,
-                analyzer["features"]
-            ),
-            "secondary_factor": self._get_secondary_factor(
-                importance,
-                analyzer["features"]
-            ),
-            "reasoning_factor": self._get_reasoning_factor(cognitive_state)
-        }
+        importance: np.ndarray,
+        feature_names: List[str]
+    ) -> Tuple[List[str], List[str]]:
+        """Return the most and second most important factor of each row."""
+        order = np.argsort(-np.abs(importance), axis=1, kind="stable")
+        main = [feature_names[i] for i in order[:, 0]]
+        secondary = [feature_names[i] for i in order[:, min(1, order.shape[1] - 1)]]
+        return main, secondary
+
+    def _format_explanation(self, template_type: str, factors: Dict[str, str]) -> str:
+        """Fill an explanation template with readable factor names."""
+        readable = {key: value.replace("_", " ") for key, value in factors.items()}
+        return self.explanation_templates[template_type].format(**readable)
+
+    def _get_context_factor(self, game_state: Dict[str, Any]) -> str:
+        """Describe the game context a decision was made in."""
+        return f"the {game_state.get('state_type', 'current')} game state"
+
+    def _get_historical_factor(self, game_state: Dict[str, Any]) -> str:
+        """Describe what history says about the predicted outcome."""
+        trend = game_state.get("historical_trend")
+        if trend is None:
+            return "no strong historical trend"
+        return f"a historical trend of {trend}"
+
+    def _get_reasoning_factor(self, cognitive_state: Dict[str, Any]) -> str:
+        """Describe why a strategy suits the player."""
+        style = cognitive_state.get("learning_style", "balanced")
+        return f"it suits a {style} learning style"
 
     def _calculate_feature_importance(
         self,
-        game_state: Dict[str, Any],
-        predictions: Dict[str, Any]
-    ) -> Dict[str, float]:
+        importance: Dict[str, np.ndarray]
+    ) -> List[Dict[str, float]]:
         """Calculate importance scores for different features."""
-        importance_scores = {}
-
-        # Calculate decision feature importance
-        decision_features = self._extract_decision_features(
-            game_state, predictions)
-        importance_scores.update(self._calculate_feature_scores(
-            decision_features,
-            self.analyzers["decision"]["features"],
-            self.feature_weights["decision"]
-        ))
-
-        # Calculate outcome feature importance
-        outcome_features = self._extract_outcome_features(
-            game_state, predictions)
-        importance_scores.update(self._calculate_feature_scores(
-            outcome_features,
-            self.analyzers["outcome"]["features"],
-            self.feature_weights["outcome"]
-        ))
-
-        # Calculate strategy feature importance
-        strategy_features = self._extract_strategy_features(game_state, {})
-        importance_scores.update(self._calculate_feature_scores(
-            strategy_features,
-            self.analyzers["strategy"]["features"],
-            self.feature_weights["strategy"]
-        ))
-
-        return importance_scores
+        scores = np.hstack([
+            self._calculate_feature_scores(importance[analyzer])
+            for analyzer in self.analyzers
+        ])
+        names = [
+            feature
+            for analyzer in self.analyzers.values()
+            for feature in analyzer["features"]
+        ]
+        return [dict(zip(names, row.tolist())) for row in scores]
+
+    def _calculate_feature_scores(self, importance: np.ndarray) -> np.ndarray:
+        """Normalize absolute contributions so each row sums to one."""
+        magnitude = np.abs(importance)
+        totals = magnitude.sum(axis=1, keepdims=True)
+        return np.divide(
+            magnitude, totals, out=np.zeros_like(magnitude), where=totals > 0)
 
     def _generate_counterfactuals(
         self,
-        game_state: Dict[str, Any],
-        predictions: Dict[str, Any]
-    ) -> List[Dict[str, Any]]:
-        """Generate counterfactual explanations."""
-        counterfactuals = []
-
-        # Generate decision counterfactuals
-        decision_cf = self._generate_decision_counterfactuals(
-            game_state, predictions)
-        counterfactuals.extend(decision_cf)
-
-        # Generate outcome counterfactuals
-        outcome_cf = self._generate_outcome_counterfactuals(
-            game_state, predictions)
-        counterfactuals.extend(outcome_cf)
+        importance: Dict[str, np.ndarray]
+    ) -> List[List[Dict[str, Any]]]:
+        """Generate counterfactual explanations.
+
+        For each analyzer, the counterfactual removes the strongest factor
+        and reports how the score would move without it.
+        """
+        per_analyzer = {}
+        for analyzer_type, contributions in importance.items():
+            features = self.analyzers[analyzer_type]["features"]
+            strongest = np.argmax(np.abs(contributions), axis=1)
+            impact = -contributions[np.arange(len(contributions)), strongest]
+            per_analyzer[analyzer_type] = (features, strongest, impact)
 
-        # Generate strategy counterfactuals
-        strategy_cf = self._generate_strategy_counterfactuals(
-            game_state, predictions)
-        counterfactuals.extend(strategy_cf)
+        counterfactuals = []
+        for index in range(len(next(iter(importance.values())))):
+            game_counterfactuals = []
+            for analyzer_type, (features, strongest, impact) in per_analyzer.items():
+                changed_factor = features[strongest[index]]
+                alternative_outcome = "higher" if impact[index] > 0 else "lower"
+                game_counterfactuals.append({
+                    "type": analyzer_type,
+                    "changed_factor": changed_factor,
+                    "alternative_value": 0.0,
+                    "impact": float(impact[index]),
+                    "explanation": self._format_explanation("counterfactual", {
+                        "changed_factor": changed_factor,
+                        "alternative_value": "absent",
+                        "alternative_outcome": alternative_outcome
+                    })
+                })
+            counterfactuals.append(game_counterfactuals)
 
         return counterfactuals
 
     def _calculate_confidence_levels(
         self,
-        game_state: Dict[str, Any],
-        predictions: Dict[str, Any],
-        feature_importance: Dict[str, float]
-    ) -> Dict[str, float]:
-        """Calculate confidence levels for explanations."""
-        confidence_levels = {}
-
-        # Calculate decision explanation confidence
-        confidence_levels["decision_confidence"] = self._calculate_decision_confidence(
-            game_state,
-            predictions,
-            feature_importance
-        )
-
-        # Calculate outcome explanation confidence
-        confidence_levels["outcome_confidence"] = self._calculate_outcome_confidence(
-            game_state,
-            predictions,
-            feature_importance
-        )
-
-        # Calculate strategy explanation confidence
-        confidence_levels["strategy_confidence"] = self._calculate_strategy_confidence(
-            game_state,
-            predictions,
-            feature_importance
-        )
-
-        # Calculate overall explanation confidence
-        confidence_levels["overall_confidence"] = np.mean(
-            list(confidence_levels.values()))
-
-        return confidence_levels
+        importance: Dict[str, np.ndarray]
+    ) -> List[Dict[str, float]]:
+        """Calculate confidence levels for explanations.
+
+        An explanation is more trustworthy when a single factor dominates,
+        so confidence is the share of the strongest contribution.
+        """
+        confidence = {
+            f"{analyzer_type}_confidence": self._calculate_feature_scores(
+                contributions).max(axis=1, initial=0.0)
+            for analyzer_type, contributions in importance.items()
+        }
+        overall = np.mean(list(confidence.values()), axis=0)
+
+        return [
+            {
+                **{key: float(values[index]) for key, values in confidence.items()},
+                "overall_confidence": float(overall[index])
+            }
+            for index in range(len(overall))
+        ]
 
     def _extract_decision_features(
         self,
-        game_state: Dict[str, Any],
-        predictions: Dict[str, Any]
+        game_states: List[Dict[str, Any]],
+        predictions: List[Dict[str, Any]]
     ) -> np.ndarray:
         """Extract features for decision explanation."""
         return np.array([
-            float(game_state.get("player_state_value", 0.0)),
-            float(game_state.get("game_context_value", 0.0)),
-            float(game_state.get("historical_actions_value", 0.0)),
-            float(predictions.get("predicted_outcome_value", 0.0)),
-            float(predictions.get("uncertainty_value", 0.0))
-        ])
+            [
+                float(game_state.get("player_state_value", 0.0)),
+                float(game_state.get("game_context_value", 0.0)),
+                float(game_state.get("historical_actions_value", 0.0)),
+                float(prediction.get("predicted_outcome_value", 0.0)),
+                float(prediction.get("uncertainty_value", 0.0))
+            ]
+            for game_state, prediction in zip(game_states, predictions)
+        ]).reshape(len(game_states), 5)
 
     def _extract_outcome_features(
         self,
-        game_state: Dict[str, Any],
-        predictions: Dict[str, Any]
+        game_states: List[Dict[str, Any]],
+        predictions: List[Dict[str, Any]]
     ) -> np.ndarray:
         """Extract features for outcome explanation."""
         return np.array([
-            float(game_state.get("current_state_value", 0.0)),
-            float(game_state.get("player_performance_value", 0.0)),
-            float(game_state.get("game_dynamics_value", 0.0)),
-            float(game_state.get("external_factors_value", 0.0))
-        ])
+            [
+                float(game_state.get("current_state_value", 0.0)),
+                float(game_state.get("player_performance_value", 0.0)),
+                float(game_state.get("game_dynamics_value", 0.0)),
+                float(game_state.get("external_factors_value", 0.0))
+            ]
+            for game_state in game_states
+        ]).reshape(len(game_states), 4)
 
     def _extract_strategy_features(
         self,
-        game_state: Dict[str, Any],
-        cognitive_state: Dict[str, Any]
+        game_states: List[Dict[str, Any]],
+        cognitive_states: List[Dict[str, Any]]
     ) -> np.ndarray:
         """Extract features for strategy explanation."""
         return np.array([
-            float(game_state.get("player_profile_value", 0.0)),
-            float(game_state.get("game_objectives_value", 0.0)),
-            float(game_state.get("resource_state_value", 0.0)),
-            float(game_state.get("opponent_analysis_value", 0.0)),
-            float(game_state.get("risk_factors_value", 0.0)),
-            float(game_state.get("temporal_context_value", 0.0))
-        ])
+            [
+                float(game_state.get("player_profile_value", 0.0)),
+                float(game_state.get("game_objectives_value", 0.0)),
+                float(game_state.get("resource_state_value", 0.0)),
+                float(game_state.get("opponent_analysis_value", 0.0)),
+                float(game_state.get("risk_factors_value", 0.0)),
+                float(game_state.get("temporal_context_value", 0.0))
+            ]
+            for game_state in game_states
+        ]).reshape(len(game_states), 6)
 
     async def update(self, feedback: Dict[str, Any]) -> None:
         """Update XAI model based on feedback."""
@@ -413,6 +425,62 @@ class ExplainableAI(AIComponent):
             logger.error(f"Error updating XAI model: {str(e)}")
             raise
 
+    def training_feedback(
+        self,
+        inputs: List[Dict[str, Any]],
+        targets: np.ndarray
+    ) -> Dict[str, Any]:
+        """Build a feedback record that fits the analyzers to observed targets.
+
+        Each analyzer's summed feature contributions are read as the log-odds
+        of the target under log loss. Gradients point uphill, as ``update``
+        adds them to the weights.
+        """
+        game_states = [item.get("game_state", {}) for item in inputs]
+        predictions = [item.get("predictions", {}) for item in inputs]
+        cognitive_states = [item.get("cognitive_state", {}) for item in inputs]
+        features = {
+            "decision": self._extract_decision_features(game_states, predictions),
+            "outcome": self._extract_outcome_features(game_states, predictions),
+            "strategy": self._extract_strategy_features(game_states, cognitive_states)
+        }
+        feedback: Dict[str, Any] = {}
+        for feature_type, matrix in features.items():
+            scores = matrix @ self.feature_weights[feature_type]
+            residuals = 1 / (1 + np.exp(-scores)) - targets
+            feedback[f"{feature_type}_accuracy"] = 1.0
+            feedback[f"{feature_type}_gradient"] = (-(residuals @ matrix) / len(targets)).tolist()
+        return feedback
+
+    def stores(self) -> Dict[str, Any]:
+        """Return per-game stores for metrics."""
+        return {"explanation_history": self.explanation_history}
+
+    def validate_feedback(self, feedback: Dict[str, Any]) -> None:
+        """Check gradient lengths and that template updates can be formatted."""
+        check_shapes(feedback, {
+            f"{feature_type}_gradient": weights
+            for feature_type, weights in self.feature_weights.items()
+        })
+        for template_type, template in feedback.get("template_updates", {}).items():
+            check_template(template_type, template)
+
+    def get_parameters(self) -> Dict[str, np.ndarray]:
+        """Return the feature weights of each analyzer."""
+        return dict(self.feature_weights)
+
+    def adopt(self, staged: AIComponent) -> None:
+        """Take the staged weights and explanation templates."""
+        super().adopt(staged)
+        self.explanation_templates = staged.explanation_templates
+
+    def set_parameters(self, parameters: Dict[str, np.ndarray]) -> None:
+        """Replace feature weights and rebind the analyzers to them."""
+        for feature_type in self.feature_weights:
+            if feature_type in parameters:
+                self.feature_weights[feature_type] = parameters[feature_type]
+        self._initialize_feature_analyzers()
+
     def _update_feature_weights(self, feedback: Dict[str, Any]) -> None:
         """Update feature weights based on feedback."""
         learning_rate = 0.01
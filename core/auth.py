@@ -2,13 +2,14 @@ import os
 from datetime import datetime, timedelta
 from typing import Any
 from jose import jwt, JWTError
-from passlib.context import CryptContext
 from pydantic import BaseSettings
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from core.database import get_async_session
-from crud.user import get_user_by_id
+from crud.user import get_user_by_id, get_user_updated_at
+from core.hashing import hash_password, verify_password
+from core.principal_cache import UserSnapshot, principal_cache
 import uuid
 
 
@@ -23,19 +24,17 @@ class AuthSettings(BaseSettings):
 
 auth_settings = AuthSettings()
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a plain password against a hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+# Ids of the users allowed to call admin endpoints, comma separated
+ADMIN_USER_IDS = frozenset(
+    uuid.UUID(user_id.strip())
+    for user_id in os.getenv("ADMIN_USER_IDS", "").split(",") if user_id.strip())
 
 
-def get_password_hash(password: str) -> str:
-    """Hash a password for storage."""
-    return pwd_context.hash(password)
+async def get_password_hash(password: str) -> str:
+    """Hash a password for storage, off the event loop."""
+    return await hash_password(password)
 
 
 def create_access_token(data: dict[str, Any], expires_delta: timedelta | None = None) -> str:
@@ -63,7 +62,21 @@ async def get_current_user(
     token: str = Depends(oauth2_scheme),
     session: AsyncSession = Depends(get_async_session),
 ):
-    """FastAPI dependency to get the current user from JWT token."""
+    """FastAPI dependency to get the current user from JWT token.
+
+    Returns a ``UserSnapshot``. Tokens seen recently are served from the
+    principal cache without decoding the JWT or loading the user; every
+    few seconds an entry is checked against the user's ``updated_at``, so
+    changes made through other workers are picked up.
+    """
+    cached = principal_cache.get(token)
+    if cached is not None:
+        if not cached.revalidate:
+            return cached.user
+        if await get_user_updated_at(session, cached.user.id) == cached.user.updated_at:
+            principal_cache.checked(token)
+            return cached.user
+        principal_cache.invalidate_user(cached.user.id)
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -80,4 +93,21 @@ async def get_current_user(
     user = await get_user_by_id(session, user_uuid)
     if user is None:
         raise credentials_exception
-    return user
+    snapshot = UserSnapshot.from_user(user)
+    principal_cache.put(token, payload, snapshot)
+    return snapshot
+
+
+def is_admin(user: Any) -> bool:
+    """Whether a user is on the ``ADMIN_USER_IDS`` allow-list."""
+    return user.id in ADMIN_USER_IDS
+
+
+async def get_current_admin(current_user: UserSnapshot = Depends(get_current_user)) -> UserSnapshot:
+    """FastAPI dependency requiring the current user to be an admin."""
+    if not is_admin(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required",
+        )
+    return current_user
@@ -15,6 +15,17 @@ celery_app = Celery(
     include=["core.tasks"],  # Include task modules here
 )
 
+# Seconds between partition maintenance runs (core.partitions)
+PARTITION_MAINTENANCE_INTERVAL = float(os.getenv("PARTITION_MAINTENANCE_INTERVAL_SECONDS", "86400"))
+
+# Periodic tasks, run by `celery -A core.celery_app beat`
+celery_app.conf.beat_schedule = {
+    "maintain-partitions": {
+        "task": "core.tasks.maintain_partitions",
+        "schedule": PARTITION_MAINTENANCE_INTERVAL,
+    },
+}
+
 # Optional: Celery configuration dictionary
 # celery_app.conf.update(
 #     task_ignore_result=False,
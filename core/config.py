@@ -0,0 +1,17 @@
+from pydantic import BaseSettings
+from typing import List
+
+
+class Settings(BaseSettings):
+    """Settings for serving the application."""
+    HOST: str = "0.0.0.0"
+    PORT: int = 8000
+    # Auto-reload on code changes; for development only
+    DEBUG: bool = False
+    CORS_ORIGINS: List[str] = []
+
+    class Config:
+        env_file = ".env"
+
+
+settings = Settings()
@@ -1,13 +1,23 @@
 import os
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
 from pydantic import BaseSettings
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
+from core.database_engine import create_engine, echo_default
 
 
 class Settings(BaseSettings):
     """Settings for database configuration."""
     DATABASE_URL: str
+    ENVIRONMENT: str = "production"
+    # Defaults to on in development only
+    DATABASE_ECHO: Optional[bool] = None
+    DATABASE_POOL_SIZE: int = 10
+    DATABASE_MAX_OVERFLOW: int = 20
+    DATABASE_POOL_TIMEOUT: float = 30.0
+    DATABASE_POOL_RECYCLE: int = 1800
+    DATABASE_POOL_PRE_PING: bool = True
+    DATABASE_STATEMENT_CACHE_SIZE: int = 100
 
     class Config:
         env_file = ".env"
@@ -15,7 +25,16 @@ class Settings(BaseSettings):
 
 settings = Settings()
 
-engine = create_async_engine(settings.DATABASE_URL, echo=True, future=True)
+engine = create_engine(
+    settings.DATABASE_URL,
+    echo=echo_default(settings.ENVIRONMENT, settings.DATABASE_ECHO),
+    pool_size=settings.DATABASE_POOL_SIZE,
+    max_overflow=settings.DATABASE_MAX_OVERFLOW,
+    pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+    pool_recycle=settings.DATABASE_POOL_RECYCLE,
+    pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
+    statement_cache_size=settings.DATABASE_STATEMENT_CACHE_SIZE,
+)
 AsyncSessionLocal = async_sessionmaker(
     engine, expire_on_commit=False, class_=AsyncSession)
 
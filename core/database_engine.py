@@ -0,0 +1,122 @@
+"""Async database engine factory with pool configuration and metrics."""
+
+from typing import Any, Dict, Optional
+import time
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+from core.metrics import REGISTRY
+
+POOL_WAIT = REGISTRY.histogram(
+    "db_pool_wait_seconds",
+    "Time spent acquiring a database connection from the pool.",
+)
+POOL_CHECKOUTS = REGISTRY.counter(
+    "db_pool_checkouts",
+    "Database connections checked out of the pool.",
+)
+POOL_TIMEOUTS = REGISTRY.counter(
+    "db_pool_timeouts",
+    "Connection requests that timed out waiting for the pool.",
+)
+POOL_CONNECTS = REGISTRY.counter(
+    "db_pool_connects",
+    "New database connections opened by the pool.",
+)
+
+# Pools whose connection counts are reported, by engine name
+_pools: Dict[str, Pool] = {}
+
+
+def _pool_connections() -> Dict[tuple, float]:
+    samples = {}
+    for name, pool in list(_pools.items()):
+        if isinstance(pool, QueuePool):
+            samples[(name, "checked_out")] = float(pool.checkedout())
+            samples[(name, "idle")] = float(pool.checkedin())
+    return samples
+
+
+REGISTRY.callback(
+    "db_pool_connections",
+    "Database connections held by the pool, by state.",
+    _pool_connections,
+    ("engine", "state"),
+)
+
+
+class _InstrumentedPool:
+    """Times every connection request made to the pool."""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            POOL_TIMEOUTS.inc()
+            raise
+        finally:
+            POOL_WAIT.observe(time.perf_counter() - start)
+
+
+class InstrumentedQueuePool(_InstrumentedPool, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPool, AsyncAdaptedQueuePool):
+    pass
+
+
+def engine_options(
+    url: str,
+    echo: bool = False,
+    pool_size: int = 10,
+    max_overflow: int = 20,
+    pool_timeout: float = 30.0,
+    pool_recycle: int = 1800,
+    pool_pre_ping: bool = True,
+    statement_cache_size: int = 100
+) -> Dict[str, Any]:
+    """Return ``create_async_engine`` keyword arguments for a database URL.
+
+    Queue pool sizing only applies to server databases; SQLite keeps the
+    pool SQLAlchemy picks for it. ``statement_cache_size`` sets asyncpg's
+    prepared statement cache, 0 disabling it (needed behind PgBouncer in
+    transaction mode).
+    """
+    options: Dict[str, Any] = {"echo": echo, "pool_pre_ping": pool_pre_ping}
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite":
+        return options
+
+    options.update(
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+        pool_recycle=pool_recycle,
+    )
+    if parsed.get_driver_name() == "asyncpg":
+        options["connect_args"] = {"prepared_statement_cache_size": statement_cache_size}
+    return options
+
+
+def instrument_pool(pool: Pool, name: str = "default") -> None:
+    """Count checkouts and new connections, and report the pool's size."""
+    event.listen(pool, "checkout", lambda *args: POOL_CHECKOUTS.inc())
+    event.listen(pool, "connect", lambda *args: POOL_CONNECTS.inc())
+    _pools[name] = pool
+
+
+def create_engine(url: str, name: str = "default", **options: Any) -> AsyncEngine:
+    """Create an instrumented async engine; see ``engine_options``."""
+    engine = create_async_engine(url, **engine_options(url, **options))
+    instrument_pool(engine.sync_engine.pool, name)
+    return engine
+
+
+def echo_default(environment: str, echo: Optional[bool] = None) -> bool:
+    """SQL echo is on in development unless configured explicitly."""
+    return echo if echo is not None else environment == "development"
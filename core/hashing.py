@@ -0,0 +1,95 @@
+"""Password hashing on a dedicated thread pool, off the event loop."""
+
+from typing import Any, Callable, Optional
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import os
+import time
+from passlib.context import CryptContext
+from core.metrics import REGISTRY
+
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+
+# Hashes take 100-300 ms, so the default latency buckets are stretched
+HASH_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HASH_QUEUE_WAIT = REGISTRY.histogram(
+    "auth_password_hash_queue_seconds",
+    "Time password hash operations waited for a hashing thread.",
+    ("operation",),
+    HASH_BUCKETS,
+)
+HASH_DURATION = REGISTRY.histogram(
+    "auth_password_hash_seconds",
+    "Time spent computing password hashes.",
+    ("operation",),
+    HASH_BUCKETS,
+)
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+class PasswordHasher:
+    """Runs bcrypt hashing and verification on a bounded thread pool.
+
+    bcrypt releases the GIL while it works, so at most ``max_workers``
+    hashes run in parallel and the event loop stays free to serve other
+    requests. Callers beyond that queue for a thread; ``pending`` counts
+    submitted operations that have not finished.
+    """
+
+    def __init__(self, context: CryptContext = pwd_context, max_workers: int = PASSWORD_HASH_WORKERS):
+        self.context = context
+        self.max_workers = max_workers
+        self.pending = 0
+        self.pool: Optional[ThreadPoolExecutor] = None
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", self.context.hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run("verify", self.context.verify, plain_password, hashed_password)
+
+    async def _run(self, operation: str, function: Callable[..., Any], *args: Any) -> Any:
+        if self.pool is None:
+            self.pool = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="password-hash")
+        submitted = time.perf_counter()
+
+        def call() -> Any:
+            started = time.perf_counter()
+            HASH_QUEUE_WAIT.observe(started - submitted, operation)
+            try:
+                return function(*args)
+            finally:
+                HASH_DURATION.observe(time.perf_counter() - started, operation)
+
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.pool, call)
+        finally:
+            self.pending -= 1
+
+    def shutdown(self) -> None:
+        if self.pool is not None:
+            self.pool.shutdown(wait=True)
+            self.pool = None
+
+
+password_hasher = PasswordHasher()
+
+REGISTRY.callback(
+    "auth_password_hash_pending",
+    "Password hash operations queued or running.",
+    lambda: {(): float(password_hasher.pending)},
+)
+
+
+async def hash_password(password: str) -> str:
+    """Hash a password for storage."""
+    return await password_hasher.hash(password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a plain password against a hash."""
+    return await password_hasher.verify(plain_password, hashed_password)
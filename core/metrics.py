@@ -0,0 +1,235 @@
+"""Low-overhead metrics exposed in the Prometheus text format.
+
+Shared by the AI engine, the database engine and password hashing; the
+process-wide ``REGISTRY`` is served by the /metrics endpoint.
+"""
+
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple, Union
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+import math
+import threading
+
+# Latency buckets in seconds, from sub-millisecond scoring to slow batches
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+# Batch size buckets
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+Labels = Tuple[str, ...]
+Sample = Tuple[str, Dict[str, str], float]
+
+
+class _Shards:
+    """Per-thread storage written without locks and summed when read.
+
+    A lock is only taken the first time a thread writes, to register its
+    shard; observations afterwards touch nothing shared with other threads.
+    """
+
+    def __init__(self, factory: Callable[[], dict]):
+        self._factory = factory
+        self._local = threading.local()
+        self._shards: List[dict] = []
+        self._lock = threading.Lock()
+
+    def local(self) -> dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._factory()
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+        return shard
+
+    def __iter__(self) -> Iterator[dict]:
+        with self._lock:
+            return iter(list(self._shards))
+
+
+class Metric(ABC):
+    """Base class of registry entries."""
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    @abstractmethod
+    def samples(self) -> Iterator[Sample]:
+        """Yield the current value of every series of the metric."""
+        pass
+
+    def _labels(self, values: Labels) -> Dict[str, str]:
+        return dict(zip(self.labelnames, values))
+
+
+class Counter(Metric):
+    """A monotonically increasing value per label set."""
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._shards = _Shards(dict)
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        shard = self._shards.local()
+        shard[labels] = shard.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return sum(shard.get(labels, 0.0) for shard in self._shards)
+
+    def samples(self) -> Iterator[Sample]:
+        totals: Dict[Labels, float] = {}
+        for shard in self._shards:
+            for labels, value in list(shard.items()):
+                totals[labels] = totals.get(labels, 0.0) + value
+        for labels, value in sorted(totals.items()):
+            yield self.name + "_total", self._labels(labels), value
+
+
+class Histogram(Metric):
+    """Counts observations into cumulative buckets per label set."""
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._shards = _Shards(dict)
+
+    def observe(self, value: float, *labels: str) -> None:
+        shard = self._shards.local()
+        state = shard.get(labels)
+        if state is None:
+            # Bucket counts, with +Inf last, followed by the sum
+            state = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        state[bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+
+    def count(self, *labels: str) -> int:
+        return sum(sum(shard[labels][:-1]) for shard in self._shards if labels in shard)
+
+    def samples(self) -> Iterator[Sample]:
+        totals: Dict[Labels, List[float]] = {}
+        for shard in self._shards:
+            for labels, state in list(shard.items()):
+                total = totals.setdefault(labels, [0] * len(state))
+                for index, value in enumerate(list(state)):
+                    total[index] += value
+        for labels, state in sorted(totals.items()):
+            label_dict = self._labels(labels)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), state[:-1]):
+                cumulative += count
+                yield self.name + "_bucket", {**label_dict, "le": _format(bound)}, cumulative
+            yield self.name + "_sum", label_dict, state[-1]
+            yield self.name + "_count", label_dict, cumulative
+
+
+class CallbackMetric(Metric):
+    """A gauge or counter whose values are read from a callback at scrape time."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], Dict[Labels, float]],
+        labelnames: Sequence[str] = (),
+        type: str = "gauge"
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+        self.type = type
+
+    def samples(self) -> Iterator[Sample]:
+        name = self.name + "_total" if self.type == "counter" else self.name
+        for labels, value in sorted(self.callback().items()):
+            yield name, self._labels(labels), value
+
+
+class MetricsRegistry:
+    """A named collection of metrics rendered together."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def unregister(self, name: str) -> None:
+        with self._lock:
+            self._metrics.pop(name, None)
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def callback(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], Dict[Labels, float]],
+        labelnames: Sequence[str] = (),
+        type: str = "gauge"
+    ) -> CallbackMetric:
+        return self.register(CallbackMetric(name, documentation, callback, labelnames, type))
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {_escape_help(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _format(value: Union[int, float]) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items())
+    return "{" + pairs + "}"
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape(text: str) -> str:
+    return _escape_help(text).replace('"', '\\"')
+
+
+# Process-wide registry served by the /metrics endpoint
+REGISTRY = MetricsRegistry()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
@@ -0,0 +1,206 @@
+"""Monthly range partitions for time-series tables: creation and retention."""
+
+from datetime import date, datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+import logging
+import os
+import re
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+# Partitions created ahead of the current month, so inserts never miss one
+PARTITION_MONTHS_AHEAD = int(os.getenv("PARTITION_MONTHS_AHEAD", "3"))
+# Whole months of data kept before the current one; 0 keeps everything
+LLM_CALL_LOG_RETENTION_MONTHS = int(os.getenv("LLM_CALL_LOG_RETENTION_MONTHS", "6"))
+GAME_INSTANCE_RETENTION_MONTHS = int(os.getenv("GAME_INSTANCE_RETENTION_MONTHS", "0"))
+# "archive" moves expired partitions into PARTITION_ARCHIVE_SCHEMA, "drop" deletes them
+PARTITION_RETENTION_ACTION = os.getenv("PARTITION_RETENTION_ACTION", "archive")
+PARTITION_ARCHIVE_SCHEMA = os.getenv("PARTITION_ARCHIVE_SCHEMA", "archive")
+# Give up rather than queue every query on the table behind a DDL lock
+PARTITION_LOCK_TIMEOUT_MS = int(os.getenv("PARTITION_LOCK_TIMEOUT_MS", "5000"))
+
+RETENTION_ACTIONS = ("archive", "drop")
+
+
+class PartitionedTable(NamedTuple):
+    """A table range-partitioned by month on ``column``."""
+    name: str
+    column: str
+    retention_months: int
+
+
+LLM_CALL_LOGS = PartitionedTable("llm_call_logs", "created_at", LLM_CALL_LOG_RETENTION_MONTHS)
+GAME_INSTANCES = PartitionedTable("game_instances", "start_time", GAME_INSTANCE_RETENTION_MONTHS)
+
+PARTITIONED_TABLES = (LLM_CALL_LOGS, GAME_INSTANCES)
+
+
+def month_start(value: date) -> date:
+    """Return the first day of the month ``value`` falls in."""
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, count: int) -> date:
+    """Return the first day of the month ``count`` months after ``month``."""
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    """Name of the partition holding ``table`` rows for ``month``."""
+    return f"{table}_y{month.year:04d}m{month.month:02d}"
+
+
+def partition_month(table: str, name: str) -> Optional[date]:
+    """Return the month a partition of ``table`` holds, or ``None`` if it is not one."""
+    match = re.fullmatch(re.escape(table) + r"_y(\d{4})m(\d{2})", name)
+    if match is None:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def create_partition_statement(table: PartitionedTable, month: date) -> str:
+    """``CREATE TABLE`` statement for the partition of ``table`` for ``month``."""
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table.name, month)} "
+        f"PARTITION OF {table.name} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    )
+
+
+async def list_partitions(session: AsyncSession, table: PartitionedTable) -> List[str]:
+    """Names of the partitions currently attached to ``table``."""
+    result = await session.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = CAST(:table AS regclass) "
+            "ORDER BY child.relname"
+        ),
+        {"table": table.name},
+    )
+    return list(result.scalars().all())
+
+
+async def ensure_partitions(
+    session: AsyncSession,
+    table: PartitionedTable,
+    today: date,
+    months_ahead: int = PARTITION_MONTHS_AHEAD,
+    existing: Sequence[str] = ()
+) -> List[str]:
+    """Create the partitions from the current month to ``months_ahead`` later.
+
+    Returns the names of the partitions created.
+    """
+    created = []
+    current = month_start(today)
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        name = partition_name(table.name, month)
+        if name not in existing:
+            await session.execute(text(create_partition_statement(table, month)))
+            created.append(name)
+    return created
+
+
+async def ensure_partitions_for(
+    session: AsyncSession,
+    table: PartitionedTable,
+    values: Iterable[date]
+) -> List[str]:
+    """Create the missing partitions for the months ``values`` fall in.
+
+    For writes that may fall outside the months ``ensure_partitions``
+    keeps ready, such as bulk imports of old games. Runs in the caller's
+    transaction and only issues DDL for months without a partition.
+    Returns the names of the partitions created.
+    """
+    months = sorted({month_start(value) for value in values})
+    existing = set(await list_partitions(session, table))
+    created = []
+    for month in months:
+        name = partition_name(table.name, month)
+        if name not in existing:
+            await session.execute(text(create_partition_statement(table, month)))
+            created.append(name)
+    return created
+
+
+async def expire_partitions(
+    session: AsyncSession,
+    table: PartitionedTable,
+    today: date,
+    action: str = PARTITION_RETENTION_ACTION,
+    archive_schema: str = PARTITION_ARCHIVE_SCHEMA,
+    existing: Sequence[str] = ()
+) -> List[str]:
+    """Detach the partitions older than the table's retention, then drop or archive them.
+
+    Partitions whose whole month ended more than ``retention_months``
+    months before the current one are detached from the table. They are
+    dropped, or moved into ``archive_schema`` where they stay queryable
+    but leave the table's indexes and vacuum work. Returns their names.
+    """
+    if action not in RETENTION_ACTIONS:
+        raise ValueError(f"Unknown partition retention action: {action}")
+    if table.retention_months <= 0:
+        return []
+
+    cutoff = add_months(month_start(today), -table.retention_months)
+    expired = [name for name in existing
+               if (month := partition_month(table.name, name)) is not None and month < cutoff]
+    if expired and action == "archive":
+        await session.execute(text(f"CREATE SCHEMA IF NOT EXISTS {archive_schema}"))
+    for name in expired:
+        await session.execute(text(f"ALTER TABLE {table.name} DETACH PARTITION {name}"))
+        if action == "drop":
+            await session.execute(text(f"DROP TABLE {name}"))
+        else:
+            await session.execute(text(f"ALTER TABLE {name} SET SCHEMA {archive_schema}"))
+    return expired
+
+
+async def maintain_partitions(
+    session: AsyncSession,
+    today: Optional[date] = None,
+    tables: Sequence[PartitionedTable] = PARTITIONED_TABLES,
+    months_ahead: int = PARTITION_MONTHS_AHEAD,
+    action: str = PARTITION_RETENTION_ACTION
+) -> Dict[str, Dict[str, List[str]]]:
+    """Create upcoming partitions and expire old ones for every partitioned table.
+
+    Runs in one transaction with a lock timeout, so a busy table makes the
+    run fail (and be retried on schedule) instead of stalling its queries.
+    Returns the created and expired partitions by table.
+    """
+    today = today or datetime.utcnow().date()
+    summary = {}
+    try:
+        await session.execute(text(f"SET LOCAL lock_timeout = {PARTITION_LOCK_TIMEOUT_MS}"))
+        for table in tables:
+            existing = await list_partitions(session, table)
+            summary[table.name] = {
+                "created": await ensure_partitions(session, table, today, months_ahead, existing),
+                "expired": await expire_partitions(session, table, today, action, existing=existing),
+            }
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+    return summary
+
+
+async def run_maintenance() -> Dict[str, Dict[str, List[str]]]:
+    """Maintain partitions in a session of their own; see ``maintain_partitions``."""
+    from core.database import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as session:
+        summary = await maintain_partitions(session)
+    for table, changes in summary.items():
+        if changes["created"] or changes["expired"]:
+            logger.info(f"Partitions of {table}: created {changes['created']}, "
+                        f"expired {changes['expired']} ({PARTITION_RETENTION_ACTION})")
+    return summary
@@ -0,0 +1,144 @@
+"""Bounded cache of authenticated principals keyed by access token."""
+
+from typing import Any, Callable, Dict, NamedTuple, Optional, Set, Tuple
+from collections import OrderedDict
+from datetime import datetime
+import hashlib
+import os
+import threading
+import time
+import uuid
+
+DEFAULT_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "10000"))
+DEFAULT_TTL = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "300"))
+# Seconds an entry is trusted before the user row's updated_at is checked
+# again. invalidate_user only reaches the process it runs in, so this is
+# how long other workers may keep serving a changed or deleted user.
+DEFAULT_REVALIDATE_AFTER = float(os.getenv("AUTH_CACHE_REVALIDATE_SECONDS", "5"))
+
+
+class UserSnapshot(NamedTuple):
+    """The user fields request handlers read, detached from any session."""
+    id: uuid.UUID
+    username: str
+    email: str
+    created_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def from_user(cls, user: Any) -> "UserSnapshot":
+        return cls(user.id, user.username, user.email, user.created_at, user.updated_at)
+
+
+class CachedPrincipal(NamedTuple):
+    """A live cache entry."""
+    claims: Dict[str, Any]
+    user: UserSnapshot
+    # The user row must be checked for changes before the entry is trusted
+    revalidate: bool
+
+
+class PrincipalCache:
+    """LRU cache of decoded token claims and the user they authenticate.
+
+    Entries are keyed by a SHA-256 digest of the token, so raw tokens are
+    never held in memory. An entry lives for at most ``ttl`` seconds and
+    never past the token's ``exp`` claim. ``invalidate_user`` drops every
+    entry of a user, for use whenever the user row changes.
+
+    Other processes do not see that invalidation, so entries older than
+    ``revalidate_after`` seconds come back flagged ``revalidate``: the
+    caller compares the user's ``updated_at`` with the database, then
+    calls ``checked`` or ``invalidate_user``.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: float = DEFAULT_TTL,
+        revalidate_after: float = DEFAULT_REVALIDATE_AFTER,
+        clock: Callable[[], float] = time.time
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.revalidate_after = revalidate_after
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        # (expires_at, revalidate_at, claims, user) by token digest
+        self._entries: "OrderedDict[str, Tuple[float, float, Dict[str, Any], UserSnapshot]]" = OrderedDict()
+        self._by_user: Dict[uuid.UUID, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[CachedPrincipal]:
+        """Return the cached claims and user for a token, if still live."""
+        key = self.key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, revalidate_at, claims, user = entry
+            now = self.clock()
+            if now >= expires_at:
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return CachedPrincipal(claims, user, now >= revalidate_at)
+
+    def checked(self, token: str) -> None:
+        """Trust a token's entry for another ``revalidate_after`` seconds."""
+        key = self.key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, _, claims, user = entry
+                self._entries[key] = (expires_at, self.clock() + self.revalidate_after, claims, user)
+
+    def put(self, token: str, claims: Dict[str, Any], user: UserSnapshot) -> None:
+        """Cache a token's claims and user until the TTL or ``exp``, whichever is first."""
+        now = self.clock()
+        expires_at = now + self.ttl
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, float(exp))
+        key = self.key(token)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires_at, now + self.revalidate_after, claims, user)
+            self._by_user.setdefault(user.id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: uuid.UUID) -> None:
+        """Drop every entry authenticating ``user_id`` in this process."""
+        with self._lock:
+            for key in list(self._by_user.get(user_id, ())):
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: str) -> None:
+        _, _, _, user = self._entries.pop(key)
+        keys = self._by_user.get(user.id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[user.id]
+
+
+# Process-wide cache used by ``core.auth.get_current_user``
+principal_cache = PrincipalCache()
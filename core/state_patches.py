@@ -0,0 +1,175 @@
+"""Game state patch queue coalescing merge patches per instance."""
+
+from typing import Awaitable, Callable, Dict, List, Optional
+import asyncio
+import logging
+import os
+from core.metrics import REGISTRY
+from crud.game_instance import OwnedInstanceKey, compose_merge_patches, patch_game_states
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_DELAY = float(os.getenv("GAME_STATE_PATCH_MAX_DELAY_SECONDS", "0.05"))
+DEFAULT_MAX_PENDING = int(os.getenv("GAME_STATE_PATCH_MAX_PENDING", "10000"))
+# Failed writes of an instance's patches retried before they are dropped
+DEFAULT_MAX_RETRIES = int(os.getenv("GAME_STATE_PATCH_MAX_RETRIES", "3"))
+
+# Writes patches and returns the keys of instances that matched no row
+PatchWriter = Callable[[Dict[OwnedInstanceKey, List[dict]]], Awaitable[List[OwnedInstanceKey]]]
+
+UNMATCHED_PATCHES = REGISTRY.counter(
+    "game_state_patches_unmatched",
+    "Accepted game state patches whose instance does not exist or belongs to another user.")
+
+
+async def write_patches(patches: Dict[OwnedInstanceKey, List[dict]]) -> List[OwnedInstanceKey]:
+    """Apply patches in a session of their own; see ``patch_game_states``."""
+    from core.database import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as session:
+        return await patch_game_states(session, patches)
+
+
+def append_patch(pending: List[dict], patch: dict) -> None:
+    """Compose ``patch`` into the last of an instance's pending patches, or queue it after."""
+    composed = compose_merge_patches(pending[-1], patch)
+    if composed is None:
+        pending.append(patch)
+    else:
+        pending[-1] = composed
+
+
+class GameStatePatchQueue:
+    """Collects game state merge patches and writes them in short windows.
+
+    ``submit`` only records the patch, so request handlers return
+    immediately. Patches for an instance that already has one pending are
+    composed into it, so a burst of moves becomes a single UPDATE. A
+    background task waits for the first patch, lets more arrive for
+    ``max_delay`` seconds, then writes everything pending in one
+    transaction. Patches for instances that do not exist are counted in
+    ``unmatched`` and logged, since their clients were already answered.
+    When a write fails, its patches go back in front of the ones that
+    arrived since and are written with the next window; an instance's
+    patches are dropped and counted in ``failed`` after ``max_retries``
+    failed writes.
+    """
+
+    def __init__(
+        self,
+        write: PatchWriter = write_patches,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        max_retries: int = DEFAULT_MAX_RETRIES
+    ):
+        self.write = write
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+        self.max_retries = max_retries
+        self.patches: Dict[OwnedInstanceKey, List[dict]] = {}
+        # Failed writes so far of the patches pending for each instance
+        self.attempts: Dict[OwnedInstanceKey, int] = {}
+        self.submitted = 0
+        self.applied = 0
+        self.unmatched = 0
+        self.writes = 0
+        self.retried = 0
+        self.failed = 0
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._inflight: Optional[asyncio.Future] = None
+
+    def submit(self, key: OwnedInstanceKey, patch: dict) -> None:
+        """Record a merge patch for the game state of the instance with ``key``.
+
+        Raises ``asyncio.QueueFull`` when ``max_pending`` instances are
+        already waiting to be written.
+        """
+        pending = self.patches.get(key)
+        if pending is None:
+            if len(self.patches) >= self.max_pending:
+                raise asyncio.QueueFull
+            self.patches[key] = [patch]
+        else:
+            append_patch(pending, patch)
+        self.submitted += 1
+        self._wakeup.set()
+
+    @property
+    def pending(self) -> int:
+        return len(self.patches)
+
+    def start(self) -> None:
+        """Start writing submitted patches in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task after writing everything pending."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._inflight is not None:
+            # A write that was running when the task was cancelled
+            await self._inflight
+            self._inflight = None
+        while self.patches:
+            await self._write(self._take())
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            await asyncio.sleep(self.max_delay)
+            # Shielded so that stopping never abandons a write halfway
+            self._inflight = asyncio.ensure_future(self._write(self._take()))
+            await asyncio.shield(self._inflight)
+            self._inflight = None
+
+    def _take(self) -> Dict[OwnedInstanceKey, List[dict]]:
+        """Swap out everything pending; later patches start a new window."""
+        patches, self.patches = self.patches, {}
+        self._wakeup.clear()
+        return patches
+
+    async def _write(self, patches: Dict[OwnedInstanceKey, List[dict]]) -> None:
+        count = sum(len(instance_patches) for instance_patches in patches.values())
+        try:
+            unmatched = await self.write(patches)
+            lost = sum(len(patches[key]) for key in unmatched)
+            self.applied += count - lost
+            if lost:
+                self.unmatched += lost
+                UNMATCHED_PATCHES.inc(amount=lost)
+                logger.warning(f"Dropped {lost} game state patches for unknown instances: "
+                               f"{', '.join(str(instance_id) for instance_id, _, _ in unmatched)}")
+            for key in patches:
+                self.attempts.pop(key, None)
+        except Exception as e:
+            logger.error(f"Error writing {count} game state patches: {str(e)}")
+            self._requeue(patches)
+        finally:
+            self.writes += 1
+
+    def _requeue(self, patches: Dict[OwnedInstanceKey, List[dict]]) -> None:
+        """Put the patches of a failed write back in front of the pending ones."""
+        for key, instance_patches in patches.items():
+            attempts = self.attempts.get(key, 0) + 1
+            if attempts > self.max_retries:
+                self.attempts.pop(key, None)
+                self.failed += len(instance_patches)
+                continue
+            self.attempts[key] = attempts
+            self.retried += len(instance_patches)
+            merged = list(instance_patches)
+            for patch in self.patches.get(key, []):
+                append_patch(merged, patch)
+            self.patches[key] = merged
+        if self.patches:
+            self._wakeup.set()
+
+
+state_patch_queue = GameStatePatchQueue()
@@ -1,4 +1,6 @@
+import asyncio
 import logging
+from datetime import datetime
 from celery import shared_task
 
 # Configure logging
@@ -44,3 +46,48 @@ def generate_llm_prompt(game_context):
     except Exception as e:
         logger.error(f"Error generating LLM prompt: {str(e)}")
         raise
+
+@shared_task
+def replay_training(since=None, until=None, epochs=1):
+    """
+    Train the AI engine offline by replaying stored game instances.
+    The resulting weights are saved as a new checkpoint that workers
+    load on startup.
+
+    Args:
+        since (str): Optional ISO timestamp; only games started at or after it.
+        until (str): Optional ISO timestamp; only games started before it.
+        epochs (int): Number of passes over the selected games.
+    """
+    from core.ai_engine.replay import run_replay
+
+    try:
+        logger.info("Starting AI engine replay training")
+        summary = asyncio.run(run_replay(
+            since=datetime.fromisoformat(since) if since else None,
+            until=datetime.fromisoformat(until) if until else None,
+            epochs=epochs
+        ))
+        logger.info(f"Replay training finished: {summary}")
+        return summary
+    except Exception as e:
+        logger.error(f"Error in replay training: {str(e)}")
+        raise
+
+@shared_task
+def maintain_partitions():
+    """
+    Create the coming months' partitions of the time-partitioned tables
+    and detach, then drop or archive, partitions past their retention.
+    Scheduled daily by Celery beat.
+    """
+    from core.partitions import run_maintenance
+
+    try:
+        logger.info("Starting partition maintenance")
+        summary = asyncio.run(run_maintenance())
+        logger.info(f"Partition maintenance finished: {summary}")
+        return summary
+    except Exception as e:
+        logger.error(f"Error in partition maintenance: {str(e)}")
+        raise
@@ -1,6 +1,9 @@
 import uuid
+from datetime import datetime
+from typing import AsyncIterator, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from crud.pagination import DEFAULT_PAGE_SIZE, Page, keyset_page, keyset_stream
 from models.ai_model import AIModel
 from schemas.ai_model import AIModelCreate
 
@@ -26,7 +29,47 @@ async def create(session: AsyncSession, data: AIModelCreate) -> AIModel:
     return model
 
 
-async def list_all(session: AsyncSession) -> list[AIModel]:
-    """List all AI models."""
-    result = await session.execute(select(AIModel))
-    return result.scalars().all()
+# created_at holds ISO timestamps, which sort chronologically as text
+LIST_KEY = (AIModel.created_at, AIModel.id)
+
+
+async def list_all(
+    session: AsyncSession,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None
+) -> Page:
+    """List a page of AI models, oldest first."""
+    return await keyset_page(session, select(AIModel), LIST_KEY, limit, cursor)
+
+
+def stream_all(session: AsyncSession, cursor: Optional[str] = None) -> AsyncIterator[AIModel]:
+    """Stream all AI models, oldest first."""
+    return keyset_stream(session, select(AIModel), LIST_KEY, cursor)
+
+
+async def get_by_name(session: AsyncSession, name: str) -> AIModel | None:
+    """Get an AI model by its unique name."""
+    result = await session.execute(select(AIModel).where(AIModel.name == name))
+    return result.scalars().first()
+
+
+async def record_checkpoint(
+    session: AsyncSession,
+    name: str,
+    file_path: str,
+    config: dict,
+    metadata: dict | None = None
+) -> AIModel:
+    """Point an AI model at a new weights checkpoint, creating the model if needed."""
+    now = datetime.utcnow().isoformat()
+    model = await get_by_name(session, name)
+    if model is None:
+        model = AIModel(name=name, created_at=now)
+        session.add(model)
+    model.config = config
+    model.metadata = metadata
+    model.file_path = file_path
+    model.updated_at = now
+    await session.commit()
+    await session.refresh(model)
+    return model
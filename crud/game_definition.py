@@ -1,8 +1,10 @@
 import uuid
+from typing import AsyncIterator, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from crud.pagination import DEFAULT_PAGE_SIZE, Page, keyset_page, keyset_stream
 from models.game_definition import GameDefinition
-from schemas.game_definition import GameDefinitionCreate
+from schemas.game_definition import GameDefinitionCreate, GameDefinitionUpdate
 
 
 async def get_by_id(session: AsyncSession, id: uuid.UUID) -> GameDefinition | None:
@@ -31,7 +33,34 @@ async def create(session: AsyncSession, data: GameDefinitionCreate) -> GameDefin
     return game_def
 
 
-async def list_all(session: AsyncSession) -> list[GameDefinition]:
-    """List all game definitions."""
-    result = await session.execute(select(GameDefinition))
-    return result.scalars().all()
+async def update(session: AsyncSession, game_def: GameDefinition, data: GameDefinitionUpdate) -> GameDefinition:
+    """Update the fields of a game definition that are set in ``data``."""
+    for field, value in data.dict(exclude_none=True).items():
+        setattr(game_def, field, value)
+    await session.commit()
+    await session.refresh(game_def)
+    return game_def
+
+
+async def delete(session: AsyncSession, game_def: GameDefinition) -> None:
+    """Delete a game definition."""
+    await session.delete(game_def)
+    await session.commit()
+
+
+# Game definitions have no timestamp; they are listed by name
+LIST_KEY = (GameDefinition.name, GameDefinition.id)
+
+
+async def list_all(
+    session: AsyncSession,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None
+) -> Page:
+    """List a page of game definitions, ordered by name."""
+    return await keyset_page(session, select(GameDefinition), LIST_KEY, limit, cursor)
+
+
+def stream_all(session: AsyncSession, cursor: Optional[str] = None) -> AsyncIterator[GameDefinition]:
+    """Stream all game definitions, ordered by name."""
+    return keyset_stream(session, select(GameDefinition), LIST_KEY, cursor)
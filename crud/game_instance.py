@@ -1,13 +1,34 @@
+import os
 import uuid
+from datetime import datetime
+from typing import Any, AsyncIterator, List, Mapping, Optional, Sequence, Tuple
+from sqlalchemy import Text, case, func, literal, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from core.partitions import GAME_INSTANCES, ensure_partitions_for
+from crud.pagination import DEFAULT_PAGE_SIZE, Page, keyset_page, keyset_stream
 from models.game_instance import GameInstance
 from schemas.game_instance import GameInstanceCreate
 
+# Rows per INSERT statement; ten columns each keeps a statement well
+# under PostgreSQL's 32767 bind parameter limit
+BULK_CHUNK_SIZE = int(os.getenv("GAME_INSTANCE_BULK_CHUNK_SIZE", "1000"))
 
-async def get_by_id(session: AsyncSession, id: uuid.UUID) -> GameInstance | None:
-    """Get a game instance by id."""
-    result = await session.execute(select(GameInstance).where(GameInstance.id == id))
+# Columns an upsert overwrites on an existing instance
+UPSERT_COLUMNS = ("status", "game_state", "end_time", "score", "ai_model_id")
+
+# Primary key of an instance; the table is partitioned by start_time
+InstanceKey = Tuple[uuid.UUID, datetime]
+# An instance's primary key and the id of the user it must belong to
+OwnedInstanceKey = Tuple[uuid.UUID, datetime, uuid.UUID]
+
+
+async def get_by_id(session: AsyncSession, id: uuid.UUID, start_time: datetime) -> GameInstance | None:
+    """Get a game instance by its primary key."""
+    result = await session.execute(
+        select(GameInstance)
+        .where(GameInstance.id == id, GameInstance.start_time == start_time))
     return result.scalars().first()
 
 
@@ -25,7 +46,201 @@ async def create(session: AsyncSession, data: GameInstanceCreate) -> GameInstanc
     return instance
 
 
-async def list_by_user(session: AsyncSession, user_id: uuid.UUID) -> list[GameInstance]:
-    """List all game instances for a user."""
-    result = await session.execute(select(GameInstance).where(GameInstance.user_id == user_id))
-    return result.scalars().all()
+async def delete(session: AsyncSession, instance: GameInstance) -> None:
+    """Delete a game instance."""
+    await session.delete(instance)
+    await session.commit()
+
+
+# Keyset sort key: newest games first
+LIST_KEY = (GameInstance.start_time, GameInstance.id)
+
+
+async def list_by_user(
+    session: AsyncSession,
+    user_id: uuid.UUID,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None
+) -> Page:
+    """List a page of a user's game instances, newest first."""
+    query = select(GameInstance).where(GameInstance.user_id == user_id)
+    return await keyset_page(session, query, LIST_KEY, limit, cursor, descending=True)
+
+
+def stream_by_user(
+    session: AsyncSession,
+    user_id: uuid.UUID,
+    cursor: Optional[str] = None
+) -> AsyncIterator[GameInstance]:
+    """Stream all of a user's game instances, newest first."""
+    query = select(GameInstance).where(GameInstance.user_id == user_id)
+    return keyset_stream(session, query, LIST_KEY, cursor, descending=True)
+
+
+def bulk_row(data: GameInstanceCreate, now: datetime) -> dict[str, Any]:
+    """Return a complete column mapping for one instance of a bulk insert."""
+    return {
+        "id": data.id or uuid.uuid4(),
+        "game_definition_id": data.game_definition_id,
+        "user_id": data.user_id,
+        "status": data.status,
+        "game_state": data.game_state,
+        "start_time": data.start_time or now,
+        "end_time": data.end_time,
+        "score": data.score,
+        "ai_model_id": data.ai_model_id,
+    }
+
+
+def build_bulk_insert(dialect_name: str, rows: Sequence[dict[str, Any]], upsert: bool = False):
+    """Build one multi-row ``INSERT ... RETURNING id`` for the given dialect."""
+    insert = sqlite.insert if dialect_name == "sqlite" else postgresql.insert
+    statement = insert(GameInstance).values(list(rows))
+    if upsert:
+        statement = statement.on_conflict_do_update(
+            # The table is partitioned by start_time, so only (id, start_time) is unique
+            index_elements=[GameInstance.id, GameInstance.start_time],
+            set_={column: statement.excluded[column] for column in UPSERT_COLUMNS},
+        )
+    return statement.returning(GameInstance.id)
+
+
+async def bulk_create(
+    session: AsyncSession,
+    items: Sequence[GameInstanceCreate],
+    upsert: bool = False,
+    chunk_size: int = BULK_CHUNK_SIZE,
+) -> list[uuid.UUID]:
+    """Insert (or upsert) many game instances in a single transaction.
+
+    Rows are written with multi-row ``INSERT ... RETURNING`` statements of
+    ``chunk_size`` rows and committed once, so either every instance is
+    stored or none is. On PostgreSQL, partitions are created first for any
+    month the start times fall in that has none yet. Returns the ids of
+    the written rows in input order.
+    """
+    now = datetime.utcnow()
+    rows = [bulk_row(item, now) for item in items]
+    if upsert:
+        # A statement may touch each row once; the last write of a key wins
+        rows = list({(row["id"], row["start_time"]): row for row in rows}.values())
+    dialect_name = session.get_bind().dialect.name
+    ids: list[uuid.UUID] = []
+    try:
+        if dialect_name == "postgresql":
+            await ensure_partitions_for(session, GAME_INSTANCES, (row["start_time"] for row in rows))
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            result = await session.execute(build_bulk_insert(dialect_name, chunk, upsert))
+            # RETURNING order is not guaranteed; report ids in input order
+            written = set(result.scalars().all())
+            ids.extend(row["id"] for row in chunk if row["id"] in written)
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+    return ids
+
+
+def merge_patch(target: Any, patch: Any) -> Any:
+    """Apply an RFC 7386 JSON merge patch to a document, returning a new one."""
+    if not isinstance(patch, dict):
+        return patch
+    result = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = merge_patch(result.get(key), value)
+    return result
+
+
+def compose_merge_patches(first: dict, second: dict) -> Optional[dict]:
+    """Return one merge patch equivalent to applying ``first`` then ``second``.
+
+    Returns ``None`` when no single merge patch is equivalent: when
+    ``first`` replaces or removes a key and ``second`` then writes an
+    object into it, the object must replace whatever the document held,
+    which a merge patch cannot say.
+    """
+    composed = dict(first)
+    for key, value in second.items():
+        if isinstance(value, dict) and key in first:
+            previous = first[key]
+            if not isinstance(previous, dict):
+                return None
+            nested = compose_merge_patches(previous, value)
+            if nested is None:
+                return None
+            composed[key] = nested
+        else:
+            composed[key] = value
+    return composed
+
+
+def merge_patch_expression(column: Any, patch: Any, path: Sequence[str] = ()) -> Any:
+    """Build a PostgreSQL expression applying a merge patch to a JSONB column.
+
+    Only the keys the patch touches are named in the statement: removed
+    keys are dropped with ``-``, new values merged in with ``||``, and
+    nested objects rebuilt from the stored value at their path, so the
+    client never sends the whole document.
+    """
+    if not isinstance(patch, dict):
+        return literal(patch, postgresql.JSONB)
+
+    base = column[tuple(path)] if path else column
+    expression = case(
+        (func.jsonb_typeof(base) == "object", base),
+        else_=literal({}, postgresql.JSONB),
+    )
+    removed = [key for key, value in patch.items() if value is None]
+    if removed:
+        expression = expression.op("-", return_type=postgresql.JSONB)(
+            literal(removed, postgresql.ARRAY(Text)))
+    values = {key: value for key, value in patch.items()
+              if value is not None and not isinstance(value, dict)}
+    if values:
+        expression = expression.op("||", return_type=postgresql.JSONB)(
+            literal(values, postgresql.JSONB))
+    nested = [(key, value) for key, value in patch.items() if isinstance(value, dict)]
+    if nested:
+        arguments = []
+        for key, value in nested:
+            arguments += [literal(key), merge_patch_expression(column, value, (*path, key))]
+        expression = expression.op("||", return_type=postgresql.JSONB)(
+            func.jsonb_build_object(*arguments, type_=postgresql.JSONB))
+    return expression
+
+
+async def patch_game_states(
+    session: AsyncSession,
+    patches: Mapping[OwnedInstanceKey, Sequence[dict]]
+) -> List[OwnedInstanceKey]:
+    """Apply merge patches to game instances' state in one transaction.
+
+    ``patches`` maps instance keys (id, start time and owner) to the
+    merge patches to apply to each, in order. Returns the keys of the
+    instances that do not exist or belong to someone else, whose patches
+    matched no row.
+    """
+    unmatched = []
+    try:
+        for key, instance_patches in patches.items():
+            instance_id, start_time, user_id = key
+            for patch in instance_patches:
+                result = await session.execute(
+                    update(GameInstance)
+                    .where(GameInstance.id == instance_id,
+                           GameInstance.start_time == start_time,
+                           GameInstance.user_id == user_id)
+                    .values(game_state=merge_patch_expression(GameInstance.game_state, patch)))
+                if result.rowcount == 0:
+                    # Later patches for the instance would not match either
+                    unmatched.append(key)
+                    break
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+    return unmatched
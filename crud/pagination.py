@@ -0,0 +1,126 @@
+"""Keyset (cursor) pagination and server-side streaming for list queries."""
+
+import base64
+import json
+import os
+import uuid
+from datetime import datetime
+from typing import Any, AsyncIterator, NamedTuple, Optional, Sequence
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+DEFAULT_PAGE_SIZE = int(os.getenv("PAGE_SIZE", "100"))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "1000"))
+# Rows fetched per round trip when streaming through a server-side cursor
+STREAM_CHUNK_SIZE = int(os.getenv("STREAM_CHUNK_SIZE", "1000"))
+
+
+class Page(NamedTuple):
+    """One page of results and the cursor of the page after it, if any."""
+    items: list
+    next_cursor: Optional[str]
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort key of the last row of a page as an opaque cursor."""
+    def plain(value: Any) -> Any:
+        if isinstance(value, datetime):
+            return value.isoformat()
+        if isinstance(value, uuid.UUID):
+            return str(value)
+        return value
+
+    payload = json.dumps([plain(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence[InstrumentedAttribute]) -> list[Any]:
+    """Decode a cursor back into typed sort key values for ``columns``.
+
+    Raises ``ValueError`` for cursors that were not produced for them.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise ValueError("Invalid cursor")
+
+    decoded = []
+    for column, value in zip(columns, values):
+        python_type = column.type.python_type
+        try:
+            if python_type is datetime:
+                decoded.append(datetime.fromisoformat(value))
+            elif python_type is uuid.UUID:
+                decoded.append(uuid.UUID(value))
+            else:
+                decoded.append(python_type(value))
+        except (TypeError, ValueError):
+            raise ValueError("Invalid cursor")
+    return decoded
+
+
+def keyset_query(
+    query: Select,
+    columns: Sequence[InstrumentedAttribute],
+    cursor: Optional[str] = None,
+    descending: bool = False
+) -> Select:
+    """Order ``query`` by ``columns`` and start it after ``cursor``.
+
+    The columns must be unique together (end them with the primary key)
+    and backed by an index for pages to cost the same at any depth.
+    """
+    if cursor is not None:
+        key = tuple_(*columns)
+        values = tuple_(*decode_cursor(cursor, columns))
+        query = query.where(key < values if descending else key > values)
+    return query.order_by(*(column.desc() if descending else column for column in columns))
+
+
+async def keyset_page(
+    session: AsyncSession,
+    query: Select,
+    columns: Sequence[InstrumentedAttribute],
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    descending: bool = False
+) -> Page:
+    """Return up to ``limit`` rows after ``cursor`` and the next page's cursor."""
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    result = await session.execute(
+        keyset_query(query, columns, cursor, descending).limit(limit + 1))
+    items = list(result.scalars().all())
+    if len(items) <= limit:
+        return Page(items, None)
+    items = items[:limit]
+    last = items[-1]
+    return Page(items, encode_cursor([getattr(last, column.key) for column in columns]))
+
+
+def keyset_stream(
+    session: AsyncSession,
+    query: Select,
+    columns: Sequence[InstrumentedAttribute],
+    cursor: Optional[str] = None,
+    descending: bool = False,
+    chunk_size: int = STREAM_CHUNK_SIZE
+) -> AsyncIterator[Any]:
+    """Iterate over every row after ``cursor`` through a server-side cursor.
+
+    Only ``chunk_size`` rows are buffered at a time, so memory stays flat
+    however many rows match. The cursor is decoded immediately, so an
+    invalid one raises ``ValueError`` before any row is produced.
+    """
+    statement = keyset_query(query, columns, cursor, descending).execution_options(
+        yield_per=chunk_size)
+
+    async def rows() -> AsyncIterator[Any]:
+        result = await session.stream_scalars(statement)
+        async for row in result:
+            yield row
+
+    return rows()
@@ -1,13 +1,12 @@
 import uuid
+from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import NoResultFound
 from models.user import User
 from schemas.user import UserCreate, UserUpdate
-from passlib.context import CryptContext
-from core.auth import get_password_hash
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from core.hashing import hash_password
+from core.principal_cache import principal_cache
 
 
 async def get_user_by_email(session: AsyncSession, email: str) -> User | None:
@@ -22,9 +21,15 @@ async def get_user_by_id(session: AsyncSession, user_id: uuid.UUID) -> User | No
     return result.scalars().first()
 
 
+async def get_user_updated_at(session: AsyncSession, user_id: uuid.UUID) -> datetime | None:
+    """Get when a user was last changed, or ``None`` if the user does not exist."""
+    result = await session.execute(select(User.updated_at).where(User.id == user_id))
+    return result.scalars().first()
+
+
 async def create_user(session: AsyncSession, user_in: UserCreate) -> User:
     """Create a new user with hashed password."""
-    hashed_password = get_password_hash(user_in.password)
+    hashed_password = await hash_password(user_in.password)
     user = User(
         username=user_in.username,
         email=user_in.email,
@@ -37,13 +42,14 @@ async def create_user(session: AsyncSession, user_in: UserCreate) -> User:
 
 
 async def update_user(session: AsyncSession, user: User, user_in: UserUpdate) -> User:
-    """Update user fields."""
+    """Update user fields and drop the user's cached authentications."""
     if user_in.username is not None:
         user.username = user_in.username
     if user_in.email is not None:
         user.email = user_in.email
     if user_in.password is not None:
-        user.hashed_password = pwd_context.hash(user_in.password)
+        user.hashed_password = await hash_password(user_in.password)
     await session.commit()
     await session.refresh(user)
+    principal_cache.invalidate_user(user.id)
     return user
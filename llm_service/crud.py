@@ -1,6 +1,8 @@
 import uuid
+from typing import AsyncIterator, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from crud.pagination import DEFAULT_PAGE_SIZE, Page, keyset_page, keyset_stream
 from llm_service.models import LLMCallLog
 from llm_service.schemas import LLMCallRequest
 
@@ -21,7 +23,26 @@ async def create_log(session: AsyncSession, req: LLMCallRequest, response: str,
     return log
 
 
-async def list_logs_by_user(session: AsyncSession, user_id: uuid.UUID) -> list[LLMCallLog]:
-    """List all LLM call logs for a user."""
-    result = await session.execute(select(LLMCallLog).where(LLMCallLog.user_id == user_id))
-    return result.scalars().all()
+# Keyset sort key: newest calls first
+LIST_KEY = (LLMCallLog.created_at, LLMCallLog.id)
+
+
+async def list_logs_by_user(
+    session: AsyncSession,
+    user_id: uuid.UUID,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None
+) -> Page:
+    """List a page of a user's LLM call logs, newest first."""
+    query = select(LLMCallLog).where(LLMCallLog.user_id == user_id)
+    return await keyset_page(session, query, LIST_KEY, limit, cursor, descending=True)
+
+
+def stream_logs_by_user(
+    session: AsyncSession,
+    user_id: uuid.UUID,
+    cursor: Optional[str] = None
+) -> AsyncIterator[LLMCallLog]:
+    """Stream all of a user's LLM call logs, newest first."""
+    query = select(LLMCallLog).where(LLMCallLog.user_id == user_id)
+    return keyset_stream(session, query, LIST_KEY, cursor, descending=True)
@@ -1,14 +1,19 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import String, Text, DateTime, ForeignKey
+from sqlalchemy import String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import UUID
 from models.user import Base
 
 
 class LLMCallLog(Base):
-    """LLMCallLog model for logging LLM API calls and responses."""
+    """LLMCallLog model for logging LLM API calls and responses.
+
+    Range-partitioned by month on ``created_at`` (see ``core.partitions``),
+    which is why it is part of the primary key.
+    """
     __tablename__ = "llm_call_logs"
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -20,4 +25,9 @@ class LLMCallLog(Base):
     response: Mapped[str] = mapped_column(Text, nullable=True)
     status: Mapped[str] = mapped_column(String(20), nullable=False)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, nullable=False)
+        DateTime, primary_key=True, default=datetime.utcnow, nullable=False)
+
+
+# A user's calls, newest first (keyset pagination by created_at, id)
+Index("ix_llm_call_logs_user_id_created_at",
+      LLMCallLog.user_id, LLMCallLog.created_at.desc(), LLMCallLog.id.desc())
@@ -30,3 +30,9 @@ class LLMCallLogRead(BaseModel):
 
     class Config:
         orm_mode = True
+
+
+class LLMCallLogPage(BaseModel):
+    """A page of LLM call logs and the cursor of the next page."""
+    items: list[LLMCallLogRead]
+    next_cursor: str | None = None
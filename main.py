@@ -5,7 +5,8 @@ from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 import logging
 
-from api.routers import auth, users, games, ai_engine
+from api import auth, users, games
+from api.routers import ai_engine, metrics
 from core.config import settings
 
 # Configure logging
@@ -35,6 +36,7 @@ app.include_router(auth.router)
 app.include_router(users.router)
 app.include_router(games.router)
 app.include_router(ai_engine.router)
+app.include_router(metrics.router)
 
 
 @app.on_event("startup")
@@ -1,14 +1,22 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import String, Integer, DateTime, ForeignKey
+from sqlalchemy import String, Integer, DateTime, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from models.user import Base
 
+# Statuses of games still being played
+ACTIVE_STATUSES = ("pending", "in_progress")
+
 
 class GameInstance(Base):
-    """GameInstance model for storing game session data."""
+    """GameInstance model for storing game session data.
+
+    Range-partitioned by month on ``start_time`` (see ``core.partitions``),
+    which is why it is part of the primary key.
+    """
     __tablename__ = "game_instances"
+    __table_args__ = {"postgresql_partition_by": "RANGE (start_time)"}
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -21,8 +29,25 @@ class GameInstance(Base):
     game_state: Mapped[dict] = mapped_column(
         JSONB, nullable=False, default=dict)
     start_time: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, nullable=False)
+        DateTime, primary_key=True, default=datetime.utcnow, nullable=False)
     end_time: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     score: Mapped[int | None] = mapped_column(Integer, nullable=True)
     ai_model_id: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True), nullable=True)
+
+
+# A user's games, newest first (keyset pagination by start_time, id)
+Index("ix_game_instances_user_id_start_time",
+      GameInstance.user_id, GameInstance.start_time.desc(), GameInstance.id.desc())
+# A user's games in a given status
+Index("ix_game_instances_user_id_status_start_time",
+      GameInstance.user_id, GameInstance.status, GameInstance.start_time.desc())
+# Games still being played, a small fraction of the table
+Index("ix_game_instances_active_user_id",
+      GameInstance.user_id, GameInstance.start_time.desc(),
+      postgresql_where=GameInstance.status.in_(ACTIVE_STATUSES))
+# Time-range scans for replay training
+Index("ix_game_instances_start_time", GameInstance.start_time)
+# Containment filters (game_state @> '{...}') on any game state key
+Index("ix_game_instances_game_state", GameInstance.game_state,
+      postgresql_using="gin", postgresql_ops={"game_state": "jsonb_path_ops"})
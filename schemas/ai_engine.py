@@ -1,7 +1,7 @@
 """Pydantic schemas for AI Engine data models."""
 
 from typing import Dict, List, Any, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, root_validator
 from datetime import datetime
 
 
@@ -43,20 +43,54 @@ class PredictionResponse(BaseModel):
 
 
 class FeedbackRequest(BaseModel):
-    """Schema for feedback data."""
-    game_id: str
-    prediction_accuracy: Dict[str,
-                              float] = Field(..., description="Accuracy of predictions")
-    cognitive_accuracy: Dict[str,
-                             float] = Field(..., description="Accuracy of cognitive model")
-    uncertainty_accuracy: Dict[str, float] = Field(
-        ..., description="Accuracy of uncertainty estimates")
-    wisdom_relevance: Dict[str, float] = Field(
-        ..., description="Relevance of collective insights")
-    explanation_clarity: Dict[str,
-                              float] = Field(..., description="Clarity of explanations")
+    """Schema for a feedback record on the AI models.
+
+    Besides the fields below, any ``<group>_accuracy`` (a number) and
+    ``<group>_gradient`` (a list of numbers) are accepted for the weight
+    groups the components learn, e.g. ``outcome_accuracy`` and
+    ``outcome_gradient``. Gradient lengths are checked against the models
+    by ``AIEngine.validate_feedback``.
+    """
+    game_id: Optional[str] = None
+    actual_outcome: Optional[Dict[str, float]] = Field(
+        default=None, description="Observed outcome; its value trains the outcome model")
+    targets: Optional[Dict[str, float]] = Field(
+        default=None, description="Training targets by prediction model")
+    game_state: Optional[Dict[str, Any]] = None
     context: Optional[Dict[str, Any]] = Field(
         default=None, description="Additional context")
+    quantum_feedback: Optional[float] = Field(
+        default=None, ge=0.0, le=1.0, description="Weight of fresh quantum states")
+    correlation_feedback: Optional[List[List[float]]] = Field(
+        default=None, description="Update to the uncertainty entanglement matrix")
+    correlation_matrix_update: Optional[List[List[float]]] = Field(
+        default=None, description="Update to the collective correlation matrix")
+    anomaly_feedback: Optional[float] = None
+    template_updates: Optional[Dict[str, str]] = Field(
+        default=None, description="Replacement explanation templates by type")
+
+    class Config:
+        extra = "allow"
+
+    @root_validator(pre=True)
+    def check_weight_group_feedback(cls, values: Dict[str, Any]) -> Dict[str, Any]:
+        """Only allow extra fields that are numeric accuracies and gradients."""
+        for key, value in values.items():
+            if key in cls.__fields__:
+                continue
+            if key.endswith("_accuracy"):
+                if not _is_number(value):
+                    raise ValueError(f"{key} must be a number")
+            elif key.endswith("_gradient"):
+                if not isinstance(value, list) or not all(map(_is_number, value)):
+                    raise ValueError(f"{key} must be a list of numbers")
+            else:
+                raise ValueError(f"Unknown feedback field {key}")
+        return values
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
 
 
 class CognitiveProfile(BaseModel):
@@ -1,5 +1,6 @@
+import uuid
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 class GameDefinition(BaseModel):
     id: int = Field(..., description="Unique identifier for the game definition")
@@ -10,14 +11,16 @@ class GameDefinition(BaseModel):
     updated_at: str = Field(..., description="Timestamp of when the game was last updated")
 
 class GameDefinitionCreate(BaseModel):
-    name: str = Field(..., description="Name of the game")
-    description: Optional[str] = Field(None, description="Description of the game")
-    rules: str = Field(..., description="Rules of the game")
+    name: str = Field(..., max_length=100, description="Name of the game")
+    description: str = Field(..., description="Description of the game")
+    rules_config: Dict[str, Any] = Field(default_factory=dict, description="Rules of the game")
+    version: str = Field(..., max_length=20, description="Version of the rules")
 
 class GameDefinitionUpdate(BaseModel):
-    name: Optional[str] = Field(None, description="Name of the game")
+    name: Optional[str] = Field(None, max_length=100, description="Name of the game")
     description: Optional[str] = Field(None, description="Description of the game")
-    rules: Optional[str] = Field(None, description="Rules of the game")
+    rules_config: Optional[Dict[str, Any]] = Field(None, description="Rules of the game")
+    version: Optional[str] = Field(None, max_length=20, description="Version of the rules")
 
 class GameDefinitionResponse(BaseModel):
     id: int
@@ -29,3 +32,19 @@ class GameDefinitionResponse(BaseModel):
 
     class Config:
         orm_mode = True
+
+
+class GameDefinitionRead(BaseModel):
+    id: uuid.UUID
+    name: str
+    description: str
+    rules_config: Dict[str, Any]
+    version: str
+
+    class Config:
+        orm_mode = True
+
+
+class GameDefinitionPage(BaseModel):
+    items: List[GameDefinitionRead]
+    next_cursor: Optional[str] = Field(None, description="Pass as cursor to fetch the next page")
@@ -1,5 +1,10 @@
-from pydantic import BaseModel, Field
-from typing import Optional
+import uuid
+from datetime import datetime
+from pydantic import BaseModel, Field, root_validator
+from typing import Any, Dict, List, Optional
+
+# Largest batch accepted by the bulk ingestion endpoint
+MAX_BULK_INSTANCES = 10000
 
 class GameInstance(BaseModel):
     id: int = Field(..., description="Unique identifier for the game instance")
@@ -20,3 +25,54 @@ class GameInstance(BaseModel):
                 "updated_at": "2023-01-01T12:30:00Z"
             }
         }
+
+
+class GameInstanceCreate(BaseModel):
+    id: Optional[uuid.UUID] = Field(None, description="Client-assigned id; required to upsert, along with start_time")
+    game_definition_id: uuid.UUID = Field(..., description="Game definition this instance plays")
+    user_id: Optional[uuid.UUID] = Field(None, description="Player of this game instance")
+    status: str = Field("pending", max_length=20, description="Current status of the game instance")
+    game_state: Dict[str, Any] = Field(default_factory=dict, description="Game session state")
+    start_time: Optional[datetime] = Field(None, description="When the game started; defaults to now")
+    end_time: Optional[datetime] = Field(None, description="When the game ended")
+    score: Optional[int] = Field(None, description="Final score")
+    ai_model_id: Optional[uuid.UUID] = Field(None, description="AI model used in the game")
+
+
+class GameInstanceBulkCreate(BaseModel):
+    instances: List[GameInstanceCreate] = Field(..., min_items=1, max_items=MAX_BULK_INSTANCES)
+    upsert: bool = Field(False, description="Update instances whose id already exists instead of failing")
+
+    @root_validator(skip_on_failure=True)
+    def check_upsert_keys(cls, values):
+        """Upserts match rows on (id, start_time), so items with an id need both."""
+        if values.get("upsert"):
+            for index, instance in enumerate(values.get("instances", [])):
+                if instance.id is not None and instance.start_time is None:
+                    raise ValueError(f"instances[{index}]: start_time is required to upsert an id")
+        return values
+
+
+class GameInstanceBulkResult(BaseModel):
+    count: int = Field(..., description="Number of instances written")
+    ids: List[uuid.UUID] = Field(..., description="Ids of the written instances, in request order")
+
+
+class GameInstanceRead(BaseModel):
+    id: uuid.UUID
+    game_definition_id: uuid.UUID
+    user_id: Optional[uuid.UUID]
+    status: str
+    game_state: Dict[str, Any]
+    start_time: datetime
+    end_time: Optional[datetime]
+    score: Optional[int]
+    ai_model_id: Optional[uuid.UUID]
+
+    class Config:
+        orm_mode = True
+
+
+class GameInstancePage(BaseModel):
+    items: List[GameInstanceRead]
+    next_cursor: Optional[str] = Field(None, description="Pass as cursor to fetch the next page")
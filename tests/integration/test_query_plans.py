@@ -0,0 +1,136 @@
+"""Checks that hot-path queries are served by indexes, not sequential scans.
+
+Runs against the PostgreSQL database in ``TEST_DATABASE_URL`` (a
+synchronous URL, e.g. ``postgresql+psycopg2://...``), which it migrates
+to head and back to base. Skipped when the variable is not set.
+"""
+
+import json
+import os
+import uuid
+from datetime import datetime, timedelta
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import cast, create_engine, insert, literal, select, text
+from sqlalchemy.dialects.postgresql import JSONB
+
+from core.partitions import PARTITIONED_TABLES, create_partition_statement
+from crud.game_instance import LIST_KEY as GAME_INSTANCE_KEY
+from crud.pagination import keyset_query
+from llm_service.crud import LIST_KEY as LLM_CALL_LOG_KEY
+from llm_service.models import LLMCallLog
+from models.game_definition import GameDefinition
+from models.game_instance import ACTIVE_STATUSES, GameInstance
+from models.user import User
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(
+    not TEST_DATABASE_URL, reason="TEST_DATABASE_URL is not set")
+
+USER_ID = uuid.uuid4()
+
+
+@pytest.fixture(scope="module")
+def connection():
+    os.environ["DATABASE_URL"] = TEST_DATABASE_URL
+    config = Config("alembic.ini")
+    command.upgrade(config, "head")
+    engine = create_engine(TEST_DATABASE_URL)
+    try:
+        with engine.begin() as conn:
+            seed(conn)
+        with engine.connect() as conn:
+            conn.execute(text("ANALYZE"))
+            # Tiny tables would otherwise be scanned whatever the indexes
+            conn.execute(text("SET enable_seqscan = off"))
+            yield conn
+    finally:
+        engine.dispose()
+        command.downgrade(config, "base")
+
+
+def seed(conn) -> None:
+    now = datetime(2024, 6, 1)
+    for table in PARTITIONED_TABLES:
+        conn.execute(text(create_partition_statement(table, now.date())))
+    users = [{"id": USER_ID, "username": "plans", "email": "plans@example.com",
+              "hashed_password": "x", "created_at": now, "updated_at": now}]
+    users += [{"id": uuid.uuid4(), "username": f"user-{index}", "email": f"user-{index}@example.com",
+               "hashed_password": "x", "created_at": now, "updated_at": now}
+              for index in range(20)]
+    conn.execute(insert(User), users)
+    definition = uuid.uuid4()
+    conn.execute(insert(GameDefinition), [{
+        "id": definition, "name": "plans", "description": "", "rules_config": {}, "version": "1"}])
+    statuses = ("pending", "in_progress", "completed", "abandoned")
+    conn.execute(insert(GameInstance), [{
+        "id": uuid.uuid4(),
+        "game_definition_id": definition,
+        "user_id": users[index % len(users)]["id"],
+        "status": statuses[index % len(statuses)],
+        "game_state": {"state_type": statuses[index % len(statuses)], "round": index},
+        "start_time": now + timedelta(minutes=index),
+    } for index in range(2000)])
+    conn.execute(insert(LLMCallLog), [{
+        "id": uuid.uuid4(),
+        "user_id": users[index % len(users)]["id"],
+        "provider": "openai", "model": "m", "prompt": "p", "status": "ok",
+        "created_at": now + timedelta(minutes=index),
+    } for index in range(2000)])
+
+
+def sequential_scans(conn, statement) -> list:
+    sql = str(statement.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+    plan = conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    scans = []
+    def walk(node):
+        if node["Node Type"] == "Seq Scan":
+            scans.append(node["Relation Name"])
+        for child in node.get("Plans", ()):
+            walk(child)
+    walk(plan[0]["Plan"])
+    return scans
+
+
+def test_user_game_instances_page_uses_an_index(connection):
+    query = select(GameInstance).where(GameInstance.user_id == USER_ID)
+    statement = keyset_query(query, GAME_INSTANCE_KEY, descending=True).limit(101)
+
+    assert sequential_scans(connection, statement) == []
+
+
+def test_user_game_instances_by_status_use_an_index(connection):
+    statement = (select(GameInstance)
+                 .where(GameInstance.user_id == USER_ID, GameInstance.status == "completed")
+                 .order_by(GameInstance.start_time.desc()))
+
+    assert sequential_scans(connection, statement) == []
+
+
+def test_active_game_instances_use_an_index(connection):
+    statement = (select(GameInstance)
+                 .where(GameInstance.user_id == USER_ID,
+                        GameInstance.status.in_(ACTIVE_STATUSES))
+                 .order_by(GameInstance.start_time.desc()))
+
+    assert sequential_scans(connection, statement) == []
+
+
+def test_game_state_containment_uses_an_index(connection):
+    # Cast from text so the filter can be rendered inline for EXPLAIN
+    document = cast(literal(json.dumps({"state_type": "in_progress"})), JSONB)
+    statement = select(GameInstance).where(GameInstance.game_state.contains(document))
+
+    assert sequential_scans(connection, statement) == []
+
+
+def test_user_llm_call_logs_page_uses_an_index(connection):
+    query = select(LLMCallLog).where(LLMCallLog.user_id == USER_ID)
+    statement = keyset_query(query, LLM_CALL_LOG_KEY, descending=True).limit(101)
+
+    assert sequential_scans(connection, statement) == []
@@ -0,0 +1,114 @@
+import numpy as np
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql.elements import TextClause
+
+
+def build_inputs(count):
+    """Build synthetic component inputs with varying feature values."""
+    rng = np.random.default_rng(7)
+    inputs = []
+    for index in range(count):
+        values = rng.random(6)
+        inputs.append({
+            "game_id": f"game-{index}",
+            "player_id": f"player-{index}",
+            "game_state": {
+                "player_stats": index / count,
+                "complexity": float(values[0]),
+                "aggression_level": float(values[1]),
+                "performance_delta": float(values[2]),
+                "adaptation_speed": float(values[3]),
+                "player_state_value": float(values[4]),
+                "current_state_value": float(values[5]),
+            },
+            "cognitive_state": {"certainty": float(values[0])},
+            "uncertainty": {"outcome_uncertainty": float(values[1])},
+        })
+    return inputs
+
+
+class FakeClock:
+    """Manually advanced clock for retention and expiry tests."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeResult:
+    def __init__(self, rows=(), rowcount=1):
+        self.rows = list(rows)
+        self.rowcount = rowcount
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    """Records statements and answers them the way PostgreSQL would.
+
+    SQL text goes to ``sql``, and the pg_inherits query returns the
+    table's names in ``partitions``. Other statements go to
+    ``statements``: inserts return their ids in reverse order, updates
+    take their rowcount from ``rowcounts`` (1 once it runs out).
+    ``fail_on`` raises ``error`` on the statement with that index, or on
+    SQL text containing that string.
+    """
+
+    def __init__(self, partitions=None, rowcounts=(), fail_on=None, error=None):
+        self.partitions = partitions or {}
+        self.rowcounts = list(rowcounts)
+        self.fail_on = fail_on
+        self.error = error
+        self.statements = []
+        self.sql = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def get_bind(self):
+        return type("Bind", (), {"dialect": postgresql.dialect()})()
+
+    async def execute(self, statement, params=None):
+        if isinstance(statement, TextClause):
+            sql = str(statement)
+            if isinstance(self.fail_on, str) and self.fail_on in sql:
+                raise self.error or RuntimeError("lock timeout")
+            self.sql.append(sql)
+            if "pg_inherits" in sql:
+                return FakeResult(self.partitions.get(params["table"], []))
+            return FakeResult()
+        if len(self.statements) == self.fail_on:
+            raise self.error or RuntimeError("statement failed")
+        self.statements.append(statement)
+        if statement.is_insert:
+            params = statement.compile(dialect=postgresql.dialect()).params
+            ids = [value for key, value in params.items() if key.startswith("id_m")]
+            return FakeResult(reversed(ids))
+        return FakeResult(rowcount=self.rowcounts.pop(0) if self.rowcounts else 1)
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+
+@pytest.fixture
+def make_inputs():
+    return build_inputs
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def make_session():
+    return FakeSession
@@ -0,0 +1,76 @@
+import os
+import numpy as np
+import pytest
+from core.ai_engine import AIEngine
+from core.ai_engine.checkpoint import CheckpointError, load_checkpoint, save_checkpoint
+
+
+async def make_engine():
+    engine = AIEngine()
+    await engine.initialize_components()
+    return engine
+
+
+async def test_checkpoint_round_trip_restores_predictions(tmp_path):
+    source = await make_engine()
+    path = source.save_checkpoint(str(tmp_path))
+    restored = await make_engine()
+    restored.load_checkpoint(path)
+
+    state = {
+        "game_id": "game-0",
+        "player_id": "player-0",
+        "game_state": {"complexity": 0.4, "aggression_level": 0.7},
+    }
+    expected = await source.prediction_engine.process(state)
+    actual = await restored.prediction_engine.process(state)
+
+    assert actual["predicted_values"] == expected["predicted_values"]
+    assert np.array_equal(
+        restored.wisdom_aggregator.pattern_weights["spatial"],
+        source.wisdom_aggregator.pattern_weights["spatial"])
+    await source.shutdown()
+    await restored.shutdown()
+
+
+async def test_loaded_weights_are_copy_on_write_mappings(tmp_path):
+    source = await make_engine()
+    path = source.save_checkpoint(str(tmp_path))
+    restored = await make_engine()
+    restored.load_checkpoint(path)
+
+    weights = restored.xai_system.feature_weights["decision"]
+    assert isinstance(weights, np.memmap)
+
+    await restored.xai_system.update({
+        "decision_accuracy": 1.0,
+        "decision_gradient": [1.0] * 5,
+    })
+    on_disk = load_checkpoint(path)["xai_system"]["decision"]
+    assert np.array_equal(on_disk, source.xai_system.feature_weights["decision"])
+    assert not np.array_equal(weights, on_disk)
+    await source.shutdown()
+    await restored.shutdown()
+
+
+def test_checkpoint_versions_increase(tmp_path):
+    first = save_checkpoint({"component": {"weights": np.zeros(3)}}, str(tmp_path))
+    second = save_checkpoint({"component": {"weights": np.ones(3)}}, str(tmp_path))
+
+    assert os.path.basename(first) == "v000001"
+    assert os.path.basename(second) == "v000002"
+    assert load_checkpoint(second)["component"]["weights"].tolist() == [1.0] * 3
+
+
+async def test_incompatible_checkpoint_leaves_engine_untouched(tmp_path):
+    engine = await make_engine()
+    before = engine.prediction_engine.models["behavior"]["weights"].copy()
+    path = save_checkpoint({
+        "prediction_engine": {"behavior.weights": np.zeros(5)},
+    }, str(tmp_path))
+
+    with pytest.raises(CheckpointError):
+        engine.load_checkpoint(path)
+
+    assert np.array_equal(engine.prediction_engine.models["behavior"]["weights"], before)
+    await engine.shutdown()
@@ -0,0 +1,61 @@
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import core.auth
+from api.routers import ai_engine as ai_engine_router
+from core.auth import get_current_user
+from core.database import get_async_session
+from core.principal_cache import UserSnapshot
+
+USER = UserSnapshot(uuid.uuid4(), "player", "player@example.com", datetime(2024, 1, 1), datetime(2024, 1, 1))
+
+
+@pytest.fixture
+def client(monkeypatch):
+    saved = []
+
+    def save_checkpoint(root, metadata=None):
+        saved.append(metadata)
+        return f"{root}/v1"
+
+    async def record_checkpoint(session, name, path, config, metadata):
+        return SimpleNamespace(name=name, file_path=path)
+
+    async def no_session():
+        yield None
+
+    monkeypatch.setattr(ai_engine_router.ai_engine, "save_checkpoint", save_checkpoint)
+    monkeypatch.setattr(ai_engine_router.crud_ai_model, "record_checkpoint", record_checkpoint)
+    app = FastAPI()
+    app.include_router(ai_engine_router.router)
+    app.dependency_overrides[get_current_user] = lambda: USER
+    app.dependency_overrides[get_async_session] = no_session
+    client = TestClient(app)
+    client.saved = saved
+    return client
+
+
+def test_checkpoint_requires_admin(client, monkeypatch):
+    monkeypatch.setattr(core.auth, "ADMIN_USER_IDS", frozenset())
+
+    response = client.post("/ai/checkpoint")
+
+    assert response.status_code == 403
+    assert client.saved == []
+
+
+def test_admin_saves_checkpoint(client, monkeypatch):
+    monkeypatch.setattr(core.auth, "ADMIN_USER_IDS", frozenset({USER.id}))
+
+    response = client.post("/ai/checkpoint")
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "name": ai_engine_router.AI_MODEL_NAME,
+        "file_path": f"{ai_engine_router.AI_CHECKPOINT_DIR}/v1",
+    }
+    assert client.saved == [{"saved_by": str(USER.id)}]
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+from core.ai_engine import (
+    AIEngine,
+    AdaptivePredictionEngine,
+    CognitiveModelBuilder,
+    CollectiveWisdomAggregator,
+    ExplainableAI,
+)
+from core.ai_engine.collective import FEATURE_INDEX
+
+
+def assert_close(actual, expected):
+    """Compare nested results, allowing for floating point differences."""
+    if isinstance(expected, dict):
+        assert actual.keys() == expected.keys()
+        for key in expected:
+            assert_close(actual[key], expected[key])
+    elif isinstance(expected, list):
+        assert len(actual) == len(expected)
+        for left, right in zip(actual, expected):
+            assert_close(left, right)
+    elif isinstance(expected, float):
+        assert actual == pytest.approx(expected)
+    else:
+        assert actual == expected
+
+
+@pytest.mark.parametrize("component_class", [
+    AdaptivePredictionEngine,
+    CognitiveModelBuilder,
+    ExplainableAI,
+])
+async def test_batch_matches_single_processing(component_class, make_inputs):
+    component = component_class()
+    await component.initialize()
+    inputs = make_inputs(5)
+
+    batch = await component.process_batch(inputs)
+    singles = [await component.process(item) for item in inputs]
+
+    for batch_result, single_result in zip(batch, singles):
+        batch_result.pop("timestamp", None)
+        single_result.pop("timestamp", None)
+        batch_result.pop("last_updated", None)
+        single_result.pop("last_updated", None)
+        assert_close(batch_result, single_result)
+
+
+async def test_collective_batch_scores_every_game(make_inputs):
+    aggregator = CollectiveWisdomAggregator()
+    await aggregator.initialize()
+    inputs = make_inputs(4)
+
+    batch = await aggregator.process_batch(inputs)
+    single = await aggregator.process(inputs[2])
+
+    assert [k["game_id"] for k in batch] == [i["game_id"] for i in inputs]
+    assert len(batch[0]["patterns"]) == 19
+    assert len(batch[0]["strategies"]) == 13
+    assert batch[2]["patterns"] == pytest.approx(single["patterns"])
+    assert len(aggregator.knowledge_base) == 5
+
+
+async def test_engine_processes_batch_in_order(make_inputs):
+    engine = AIEngine(max_workers=2)
+    await engine.initialize_components()
+    inputs = make_inputs(3)
+
+    results = await engine.process_game_states(inputs)
+    await engine.shutdown()
+
+    assert len(results) == 3
+    for item, result in zip(inputs, results):
+        assert result["predictions"]["game_id"] == item["game_id"]
+        assert result["explanations"]["game_id"] == item["game_id"]
+        assert result["cognitive_state"]["player_id"] == item["player_id"]
+
+
+async def test_collective_feature_schema_scores_each_group():
+    aggregator = CollectiveWisdomAggregator()
+    await aggregator.initialize()
+    state = {"risk_level": 0.4, "reaction_speed": 0.9, "unrelated": "ignored"}
+
+    features = aggregator._extract_features([state])
+    assert features[0, FEATURE_INDEX["risk_level"]] == 0.4
+    assert features[0, FEATURE_INDEX["reaction_speed"]] == 0.9
+    assert np.count_nonzero(features) == 2
+
+    aggregator._update_strategy_weights({
+        "defensive_accuracy": 1.0,
+        "defensive_gradient": [0.0, 100.0, 0.0],
+    })
+    result = await aggregator.process({"game_id": "game-0", "game_state": state})
+
+    weight = aggregator.strategy_weights["defensive"][1]
+    assert aggregator.feature_weights[FEATURE_INDEX["reaction_speed"]] == weight
+    expected = 1 / (1 + np.exp(-0.9 * weight))
+    assert result["strategies"]["protective_strategy"] == pytest.approx(0.5)
+    assert result["strategies"]["reactive_strategy"] == pytest.approx(expected)
@@ -0,0 +1,74 @@
+import time
+
+import pytest
+from core.ai_engine.base import AIComponent, AIEngine, RESULT_KEYS
+from core.ai_engine.executors import ThreadExecutor
+
+
+class RecordingComponent(AIComponent):
+    """Stub component that sleeps and records the inputs it received."""
+
+    def __init__(self, name, delay, log):
+        self.name = name
+        self.delay = delay
+        self.log = log
+
+    async def initialize(self):
+        pass
+
+    async def process(self, input_data):
+        self.log.append((self.name, "start", time.monotonic()))
+        time.sleep(self.delay)
+        self.log.append((self.name, "end", time.monotonic()))
+        return {"stage": self.name, "inputs": sorted(input_data)}
+
+    async def update(self, feedback):
+        pass
+
+
+@pytest.fixture
+async def engine():
+    """Create an AI engine wired with recording stub components."""
+    log = []
+    ai_engine = AIEngine(max_workers=4)
+    ai_engine.quantum_generator = RecordingComponent("quantum", 0.1, log)
+    ai_engine.cognitive_builder = RecordingComponent("cognitive", 0.1, log)
+    ai_engine.prediction_engine = RecordingComponent("prediction", 0.05, log)
+    ai_engine.wisdom_aggregator = RecordingComponent("wisdom", 0.1, log)
+    ai_engine.xai_system = RecordingComponent("xai", 0.1, log)
+    ai_engine.executor = ThreadExecutor(max_workers=4)
+    ai_engine.log = log
+    yield ai_engine
+    await ai_engine.shutdown()
+
+
+async def test_process_game_state_returns_all_stage_outputs(engine):
+    result = await engine.process_game_state({"game_id": "g1"})
+
+    assert tuple(result) == RESULT_KEYS
+    assert result["predictions"]["inputs"] == [
+        "cognitive_state", "game_id", "uncertainty"]
+    assert result["explanations"]["inputs"] == [
+        "cognitive_state", "game_id", "predictions"]
+
+
+async def test_independent_stages_run_concurrently(engine):
+    start = time.monotonic()
+    await engine.process_game_state({"game_id": "g1"})
+    elapsed = time.monotonic() - start
+
+    # Critical path is 0.1 + 0.05 + 0.1; the serial sum is 0.45.
+    assert elapsed < 0.4
+    events = {(name, kind): ts for name, kind, ts in engine.log}
+    assert events[("prediction", "start")] >= events[("quantum", "end")]
+    assert events[("prediction", "start")] >= events[("cognitive", "end")]
+    assert events[("xai", "start")] < events[("wisdom", "end")]
+
+
+async def test_stage_failure_propagates(engine):
+    async def fail(input_data):
+        raise RuntimeError("boom")
+
+    engine.quantum_generator.process = fail
+    with pytest.raises(RuntimeError):
+        await engine.process_game_state({"game_id": "g1"})
@@ -0,0 +1,104 @@
+import pytest
+from core.ai_engine import AIEngine
+from core.ai_engine.executors import ComponentExecutor, InlineExecutor, ProcessExecutor, create_executor
+
+
+@pytest.fixture
+async def process_engine():
+    engine = AIEngine(executor=ProcessExecutor(workers=2))
+    await engine.initialize_components()
+    yield engine
+    await engine.shutdown()
+
+
+async def test_process_executor_matches_inline_results(process_engine, make_inputs):
+    inputs = make_inputs(6)
+
+    remote = await process_engine.executor.run(
+        process_engine, "prediction_engine", "process_batch", inputs)
+    local = await process_engine.prediction_engine.process_batch(inputs)
+
+    assert [r["game_id"] for r in remote] == [item["game_id"] for item in inputs]
+    assert [r["predicted_values"] for r in remote] == [r["predicted_values"] for r in local]
+
+
+async def test_process_executor_replays_feedback_on_workers(process_engine, make_inputs):
+    inputs = make_inputs(4)
+    before = await process_engine.executor.run(
+        process_engine, "prediction_engine", "process_batch", inputs)
+
+    await process_engine.update_components_batch([
+        {"actual_outcome": {"value": 1.0}, "game_state": {"player_stats": 0.5}},
+    ])
+    remote = await process_engine.executor.run(
+        process_engine, "prediction_engine", "process_batch", inputs)
+    local = await process_engine.prediction_engine.process_batch(inputs)
+
+    assert remote[0]["predicted_values"] != before[0]["predicted_values"]
+    assert [r["predicted_values"] for r in remote] == [r["predicted_values"] for r in local]
+
+
+async def test_process_executor_syncs_loaded_checkpoint(process_engine, tmp_path, make_inputs):
+    inputs = make_inputs(2)
+    await process_engine.process_game_states(inputs)
+
+    other = AIEngine(executor=InlineExecutor())
+    await other.initialize_components()
+    process_engine.load_checkpoint(other.save_checkpoint(str(tmp_path)))
+    await process_engine.process_game_states(inputs)
+
+    remote = await process_engine.executor.run(
+        process_engine, "prediction_engine", "process_batch", inputs)
+    local = await other.prediction_engine.process_batch(inputs)
+    assert [r["predicted_values"] for r in remote] == [r["predicted_values"] for r in local]
+
+
+async def test_process_executor_reads_stores_of_owning_worker(process_engine, make_inputs):
+    inputs = make_inputs(4)
+    await process_engine.process_game_states(inputs)
+
+    for item in inputs:
+        factors = await process_engine.latest(
+            "quantum_generator", "uncertainty_history", item["game_id"])
+        assert factors.game_id == item["game_id"]
+        assert await process_engine.latest(
+            "xai_system", "explanation_history", item["game_id"]) is not None
+    assert process_engine.quantum_generator.uncertainty_history.latest("game-0") is None
+    assert await process_engine.latest(
+        "quantum_generator", "uncertainty_history", "unknown") is None
+
+    stats = process_engine.store_stats()
+    assert stats[("quantum_generator", "uncertainty_history")] == (4, 0)
+    assert stats[("wisdom_aggregator", "knowledge_base")] == (4, 0)
+
+
+def test_games_are_pinned_to_workers():
+    executor = ProcessExecutor(workers=4)
+
+    owners = {executor.worker_for(f"game-{index}") for index in range(100)}
+
+    assert owners == {0, 1, 2, 3}
+    assert executor.worker_for("game-7") == executor.worker_for("game-7")
+
+
+async def test_inline_executor_runs_pipeline(make_inputs):
+    engine = AIEngine(executor=create_executor("inline"))
+    await engine.initialize_components()
+
+    results = await engine.process_game_states(make_inputs(3))
+
+    assert [r["predictions"]["game_id"] for r in results] == ["game-0", "game-1", "game-2"]
+    await engine.shutdown()
+
+
+def test_unknown_executor_is_rejected():
+    with pytest.raises(ValueError):
+        create_executor("fiber")
+
+
+def test_executor_without_run_cannot_be_created():
+    class Incomplete(ComponentExecutor):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
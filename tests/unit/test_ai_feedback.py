@@ -0,0 +1,150 @@
+import asyncio
+import numpy as np
+import pytest
+from core.ai_engine import AIEngine, AdaptivePredictionEngine
+from core.ai_engine.feedback import FeedbackQueue, merge_feedback
+
+
+class RecordingEngine:
+    """Engine stub recording the feedback batches it receives."""
+
+    def __init__(self):
+        self.batches = []
+
+    async def update_components_batch(self, feedbacks):
+        if any(feedback.get("bad") for feedback in feedbacks):
+            raise ValueError("bad feedback")
+        self.batches.append(list(feedbacks))
+
+
+def test_merge_feedback_averages_scaled_gradients():
+    merged = merge_feedback([
+        {"skill_accuracy": 1.0, "skill_gradient": [2.0, 0.0], "player_id": "a"},
+        {"skill_accuracy": 0.5, "skill_gradient": [0.0, 4.0], "player_id": "b"},
+        {"uncertainty_accuracy": 0.8, "template_updates": {"decision": "x"}},
+        {"uncertainty_accuracy": 0.4},
+    ])
+
+    assert merged["skill_gradient"] == pytest.approx([1.0, 1.0])
+    assert merged["skill_accuracy"] == 1.0
+    assert merged["uncertainty_accuracy"] == pytest.approx(0.6)
+    assert merged["player_id"] == "b"
+    assert merged["template_updates"] == {"decision": "x"}
+
+
+async def test_queue_applies_feedback_in_batches():
+    engine = RecordingEngine()
+    queue = FeedbackQueue(engine, batch_size=4, max_delay=0.01)
+    queue.start()
+
+    for index in range(10):
+        queue.submit({"index": index})
+    await asyncio.sleep(0.05)
+    await queue.stop()
+
+    assert [len(batch) for batch in engine.batches] == [4, 4, 2]
+    assert [item["index"] for batch in engine.batches for item in batch] == list(range(10))
+    assert queue.applied == 10
+
+
+async def test_stop_applies_pending_feedback():
+    engine = RecordingEngine()
+    queue = FeedbackQueue(engine, batch_size=8)
+
+    for index in range(3):
+        queue.submit({"index": index})
+    await queue.stop()
+
+    assert [len(batch) for batch in engine.batches] == [3]
+
+
+async def test_failed_batch_is_retried_record_by_record():
+    engine = RecordingEngine()
+    queue = FeedbackQueue(engine, batch_size=8)
+
+    for index in range(3):
+        queue.submit({"index": index, "bad": index == 1})
+    await queue.stop()
+
+    assert [[item["index"] for item in batch] for batch in engine.batches] == [[0], [2]]
+    assert queue.applied == 2
+    assert queue.failed == 1
+    assert queue.batches == 1
+
+
+def test_full_queue_rejects_feedback():
+    queue = FeedbackQueue(RecordingEngine(), max_pending=1)
+    queue.submit({})
+
+    with pytest.raises(asyncio.QueueFull):
+        queue.submit({})
+
+
+async def test_prediction_batch_update_uses_mean_gradient():
+    engine = AdaptivePredictionEngine()
+    await engine.initialize()
+    model = engine.models["outcome"]
+    weights = model["weights"].copy()
+    bias = model["bias"]
+    feedbacks = [
+        {"actual_outcome": {"value": 1.0}, "game_state": {"player_stats": 0.2}},
+        {"actual_outcome": {"value": 0.0}, "game_state": {"player_stats": 0.8}},
+    ]
+
+    await engine.update_batch(feedbacks)
+
+    stats = np.array([0.2, 0.8])
+    residuals = engine._sigmoid(weights[1] * stats + bias) - np.array([1.0, 0.0])
+    assert model["weights"][1] == pytest.approx(weights[1] - 0.01 * np.mean(residuals * stats))
+    assert model["bias"] == pytest.approx(bias - 0.01 * np.mean(residuals))
+    assert np.array_equal(model["weights"][2:], weights[2:])
+
+
+async def test_engine_applies_feedback_batch():
+    engine = AIEngine()
+    await engine.initialize_components()
+    before = engine.xai_system.feature_weights["outcome"].copy()
+
+    await engine.update_components_batch([
+        {"outcome_accuracy": 1.0, "outcome_gradient": [1.0] * 4},
+        {"outcome_accuracy": 1.0, "outcome_gradient": [3.0] * 4},
+    ])
+
+    assert engine.xai_system.feature_weights["outcome"] == pytest.approx(before + 0.02)
+    await engine.shutdown()
+
+
+async def test_failed_update_leaves_every_component_unchanged():
+    engine = AIEngine()
+    await engine.initialize_components()
+    before = {
+        name: {key: np.array(value) for key, value in component.get_parameters().items()}
+        for name, component in engine.components.items()
+    }
+
+    with pytest.raises(ValueError):
+        await engine.update_components_batch([{
+            "actual_outcome": {"value": 1.0},
+            "game_state": {"player_stats": 0.5},
+            "uncertainty_accuracy": 0.9,
+            # The XAI strategy weights have six entries; it is updated last
+            "strategy_accuracy": 1.0,
+            "strategy_gradient": [1.0] * 2,
+        }])
+
+    for name, component in engine.components.items():
+        for key, value in component.get_parameters().items():
+            assert np.array_equal(value, before[name][key]), (name, key)
+    await engine.shutdown()
+
+
+async def test_engine_rejects_gradients_of_the_wrong_length():
+    engine = AIEngine()
+    await engine.initialize_components()
+
+    engine.validate_feedback({"outcome_accuracy": 1.0, "outcome_gradient": [1.0] * 4})
+    with pytest.raises(ValueError, match="outcome_gradient"):
+        engine.validate_feedback({"outcome_accuracy": 1.0, "outcome_gradient": [1.0] * 3})
+    with pytest.raises(ValueError, match="correlation_matrix_update"):
+        engine.validate_feedback({"correlation_matrix_update": [[0.0]]})
+    await engine.shutdown()
@@ -0,0 +1,91 @@
+import uuid
+from datetime import datetime
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.routers import ai_engine as ai_engine_router
+from core.ai_engine import AIEngine
+from core.auth import get_current_user
+from core.database import get_async_session
+from core.principal_cache import UserSnapshot
+
+USER = UserSnapshot(uuid.uuid4(), "player", "player@example.com", datetime(2024, 1, 1), datetime(2024, 1, 1))
+
+
+class RecordingQueue:
+    def __init__(self):
+        self.records = []
+
+    def submit(self, feedback):
+        self.records.append(feedback)
+
+
+@pytest.fixture
+async def engine():
+    engine = AIEngine()
+    await engine.initialize_components()
+    yield engine
+    await engine.shutdown()
+
+
+@pytest.fixture
+def client(engine, monkeypatch):
+    async def no_session():
+        yield None
+
+    queue = RecordingQueue()
+    monkeypatch.setattr(ai_engine_router, "ai_engine", engine)
+    monkeypatch.setattr(ai_engine_router, "feedback_queue", queue)
+    app = FastAPI()
+    app.include_router(ai_engine_router.router)
+    app.dependency_overrides[get_current_user] = lambda: USER
+    app.dependency_overrides[get_async_session] = no_session
+    client = TestClient(app)
+    client.queue = queue
+    return client
+
+
+def test_feedback_is_queued(client):
+    response = client.post("/ai/feedback", json={
+        "outcome_accuracy": 0.8,
+        "outcome_gradient": [0.1, 0.2, 0.3, 0.4],
+        "quantum_feedback": 0.5,
+    })
+
+    assert response.status_code == 202
+    assert client.queue.records == [{
+        "outcome_accuracy": 0.8,
+        "outcome_gradient": [0.1, 0.2, 0.3, 0.4],
+        "quantum_feedback": 0.5,
+        "player_id": USER.id,
+    }]
+
+
+@pytest.mark.parametrize("feedback", [
+    {"outcome_accuracy": 1.0, "outcome_gradient": [1.0] * 3},
+    {"outcome_gradient": ["up"]},
+    {"outcome_accuracy": "high"},
+    {"quantum_feedback": 2.0},
+    {"unknown_field": 1},
+    {"template_updates": {"decision": "{nope}"}},
+    {"template_updates": {"decision": "{main_factor.__class__}"}},
+    {"template_updates": {"decision": "{main_factor"}},
+    {"template_updates": {"verdict": "{main_factor}"}},
+])
+def test_invalid_feedback_is_rejected(client, feedback):
+    response = client.post("/ai/feedback", json=feedback)
+
+    assert response.status_code == 422
+    assert client.queue.records == []
+
+
+async def test_template_update_keeps_predictions_working(client, engine):
+    template = "Chosen for {main_factor}."
+    response = client.post("/ai/feedback", json={"template_updates": {"decision": template}})
+    assert response.status_code == 202
+
+    await engine.update_components(client.queue.records[0])
+    result = await engine.xai_system.process({"game_id": "game-0", "game_state": {"complexity": 0.5}})
+
+    assert result["decision_explanations"]["decision"].startswith("Chosen for ")
@@ -0,0 +1,51 @@
+from core.ai_engine.history import HistoryStore
+
+
+def test_latest_returns_newest_entry_per_game(clock):
+    store = HistoryStore(max_entries=3, max_age=None, clock=clock)
+    store.append("g1", "a")
+    store.append("g2", "b")
+    store.append("g1", "c")
+
+    assert store.latest("g1") == "c"
+    assert store.latest("g2") == "b"
+    assert store.latest("missing") is None
+
+
+def test_entries_are_bounded_per_game(clock):
+    store = HistoryStore(max_entries=3, max_age=None, clock=clock)
+    for value in range(5):
+        store.append("g1", value)
+
+    assert store.recent("g1") == [2, 3, 4]
+    assert store.recent("g1", 2) == [3, 4]
+    assert store.evictions == 2
+    assert len(store) == 3
+
+
+def test_entries_expire_by_age(clock):
+    store = HistoryStore(max_entries=10, max_age=60, clock=clock)
+    store.append("g1", "old")
+    clock.now += 30
+    store.append("g1", "new")
+    clock.now += 45
+
+    assert store.recent("g1") == ["new"]
+    clock.now += 30
+    assert store.latest("g1") is None
+
+    store.prune()
+    assert store.games == 0
+
+
+def test_least_recently_written_game_is_evicted(clock):
+    store = HistoryStore(max_entries=10, max_age=None, max_games=2, clock=clock)
+    store.append("g1", 1)
+    store.append("g2", 2)
+    store.append("g1", 3)
+    store.append("g3", 4)
+
+    assert store.latest("g2") is None
+    assert store.latest("g1") == 3
+    assert store.latest("g3") == 4
+    assert store.games == 2
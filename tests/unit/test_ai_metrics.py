@@ -0,0 +1,102 @@
+import threading
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from core.ai_engine import AIEngine
+from core.ai_engine.base import STAGE_ERRORS, STAGE_INPUT_SIZE, STAGE_LATENCY
+from core.ai_engine.executors import InlineExecutor
+from core.metrics import Metric, MetricsRegistry, REGISTRY
+from api.routers import metrics
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency.", ("stage",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        latency.observe(value, "quantum")
+
+    lines = registry.render().splitlines()
+
+    assert "# TYPE latency_seconds histogram" in lines
+    assert 'latency_seconds_bucket{stage="quantum",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{stage="quantum",le="1"} 3' in lines
+    assert 'latency_seconds_bucket{stage="quantum",le="+Inf"} 4' in lines
+    assert 'latency_seconds_sum{stage="quantum"} 6.05' in lines
+    assert 'latency_seconds_count{stage="quantum"} 4' in lines
+
+
+def test_counter_sums_per_thread_shards():
+    registry = MetricsRegistry()
+    errors = registry.counter("errors", "Errors.", ("stage",))
+
+    def work():
+        for _ in range(1000):
+            errors.inc("xai")
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors.value("xai") == 4000
+    assert 'errors_total{stage="xai"} 4000' in registry.render()
+
+
+def test_metric_without_samples_cannot_be_created():
+    class Incomplete(Metric):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete("incomplete", "Has no samples.")
+
+
+def test_duplicate_metric_names_are_rejected():
+    registry = MetricsRegistry()
+    registry.counter("errors", "Errors.")
+    with pytest.raises(ValueError):
+        registry.counter("errors", "Errors.")
+
+
+async def test_engine_records_stage_metrics():
+    engine = AIEngine(executor=InlineExecutor())
+    await engine.initialize_components()
+    calls = STAGE_LATENCY.count("predictions", "batch")
+    sizes = STAGE_INPUT_SIZE.count("predictions", "batch")
+
+    await engine.process_game_states([
+        {"game_id": f"game-{index}", "player_id": "player", "game_state": {}}
+        for index in range(3)
+    ])
+
+    assert STAGE_LATENCY.count("predictions", "batch") == calls + 1
+    assert STAGE_INPUT_SIZE.count("predictions", "batch") == sizes + 1
+    assert engine.store_stats()[("prediction_engine", "history")] == (3, 0)
+    await engine.shutdown()
+
+
+async def test_engine_counts_stage_errors():
+    engine = AIEngine(executor=InlineExecutor())
+    await engine.initialize_components()
+    errors = STAGE_ERRORS.value("uncertainty", "single")
+
+    async def fail(input_data):
+        raise RuntimeError("boom")
+
+    engine.quantum_generator.process = fail
+    with pytest.raises(RuntimeError):
+        await engine.process_game_state({"game_id": "game-0"})
+
+    assert STAGE_ERRORS.value("uncertainty", "single") == errors + 1
+    await engine.shutdown()
+
+
+def test_metrics_endpoint_serves_prometheus_text():
+    app = FastAPI()
+    app.include_router(metrics.router)
+
+    response = TestClient(app).get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE ai_engine_stage_latency_seconds histogram" in response.text
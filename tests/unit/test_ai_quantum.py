@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+from scipy.linalg import expm
+from core.ai_engine import QuantumUncertaintyGenerator
+from core.ai_engine.quantum import COMPLEXITY_LEVELS, STATE_LAYOUT, QuantumStatePool
+
+
+@pytest.fixture
+async def generator():
+    generator = QuantumUncertaintyGenerator()
+    await generator.initialize()
+    return generator
+
+
+async def test_evolution_matrix_matches_expm(generator):
+    eigenvalues, eigenvectors = generator.hamiltonians[4]
+    h_matrix = (eigenvectors * eigenvalues) @ eigenvectors.conj().T
+
+    operator = generator._create_evolution_matrix(4, {"complexity": 0.75})
+
+    time_scale = round(0.75 * COMPLEXITY_LEVELS) / COMPLEXITY_LEVELS
+    expected = expm(-1j * h_matrix * time_scale * generator.decoherence_rate)
+    assert np.allclose(operator, expected)
+    assert np.allclose(operator @ operator.conj().T, np.eye(4))
+
+
+async def test_evolution_matrix_is_cached(generator):
+    first = generator._create_evolution_matrix(3, {"complexity": 0.5})
+    again = generator._create_evolution_matrix(3, {"complexity": 0.5001})
+
+    assert again is first
+    assert len(generator.evolution_cache) == 1
+
+
+async def test_decoherence_update_invalidates_cache(generator):
+    generator._create_evolution_matrix(3, {"complexity": 0.5})
+
+    generator._update_decoherence_rate({"uncertainty_accuracy": 0.5})
+    assert len(generator.evolution_cache) == 1
+
+    generator._update_decoherence_rate({"uncertainty_accuracy": 0.9})
+    assert generator.evolution_cache == {}
+
+
+async def test_games_evolve_independently(generator):
+    generator.quantum_states.acquire(["a", "b"])
+    start = generator.quantum_states.get("a")
+
+    await generator.process({"game_id": "b", "game_state": {"complexity": 0.9}})
+    await generator.process({"game_id": "a", "game_state": {"complexity": 0.3}})
+
+    operator_state = start.copy()
+    for columns in STATE_LAYOUT.values():
+        size = columns.stop - columns.start
+        operator = generator._create_evolution_matrix(size, {"complexity": 0.3})
+        operator_state[columns] = operator @ start[columns]
+    assert np.allclose(generator.quantum_states.get("a"), operator_state)
+
+
+async def test_batch_with_repeated_game_matches_sequential(generator):
+    inputs = [
+        {"game_id": "a", "game_state": {"complexity": 0.2}},
+        {"game_id": "b", "game_state": {"complexity": 0.6}},
+        {"game_id": "a", "game_state": {"complexity": 0.8}},
+    ]
+    generator.quantum_states.acquire(["a", "b"])
+    saved = generator.quantum_states.data.copy()
+
+    batch = await generator.process_batch(inputs)
+    batch_states = generator.quantum_states.data.copy()
+
+    generator.quantum_states.data[:] = saved
+    singles = [await generator.process(item) for item in inputs]
+
+    assert np.allclose(generator.quantum_states.data, batch_states)
+    for batch_result, single_result in zip(batch, singles):
+        assert batch_result["composite_uncertainty"] == pytest.approx(
+            single_result["composite_uncertainty"])
+
+
+def test_pool_evicts_least_recently_used_game():
+    pool = QuantumStatePool(2, lambda: np.ones(2), max_games=2, initial_capacity=1)
+    pool.acquire(["a"])
+    pool.acquire(["b"])
+    pool.acquire(["a"])
+    pool.acquire(["c"])
+
+    assert "b" not in pool
+    assert "a" in pool and "c" in pool
+    assert pool.evictions == 1
+    assert pool.data.shape[0] == 2
+
+
+async def test_evolve_active_games_matches_single_evolution(generator):
+    generator.quantum_states.acquire(["a", "b"])
+    before = {game_id: generator.quantum_states.get(game_id) for game_id in "ab"}
+
+    generator.evolve_active_games({"complexity": 0.4})
+
+    for game_id, state in before.items():
+        expected = state[np.newaxis].copy()
+        generator._evolve_quantum_states(expected, [{"complexity": 0.4}])
+        assert np.allclose(generator.quantum_states.get(game_id), expected[0])
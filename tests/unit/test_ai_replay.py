@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from core.ai_engine import AIEngine
+from core.ai_engine.replay import ReplayTrainer, replay_target
+
+
+async def make_trainer(chunk_size=4):
+    engine = AIEngine()
+    await engine.initialize_components()
+    return engine, ReplayTrainer(engine, chunk_size)
+
+
+def stored_games(count, seed=0):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for _ in range(count):
+        aggression = float(rng.uniform(-1, 1))
+        rows.append(({
+            "aggression_level": aggression,
+            "attack_frequency": aggression,
+            "player_stats": aggression,
+            "current_state_value": aggression,
+        }, 10 if aggression > 0 else -10))
+    return rows
+
+
+def test_replay_target_prefers_explicit_outcome():
+    assert replay_target({"outcome": 0.25}, 10) == 0.25
+    assert replay_target({}, 3) == 1.0
+    assert replay_target({}, 0) == 0.0
+    assert replay_target({"outcome": "won"}, None) is None
+
+
+async def test_train_chunk_updates_components():
+    engine, trainer = await make_trainer()
+    aggregator = engine.wisdom_aggregator.feature_weights.copy()
+    xai = engine.xai_system.feature_weights["outcome"].copy()
+
+    losses = await trainer.train_chunk(stored_games(8) + [({}, None)])
+
+    assert set(losses) == {"outcome"}
+    assert not np.array_equal(engine.wisdom_aggregator.feature_weights, aggregator)
+    assert not np.array_equal(engine.xai_system.feature_weights["outcome"], xai)
+    assert trainer.summary()["games"] == 8
+    assert trainer.summary()["skipped"] == 1
+    await engine.shutdown()
+
+
+async def test_replay_fits_outcomes():
+    engine, trainer = await make_trainer()
+    engine.prediction_engine.learning_rate = 0.5
+    games = stored_games(64)
+
+    first = await trainer.train_chunk(games)
+    for _ in range(50):
+        last = await trainer.train_chunk(games)
+
+    assert last["outcome"] < first["outcome"]
+    await engine.shutdown()
@@ -0,0 +1,125 @@
+import numpy as np
+import pytest
+from core.ai_engine import CollectiveWisdomAggregator
+from core.ai_engine.collective import PATTERN_NAMES, STRATEGY_NAMES
+from core.ai_engine.rolling import RollingWindow, RollingWindowStore, RunningCorrelation
+
+
+def test_window_statistics_match_recomputation():
+    rng = np.random.default_rng(0)
+    window = RollingWindow(capacity=5, width=3)
+    rows = rng.random((12, 3))
+
+    for count, row in enumerate(rows, 1):
+        window.push(row)
+        recent = rows[max(0, count - 5):count]
+        assert window.mean == pytest.approx(recent.mean(axis=0))
+        assert window.variance() == pytest.approx(recent.var(axis=0))
+
+
+def test_weighted_sum_orders_rows_oldest_first():
+    window = RollingWindow(capacity=3, width=2)
+    rows = np.arange(10, dtype=float).reshape(5, 2)
+    for row in rows:
+        window.push(row)
+
+    weights = np.array([1.0, 10.0, 100.0])
+    assert window.weighted_sum(weights) == pytest.approx(weights @ rows[-3:])
+
+
+def test_store_evicts_least_recently_used_game():
+    store = RollingWindowStore(capacity=2, width=1, max_games=2, max_age=None)
+    store.push("g1", np.ones(1))
+    store.push("g2", np.ones(1))
+    store.push("g3", np.ones(1))
+
+    assert store.get("g1") is None
+    assert store.get("g3").count == 1
+    assert store.evictions == 1
+
+
+def test_running_correlation_matches_corrcoef():
+    rng = np.random.default_rng(1)
+    rows = rng.random((40, 4))
+    rows[:, 1] = 2 * rows[:, 0] + 0.1 * rows[:, 1]
+    running = RunningCorrelation(width=4)
+
+    for batch in np.array_split(rows, 7):
+        running.update(batch)
+
+    assert running.correlation() == pytest.approx(np.corrcoef(rows, rowvar=False))
+
+
+async def test_collective_correlations_list_strongest_upper_triangle_pairs():
+    aggregator = CollectiveWisdomAggregator()
+    await aggregator.initialize()
+    analyzer = aggregator.meta_analyzers["correlation_analyzer"]
+    matrix = analyzer["correlation_matrix"]
+    names = PATTERN_NAMES + STRATEGY_NAMES
+
+    significant = [
+        (names[i], names[j], float(matrix[i, j]))
+        for i in range(len(names))
+        for j in range(i + 1, len(names))
+        if abs(matrix[i, j]) > analyzer["significance_threshold"]
+    ]
+    expected = sorted(significant, key=lambda pair: -abs(pair[2]))[:analyzer["top_k"]]
+
+    result = aggregator._analyze_correlations()
+    assert result["significant_correlations"] == expected
+    assert result["significant_count"] == len(significant)
+    assert result["mean_strength"] == pytest.approx(np.mean([abs(pair[2]) for pair in significant]))
+
+
+async def test_collective_history_leaves_out_shared_correlations():
+    aggregator = CollectiveWisdomAggregator()
+    await aggregator.initialize()
+
+    results = await aggregator.process_batch([
+        {"game_id": f"g{index}", "game_state": {"aggression_level": 0.5}} for index in range(3)])
+
+    top_k = aggregator.meta_analyzers["correlation_analyzer"]["top_k"]
+    for result in results:
+        assert len(result["meta_insights"]["correlations"]["significant_correlations"]) <= top_k
+    assert "correlations" not in aggregator.knowledge_base.latest("g0").meta_insights
+
+
+async def test_collective_empirical_correlations_follow_history():
+    aggregator = CollectiveWisdomAggregator()
+    await aggregator.initialize()
+    analyzer = aggregator.meta_analyzers["correlation_analyzer"]
+    analyzer["empirical"] = True
+    assert aggregator._analyze_correlations()["significant_correlations"] == []
+
+    rng = np.random.default_rng(2)
+    rows = rng.random((20, analyzer["matrix_size"]))
+    rows[:, 5] = rows[:, 0]
+    aggregator._record_history([f"game-{i}" for i in range(20)], rows)
+
+    pairs = aggregator._analyze_correlations()["significant_correlations"]
+    assert (PATTERN_NAMES[0], PATTERN_NAMES[5], pytest.approx(1.0)) in pairs
+
+
+async def test_collective_trends_match_window_definition():
+    aggregator = CollectiveWisdomAggregator()
+    await aggregator.initialize()
+    analyzer = aggregator.meta_analyzers["trend_analyzer"]
+    rng = np.random.default_rng(1)
+
+    history = []
+    for _ in range(analyzer["window_size"] + 3):
+        result = await aggregator.process({
+            "game_id": "g1",
+            "game_state": {"aggression_level": float(rng.random()),
+                           "attack_frequency": float(rng.random())}
+        })
+        history.append(
+            list(result["patterns"].values()) + list(result["strategies"].values()))
+
+    recent = np.array(history[-analyzer["window_size"]:])
+    expected = np.mean(
+        (recent - recent.mean(axis=0)) * analyzer["weights"][:, np.newaxis], axis=0)
+    trends = aggregator._analyze_trends("g1")
+
+    assert trends["pattern_trends"] == pytest.approx(expected[:19].tolist())
+    assert trends["strategy_trends"] == pytest.approx(expected[19:].tolist())
@@ -0,0 +1,119 @@
+import uuid
+import numpy as np
+import pytest
+from core.ai_engine import AIEngine
+from core.ai_engine.shared import SharedWeights
+
+FEEDBACK = {
+    "decision_accuracy": 1.0,
+    "decision_gradient": [1.0] * 5,
+    "offensive_accuracy": 1.0,
+    "offensive_gradient": [1.0] * 3,
+}
+
+
+@pytest.fixture
+def segment_name(tmp_path):
+    name = f"hagame-test-{uuid.uuid4().hex[:12]}"
+    yield name
+    SharedWeights.remove(name)
+
+
+async def make_engine(name, tmp_path):
+    engine = AIEngine()
+    await engine.initialize_components()
+    engine.shared_weights = SharedWeights.open(
+        name, engine, grace_period=0.0, lock_path=str(tmp_path / "writer.lock"))
+    return engine
+
+
+async def test_workers_adopt_the_first_workers_weights(segment_name, tmp_path):
+    first = await make_engine(segment_name, tmp_path)
+    second = await make_engine(segment_name, tmp_path)
+
+    weights = second.xai_system.feature_weights["decision"]
+    assert np.array_equal(weights, first.xai_system.feature_weights["decision"])
+    assert np.shares_memory(weights, second.shared_weights.slots)
+    assert not weights.flags.writeable
+
+    await first.shutdown()
+    await second.shutdown()
+
+
+async def test_feedback_is_published_to_every_worker(segment_name, tmp_path):
+    writer = await make_engine(segment_name, tmp_path)
+    reader = await make_engine(segment_name, tmp_path)
+    before = reader.wisdom_aggregator.pattern_weights["behavioral"].copy()
+    offensive = reader.wisdom_aggregator.strategy_weights["offensive"].copy()
+
+    await writer.update_components(FEEDBACK)
+
+    assert np.array_equal(reader.wisdom_aggregator.strategy_weights["offensive"], offensive)
+    assert reader.shared_weights.refresh(reader)
+    assert np.allclose(
+        reader.wisdom_aggregator.strategy_weights["offensive"], offensive + 0.01)
+    assert np.array_equal(reader.wisdom_aggregator.pattern_weights["behavioral"], before)
+    assert np.array_equal(
+        reader.xai_system.feature_weights["decision"],
+        writer.xai_system.feature_weights["decision"])
+    assert reader.shared_weights.refresh(reader) is False
+
+    await writer.shutdown()
+    await reader.shutdown()
+
+
+async def test_prediction_scalars_are_shared(segment_name, tmp_path):
+    writer = await make_engine(segment_name, tmp_path)
+    reader = await make_engine(segment_name, tmp_path)
+
+    bias = reader.prediction_engine.models["outcome"]["bias"]
+
+    await writer.update_components({
+        "actual_outcome": {"value": 1.0},
+        "predicted_outcome": {"value": 0.0},
+        "game_state": {"complexity": 0.5},
+    })
+    reader.shared_weights.refresh(reader)
+
+    assert reader.prediction_engine.models["outcome"]["bias"] != bias
+
+    for name, model in writer.prediction_engine.models.items():
+        assert reader.prediction_engine.models[name]["bias"] == model["bias"]
+    assert reader.prediction_engine.learning_rate == writer.prediction_engine.learning_rate
+
+    await writer.shutdown()
+    await reader.shutdown()
+
+
+async def test_shutdown_keeps_private_weights(segment_name, tmp_path):
+    engine = await make_engine(segment_name, tmp_path)
+    shared = engine.xai_system.feature_weights["strategy"].copy()
+
+    await engine.shutdown()
+
+    weights = engine.xai_system.feature_weights["strategy"]
+    assert weights.flags.writeable
+    assert np.array_equal(weights, shared)
+
+
+async def test_writer_serves_published_weights_while_staging(segment_name, tmp_path):
+    engine = await make_engine(segment_name, tmp_path)
+    published = engine.xai_system.feature_weights["decision"]
+    before = published.copy()
+    during = []
+
+    async def stage(feedback):
+        staged = await engine._stage_update("update", feedback)
+        during.append(engine.xai_system.feature_weights["decision"])
+        return staged
+
+    await engine.shared_weights.update(engine, stage, FEEDBACK)
+
+    assert during[0] is published
+    assert np.array_equal(published, before)
+    weights = engine.xai_system.feature_weights["decision"]
+    assert np.allclose(weights, before + 0.01)
+    assert np.shares_memory(weights, engine.shared_weights.slots)
+    assert not weights.flags.writeable
+
+    await engine.shutdown()
@@ -0,0 +1,114 @@
+import numpy as np
+import pytest
+from core.ai_engine.optim import Optimizer, create_optimizer
+from core.ai_engine.prediction import AdaptivePredictionEngine
+
+
+async def make_engine(optimizer="sgd"):
+    engine = AdaptivePredictionEngine()
+    await engine.initialize()
+    engine.optimizer = create_optimizer(optimizer)
+    return engine
+
+
+def synthetic_dataset(engine, rows=512, seed=0):
+    rng = np.random.default_rng(seed)
+    features = {name: rng.normal(size=(rows, len(model["weights"])))
+                for name, model in engine.models.items()}
+    targets = {
+        "behavior": features["behavior"] @ np.linspace(-1, 1, features["behavior"].shape[1]),
+        "outcome": (features["outcome"][:, 0] > 0).astype(float),
+        "strategy": (features["strategy"][:, 1] < 0).astype(float),
+    }
+    return features, targets
+
+
+@pytest.mark.parametrize("optimizer", ["sgd", "momentum", "adam"])
+async def test_fit_reduces_loss_for_every_model(optimizer):
+    engine = await make_engine(optimizer)
+    engine.learning_rate = 0.05
+    features, targets = synthetic_dataset(engine)
+
+    history = engine.fit(features, targets, epochs=20, batch_size=64)
+
+    for name in engine.models:
+        assert history[-1][name] < history[0][name]
+
+
+async def test_train_batch_matches_per_model_gradients():
+    engine = await make_engine()
+    features, targets = synthetic_dataset(engine, rows=8)
+    before = {name: (model["weights"].copy(), model["bias"])
+              for name, model in engine.models.items()}
+
+    losses = engine.train_batch(features, targets)
+
+    for name, (weights, bias) in before.items():
+        scores = features[name] @ weights + bias
+        outputs = scores if name == "behavior" else engine._sigmoid(scores)
+        residuals = outputs - targets[name]
+        model = engine.models[name]
+        assert model["weights"] == pytest.approx(
+            weights - 0.01 * residuals @ features[name] / 8)
+        assert model["bias"] == pytest.approx(bias - 0.01 * residuals.mean())
+    assert losses["behavior"] == pytest.approx(
+        np.mean(0.5 * (features["behavior"] @ before["behavior"][0]
+                       + before["behavior"][1] - targets["behavior"]) ** 2))
+
+
+async def test_models_without_targets_are_left_alone():
+    engine = await make_engine()
+    features, targets = synthetic_dataset(engine, rows=4)
+    targets["strategy"][:] = np.nan
+    del targets["behavior"]
+    strategy = engine.models["strategy"]["weights"].copy()
+    behavior = engine.models["behavior"]["weights"].copy()
+
+    losses = engine.train_batch(features, targets)
+
+    assert set(losses) == {"outcome"}
+    assert np.array_equal(engine.models["strategy"]["weights"], strategy)
+    assert np.array_equal(engine.models["behavior"]["weights"], behavior)
+
+
+async def test_build_training_batch_reads_logged_examples():
+    engine = await make_engine()
+    features, targets = engine.build_training_batch([
+        {"game_state": {"player_stats": 0.3}, "uncertainty": {"uncertainty": 0.6},
+         "targets": {"outcome": 1.0}},
+        {"game_state": {}, "cognitive_state": {"cognitive_state": 0.4}},
+    ])
+
+    assert features["outcome"][0, :3].tolist() == [0.0, 0.3, 0.6]
+    assert features["behavior"][1, 1] == 0.4
+    assert targets["outcome"][0] == 1.0
+    assert np.isnan(targets["outcome"][1])
+
+
+def test_optimizer_without_step_cannot_be_created():
+    class Incomplete(Optimizer):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_unknown_optimizer_is_rejected():
+    with pytest.raises(ValueError):
+        create_optimizer("rmsprop")
+
+
+async def test_every_weight_sees_a_feature():
+    engine = await make_engine()
+    game_state = {name: 0.5 for model in engine.models.values() for name in model["features"]}
+    before = {name: model["weights"].copy() for name, model in engine.models.items()}
+
+    features, targets = engine.build_training_batch([{
+        "game_state": game_state,
+        "targets": {"behavior": 3.0, "outcome": 1.0, "strategy": 0.0},
+    }])
+    engine.train_batch(features, targets)
+
+    for name, model in engine.models.items():
+        assert features[name].shape == (1, len(model["features"]))
+        assert np.all(model["weights"] != before[name])
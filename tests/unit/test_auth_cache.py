@@ -0,0 +1,66 @@
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+import pytest
+from fastapi import HTTPException
+
+import core.auth
+from core.auth import create_access_token, get_current_user
+from core.principal_cache import PrincipalCache
+
+
+@pytest.fixture
+def users(monkeypatch, clock):
+    user = SimpleNamespace(id=uuid.uuid4(), username="player", email="player@example.com",
+                           created_at=datetime(2024, 1, 1), updated_at=datetime(2024, 1, 1))
+    rows = {user.id: user}
+    loads = []
+
+    async def get_user_by_id(session, user_id):
+        loads.append(user_id)
+        return rows.get(user_id)
+
+    async def get_user_updated_at(session, user_id):
+        row = rows.get(user_id)
+        return row.updated_at if row else None
+
+    cache = PrincipalCache(max_entries=10, ttl=300, revalidate_after=5, clock=clock)
+    monkeypatch.setattr(core.auth, "principal_cache", cache)
+    monkeypatch.setattr(core.auth, "get_user_by_id", get_user_by_id)
+    monkeypatch.setattr(core.auth, "get_user_updated_at", get_user_updated_at)
+    return SimpleNamespace(user=user, rows=rows, loads=loads)
+
+
+async def test_change_made_by_another_worker_is_seen_after_revalidation(users, clock):
+    token = create_access_token({"sub": str(users.user.id)})
+    assert (await get_current_user(token, None)).username == "player"
+
+    # Another worker renames the user; its invalidation never reaches this cache
+    users.rows[users.user.id] = SimpleNamespace(**{
+        **vars(users.user), "username": "renamed", "updated_at": datetime(2024, 2, 1)})
+    assert (await get_current_user(token, None)).username == "player"
+    clock.now += 5
+
+    assert (await get_current_user(token, None)).username == "renamed"
+    assert len(users.loads) == 2
+
+
+async def test_unchanged_user_is_revalidated_without_reloading(users, clock):
+    token = create_access_token({"sub": str(users.user.id)})
+    await get_current_user(token, None)
+    clock.now += 5
+
+    await get_current_user(token, None)
+
+    assert len(users.loads) == 1
+
+
+async def test_deleted_user_is_rejected_after_revalidation(users, clock):
+    token = create_access_token({"sub": str(users.user.id)})
+    await get_current_user(token, None)
+    del users.rows[users.user.id]
+    clock.now += 5
+
+    with pytest.raises(HTTPException) as error:
+        await get_current_user(token, None)
+    assert error.value.status_code == 401
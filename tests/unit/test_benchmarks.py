@@ -0,0 +1,70 @@
+from benchmarks.ai_engine import compare, configurations, main, run_benchmarks
+
+
+def test_configurations_skip_oversized_prefills():
+    cases = list(configurations((1, 100, 10000), (10, 1000)))
+
+    assert (10000, 10) in cases
+    assert (10000, 1000) not in cases
+    assert (100, 1000) in cases
+
+
+def test_compare_flags_throughput_and_tail_regressions():
+    baseline = {
+        "a": {"throughput": 100.0, "p99_ms": 10.0},
+        "b": {"throughput": 100.0, "p99_ms": 10.0},
+    }
+    results = {
+        "a": {"throughput": 70.0, "p99_ms": 10.0},
+        "b": {"throughput": 95.0, "p99_ms": 14.0},
+        "new": {"throughput": 1.0, "p99_ms": 1000.0},
+    }
+
+    regressions = compare(results, baseline, threshold=0.25)
+
+    assert len(regressions) == 2
+    assert regressions[0].startswith("a: throughput")
+    assert regressions[1].startswith("b: p99")
+
+
+def test_compare_flags_allocation_growth_beyond_noise():
+    baseline = {
+        "a": {"throughput": 100.0, "p99_ms": 10.0, "peak_alloc_mb": 40.0},
+        "b": {"throughput": 100.0, "p99_ms": 10.0, "peak_alloc_mb": 0.1},
+        "c": {"throughput": 100.0, "p99_ms": 10.0},
+    }
+    results = {
+        "a": {"throughput": 100.0, "p99_ms": 10.0, "peak_alloc_mb": 80.0},
+        "b": {"throughput": 100.0, "p99_ms": 10.0, "peak_alloc_mb": 0.5},
+        "c": {"throughput": 100.0, "p99_ms": 10.0, "peak_alloc_mb": 500.0},
+    }
+
+    regressions = compare(results, baseline, threshold=0.25)
+
+    assert regressions == ["a: peak allocation 80.0 MiB vs baseline 40.0 MiB"]
+
+
+async def test_run_benchmarks_reports_every_component():
+    results = await run_benchmarks((2,), (1,), min_time=0.0, executor="inline")
+
+    assert "engine.process_game_states[games=2,history=1]" in results
+    assert "quantum_generator.update_batch[games=2,history=1]" in results
+    result = results["prediction_engine.process_batch[games=2,history=1]"]
+    assert result["throughput"] > 0
+    assert result["p99_ms"] >= result["p50_ms"]
+    # Measured per case, not as the process-wide high-water mark
+    assert 0 < result["peak_alloc_mb"] < results["engine.process_game_states[games=2,history=1]"]["peak_alloc_mb"]
+
+
+def test_comparison_mode_exits_nonzero_on_regression(tmp_path):
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(
+        '{"results": {"engine.process_game_state[games=1,history=1]": '
+        '{"throughput": 1e12, "p99_ms": 1e-9}}}')
+
+    status = main([
+        "--games", "1", "--history", "1", "--min-time", "0",
+        "--executor", "inline", "--filter", "engine.", "--compare", str(baseline),
+    ])
+
+    assert status == 1
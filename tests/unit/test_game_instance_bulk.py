@@ -0,0 +1,103 @@
+import uuid
+from datetime import datetime
+import pytest
+from pydantic import ValidationError
+from sqlalchemy.dialects import postgresql, sqlite
+
+from crud.game_instance import build_bulk_insert, bulk_create, bulk_row
+from schemas.game_instance import GameInstanceBulkCreate, GameInstanceCreate
+
+
+def make_items(count, **fields):
+    definition = uuid.uuid4()
+    return [GameInstanceCreate(game_definition_id=definition, **fields) for _ in range(count)]
+
+
+@pytest.mark.parametrize("dialect", [postgresql.dialect(), sqlite.dialect()])
+def test_bulk_insert_is_one_multi_row_statement(dialect):
+    rows = [bulk_row(item, datetime(2024, 6, 1)) for item in make_items(3)]
+
+    sql = str(build_bulk_insert(dialect.name, rows).compile(dialect=dialect))
+
+    assert sql.count("INSERT INTO game_instances") == 1
+    assert sql.count("), (") == 2
+    assert "RETURNING" in sql
+    assert "ON CONFLICT" not in sql
+
+
+def test_bulk_upsert_updates_mutable_columns_only():
+    rows = [bulk_row(item, datetime(2024, 6, 1)) for item in make_items(2)]
+
+    sql = str(build_bulk_insert("postgresql", rows, upsert=True).compile(dialect=postgresql.dialect()))
+
+    assert "ON CONFLICT (id, start_time) DO UPDATE SET" in sql
+    assert "score = excluded.score" in sql
+    assert "user_id = excluded" not in sql
+
+
+async def test_bulk_create_chunks_and_commits_once(make_session):
+    session = make_session()
+    items = make_items(5, status="completed", score=3)
+
+    ids = await bulk_create(session, items, chunk_size=2)
+
+    assert len(session.statements) == 3
+    assert session.commits == 1
+    assert len(ids) == 5
+    # Input order is kept although RETURNING came back reversed
+    first = session.statements[0].compile(dialect=postgresql.dialect()).params
+    assert ids[:2] == [first["id_m0"], first["id_m1"]]
+
+
+async def test_bulk_upsert_keeps_last_write_per_key(make_session):
+    session = make_session()
+    shared = uuid.uuid4()
+    definition = uuid.uuid4()
+    start = datetime(2024, 6, 1)
+    items = [
+        GameInstanceCreate(id=shared, game_definition_id=definition, start_time=start, score=1),
+        GameInstanceCreate(id=shared, game_definition_id=definition, start_time=start, score=2),
+    ]
+
+    ids = await bulk_create(session, items, upsert=True)
+
+    assert ids == [shared]
+    params = session.statements[0].compile(dialect=postgresql.dialect()).params
+    assert params["score_m0"] == 2
+
+
+async def test_bulk_create_rolls_back_the_whole_batch(make_session):
+    session = make_session(fail_on=1)
+
+    with pytest.raises(RuntimeError):
+        await bulk_create(session, make_items(4), chunk_size=2)
+
+    assert session.commits == 0
+    assert session.rollbacks == 1
+
+
+async def test_bulk_create_adds_missing_month_partitions_first(make_session):
+    session = make_session({"game_instances": ["game_instances_y2024m06"]})
+    items = [
+        *make_items(2, start_time=datetime(2024, 6, 3)),
+        *make_items(1, start_time=datetime(2019, 2, 14)),
+    ]
+
+    await bulk_create(session, items)
+
+    created = [sql for sql in session.sql if sql.startswith("CREATE TABLE")]
+    assert created == [
+        "CREATE TABLE IF NOT EXISTS game_instances_y2019m02 PARTITION OF game_instances "
+        "FOR VALUES FROM ('2019-02-01') TO ('2019-03-01')"]
+    assert len(session.statements) == 1
+
+
+def test_upsert_requires_start_time_for_ids():
+    definition = uuid.uuid4()
+    instance = {"id": str(uuid.uuid4()), "game_definition_id": str(definition)}
+
+    with pytest.raises(ValidationError, match="start_time is required"):
+        GameInstanceBulkCreate(instances=[instance], upsert=True)
+    assert GameInstanceBulkCreate(instances=[instance]).upsert is False
+    GameInstanceBulkCreate(
+        instances=[{**instance, "start_time": "2024-06-01T00:00:00"}], upsert=True)
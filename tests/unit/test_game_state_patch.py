@@ -0,0 +1,217 @@
+import asyncio
+import uuid
+from datetime import datetime
+import pytest
+from sqlalchemy import update
+from sqlalchemy.dialects import postgresql
+
+from core.state_patches import GameStatePatchQueue
+from crud.game_instance import (
+    compose_merge_patches,
+    merge_patch,
+    merge_patch_expression,
+    patch_game_states,
+)
+from models.game_instance import GameInstance
+
+
+def new_key():
+    return uuid.uuid4(), datetime(2026, 10, 17), uuid.uuid4()
+
+
+def compile_update(patch):
+    statement = update(GameInstance).values(
+        game_state=merge_patch_expression(GameInstance.game_state, patch))
+    return statement.compile(dialect=postgresql.dialect())
+
+
+def test_merge_patch_follows_rfc_7386():
+    target = {"a": "b", "c": {"d": "e", "f": "g"}, "board": [1, 2]}
+    patch = {"a": "z", "c": {"f": None}, "board": [3], "turn": 2}
+
+    assert merge_patch(target, patch) == {"a": "z", "c": {"d": "e"}, "board": [3], "turn": 2}
+    assert target["c"] == {"d": "e", "f": "g"}
+    assert merge_patch({"a": 1}, [1]) == [1]
+    assert merge_patch("text", {"a": {"b": None}}) == {"a": {}}
+
+
+@pytest.mark.parametrize("first,second", [
+    ({"a": 1}, {"b": 2}),
+    ({"a": 1, "b": 2}, {"a": None}),
+    ({"p": {"hp": 5}}, {"p": {"mp": 3, "hp": None}}),
+    ({"p": {"hp": 5}}, {"p": 7}),
+    ({"p": None}, {"p": 3}),
+])
+def test_composed_patch_matches_applying_both(first, second):
+    target = {"a": 0, "p": {"hp": 1, "xp": 9}, "q": True}
+    composed = compose_merge_patches(first, second)
+
+    assert composed is not None
+    assert merge_patch(target, composed) == merge_patch(merge_patch(target, first), second)
+
+
+@pytest.mark.parametrize("first,second", [
+    ({"p": None}, {"p": {"hp": 1}}),
+    ({"p": 3}, {"p": {"hp": 1}}),
+    ({"p": {"s": None}}, {"p": {"s": {"x": 1}}}),
+])
+def test_patches_that_cannot_be_composed(first, second):
+    assert compose_merge_patches(first, second) is None
+
+
+def test_expression_names_only_patched_keys():
+    compiled = compile_update({"score": 3, "gone": None, "players": {"p1": {"hp": 5}}})
+    sql = str(compiled)
+
+    assert "jsonb_build_object" in sql
+    assert "game_instances.game_state #>" in sql
+    assert " - " in sql and " || " in sql
+    params = list(compiled.params.values())
+    assert {"score": 3} in params
+    assert ["gone"] in params
+    assert ("players",) in params and ("players", "p1") in params
+
+
+def test_non_object_patch_replaces_state():
+    compiled = compile_update(["reset"])
+
+    assert "game_instances.game_state" not in str(compiled)
+    assert ["reset"] in compiled.params.values()
+
+
+async def test_patch_game_states_commits_once(make_session):
+    session = make_session()
+    patches = {new_key(): [{"a": 1}, {"b": {"c": 2}}], new_key(): [{"a": None}]}
+
+    assert await patch_game_states(session, patches) == []
+    assert len(session.statements) == 3
+    # Filtering on the whole key lets PostgreSQL prune to one partition
+    sql = str(session.statements[0].compile(dialect=postgresql.dialect()))
+    assert "game_instances.id = " in sql and "game_instances.start_time = " in sql
+    # Patches only reach games of the user who sent them
+    assert "game_instances.user_id = " in sql
+    assert session.commits == 1
+
+
+async def test_patch_game_states_reports_unknown_instances(make_session):
+    known, unknown = new_key(), new_key()
+    session = make_session(rowcounts=[1, 0])
+
+    assert await patch_game_states(session, {known: [{"a": 1}], unknown: [{"a": 1}, {"b": 2}]}) == [unknown]
+    assert len(session.statements) == 2
+    assert session.commits == 1
+
+
+async def test_patch_game_states_rolls_back_on_error(make_session):
+    session = make_session(fail_on=0)
+
+    with pytest.raises(RuntimeError):
+        await patch_game_states(session, {new_key(): [{"a": 1}]})
+    assert session.rollbacks == 1
+    assert session.commits == 0
+
+
+class RecordingWriter:
+    def __init__(self, fail=False, unknown=()):
+        self.calls = []
+        self.fail = fail
+        self.unknown = set(unknown)
+
+    async def __call__(self, patches):
+        self.calls.append(patches)
+        if self.fail:
+            raise RuntimeError("write failed")
+        return [key for key in patches if key in self.unknown]
+
+
+async def test_queue_coalesces_patches_per_instance():
+    writer = RecordingWriter()
+    queue = GameStatePatchQueue(writer, max_delay=0.01)
+    first, second = new_key(), new_key()
+    queue.start()
+    queue.submit(first, {"turn": 1, "p": {"x": 1}})
+    queue.submit(first, {"turn": 2, "p": {"y": 2}})
+    queue.submit(second, {"turn": 1})
+    await asyncio.sleep(0.05)
+    await queue.stop()
+
+    assert writer.calls == [{
+        first: [{"turn": 2, "p": {"x": 1, "y": 2}}],
+        second: [{"turn": 1}],
+    }]
+    assert queue.submitted == 3
+    assert queue.applied == 2
+    assert queue.writes == 1
+
+
+async def test_queue_keeps_patches_that_cannot_be_composed_in_order():
+    writer = RecordingWriter()
+    queue = GameStatePatchQueue(writer)
+    key = new_key()
+    queue.submit(key, {"p": None})
+    queue.submit(key, {"p": {"hp": 1}})
+    queue.submit(key, {"p": {"mp": 2}})
+    await queue.stop()
+
+    assert writer.calls == [{key: [{"p": None}, {"p": {"hp": 1, "mp": 2}}]}]
+
+
+async def test_queue_rejects_new_instances_when_full():
+    queue = GameStatePatchQueue(RecordingWriter(), max_pending=1)
+    key = new_key()
+    queue.submit(key, {"a": 1})
+    queue.submit(key, {"b": 2})
+
+    with pytest.raises(asyncio.QueueFull):
+        queue.submit(new_key(), {"a": 1})
+    assert queue.pending == 1
+
+
+async def test_queue_counts_failed_writes():
+    writer = RecordingWriter(fail=True)
+    queue = GameStatePatchQueue(writer, max_retries=2)
+    queue.submit(new_key(), {"a": 1})
+    await queue.stop()
+
+    assert len(writer.calls) == 3
+    assert queue.failed == 1
+    assert queue.applied == 0
+    assert queue.pending == 0
+
+
+async def test_queue_retries_failed_writes_before_newer_patches():
+    key = new_key()
+    calls = []
+
+    async def write(patches):
+        calls.append(patches)
+        if len(calls) == 1:
+            # Patches arriving while the failing write is in flight
+            queue.submit(key, {"p": {"hp": 1}})
+            queue.submit(key, {"turn": 2})
+            raise RuntimeError("write failed")
+        return []
+
+    queue = GameStatePatchQueue(write)
+    queue.submit(key, {"p": None})
+    await queue.stop()
+
+    assert calls[-1] == {key: [{"p": None}, {"p": {"hp": 1}, "turn": 2}]}
+    assert len(calls) == 2
+    assert queue.applied == 2
+    assert queue.retried == 1
+    assert queue.failed == 0
+    assert queue.attempts == {}
+
+
+async def test_queue_counts_patches_for_unknown_instances(caplog):
+    known, unknown = new_key(), new_key()
+    queue = GameStatePatchQueue(RecordingWriter(unknown=[unknown]))
+    queue.submit(known, {"a": 1})
+    queue.submit(unknown, {"a": None})
+    queue.submit(unknown, {"a": {"b": 1}})
+    await queue.stop()
+
+    assert queue.applied == 1
+    assert queue.unmatched == 2
+    assert str(unknown[0]) in caplog.text
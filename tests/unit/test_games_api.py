@@ -0,0 +1,83 @@
+import uuid
+from datetime import datetime
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import IntegrityError
+
+from api import games
+from core.auth import get_current_user
+from core.database import get_async_session
+from core.principal_cache import UserSnapshot
+
+USER = UserSnapshot(uuid.uuid4(), "player", "player@example.com", datetime(2024, 1, 1), datetime(2024, 1, 1))
+
+
+@pytest.fixture
+def client_for():
+    def client_for(session, user=None):
+        async def fake_session():
+            yield session
+
+        app = FastAPI()
+        app.include_router(games.router)
+        app.dependency_overrides[get_async_session] = fake_session
+        if user is not None:
+            app.dependency_overrides[get_current_user] = lambda: user
+        return TestClient(app)
+    return client_for
+
+
+def batch(count):
+    definition = str(uuid.uuid4())
+    return {"instances": [
+        {"id": str(uuid.uuid4()), "game_definition_id": definition, "status": "completed", "score": index}
+        for index in range(count)
+    ]}
+
+
+def test_bulk_create_returns_ids_in_request_order(client_for, make_session):
+    session = make_session()
+    payload = batch(3)
+
+    response = client_for(session).post("/game-instances/bulk", json=payload)
+
+    assert response.status_code == 201
+    assert response.json() == {
+        "count": 3,
+        "ids": [instance["id"] for instance in payload["instances"]],
+    }
+    assert len(session.statements) == 1
+    assert session.commits == 1
+
+
+def test_bulk_create_conflict_is_409(client_for, make_session):
+    error = IntegrityError("INSERT INTO game_instances", {}, Exception("duplicate key"))
+    session = make_session(fail_on=0, error=error)
+
+    response = client_for(session).post("/game-instances/bulk", json=batch(2))
+
+    assert response.status_code == 409
+    assert session.rollbacks == 1
+    assert session.commits == 0
+
+
+class RecordingQueue:
+    def __init__(self):
+        self.patches = []
+
+    def submit(self, key, patch):
+        self.patches.append((key, patch))
+
+
+def test_state_patch_requires_a_user(client_for, make_session, monkeypatch):
+    queue = RecordingQueue()
+    monkeypatch.setattr(games, "state_patch_queue", queue)
+    instance_id = uuid.uuid4()
+    url = f"/game-instances/{instance_id}/state?start_time=2024-06-01T00:00:00"
+
+    assert client_for(make_session()).patch(url, json={"turn": 2}).status_code == 401
+    response = client_for(make_session(), USER).patch(url, json={"turn": 2})
+
+    assert response.status_code == 202
+    assert queue.patches == [((instance_id, datetime(2024, 6, 1), USER.id), {"turn": 2})]
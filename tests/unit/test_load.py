@@ -0,0 +1,75 @@
+import asyncio
+import random
+import time
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from benchmarks.load import LoopLagMonitor, parse_mix, run_load, summarize
+
+
+def test_parse_mix_normalizes_weights():
+    scenarios = {"a": None, "b": None, "c": None}
+
+    mix = parse_mix("a=3, b=1,c=0", scenarios)
+
+    assert mix == {"a": 0.75, "b": 0.25}
+    assert parse_mix("a,b", scenarios) == {"a": 0.5, "b": 0.5}
+    with pytest.raises(ValueError):
+        parse_mix("a=1,missing=1", scenarios)
+    with pytest.raises(ValueError):
+        parse_mix("a=0", scenarios)
+
+
+def test_summarize_reports_rps_and_tail_latency():
+    latencies = {"fast": [0.001] * 99 + [0.1], "slow": [0.2, 0.2]}
+
+    report = summarize(latencies, {"slow": 1}, elapsed=2.0)
+
+    assert report["fast"]["requests"] == 100
+    assert report["fast"]["rps"] == 50.0
+    assert report["fast"]["p50_ms"] == pytest.approx(1.0)
+    assert report["fast"]["p99_ms"] > report["fast"]["p50_ms"]
+    assert report["slow"]["errors"] == 1
+    assert report["total"]["requests"] == 102
+    assert report["total"]["errors"] == 1
+
+
+async def test_loop_lag_monitor_sees_blocking_work():
+    monitor = LoopLagMonitor(interval=0.001)
+    monitor.start()
+    await asyncio.sleep(0.01)
+    time.sleep(0.05)
+    await asyncio.sleep(0.01)
+    await monitor.stop()
+
+    assert monitor.summary()["max_ms"] >= 40
+
+
+async def test_run_load_drives_the_request_mix():
+    app = FastAPI()
+
+    @app.get("/ok")
+    async def ok():
+        return {"status": "ok"}
+
+    async def call_ok(client, session):
+        return await client.get("/ok")
+
+    async def call_missing(client, session):
+        return await client.get("/missing")
+
+    scenarios = {"ok": call_ok, "missing": call_missing}
+    sessions = [{"rng": random.Random(0)}]
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        result = await run_load(
+            client, sessions, {"ok": 0.5, "missing": 0.5},
+            concurrency=4, duration=0.2, scenarios=scenarios)
+
+    report = result["scenarios"]
+    assert report["ok"]["requests"] > 0
+    assert report["ok"]["errors"] == 0
+    assert report["missing"]["errors"] == report["missing"]["requests"] > 0
+    assert report["total"]["rps"] > 0
+    assert result["loop_lag"]["samples"] > 0
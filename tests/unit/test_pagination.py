@@ -0,0 +1,118 @@
+import json
+import uuid
+from datetime import datetime, timedelta
+import httpx
+import pytest
+from fastapi import FastAPI
+from pydantic import BaseModel
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from api.pagination import NDJSON_MEDIA_TYPE, ndjson_response
+from crud.pagination import decode_cursor, encode_cursor, keyset_page, keyset_query
+from llm_service.crud import LIST_KEY
+from llm_service.models import LLMCallLog
+from models.user import User
+
+
+class AsyncAdapter:
+    """Runs keyset queries on a synchronous SQLite session."""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    async def execute(self, statement):
+        return self.session.execute(statement)
+
+
+@pytest.fixture()
+def session():
+    engine = create_engine("sqlite://")
+    User.__table__.create(engine)
+    LLMCallLog.__table__.create(engine)
+    with Session(engine) as session:
+        start = datetime(2024, 6, 1)
+        user_id = uuid.uuid4()
+        for index in range(7):
+            # Pairs of logs share a timestamp so the id breaks ties
+            session.add(LLMCallLog(
+                user_id=user_id, provider="openai", model="m", prompt=str(index),
+                status="ok", created_at=start + timedelta(minutes=index // 2)))
+        session.commit()
+        yield session
+
+
+def test_cursor_round_trips_typed_values():
+    key = [datetime(2024, 6, 1, 12, 30), uuid.uuid4()]
+
+    assert decode_cursor(encode_cursor(key), LIST_KEY) == key
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor", LIST_KEY)
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor([1]), LIST_KEY)
+
+
+async def test_keyset_pages_cover_every_row_once(session):
+    query = select(LLMCallLog)
+    seen = []
+    cursor = None
+    pages = 0
+    while True:
+        page = await keyset_page(AsyncAdapter(session), query, LIST_KEY, limit=3,
+                                 cursor=cursor, descending=True)
+        seen.extend(page.items)
+        pages += 1
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert len({log.id for log in seen}) == 7
+    keys = [(log.created_at, str(log.id)) for log in seen]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_keyset_query_seeks_past_the_cursor():
+    cursor = encode_cursor([datetime(2024, 6, 1), uuid.uuid4()])
+
+    sql = str(keyset_query(select(LLMCallLog), LIST_KEY, cursor, descending=True))
+
+    assert "(llm_call_logs.created_at, llm_call_logs.id) <" in sql
+    assert "ORDER BY llm_call_logs.created_at DESC, llm_call_logs.id DESC" in sql
+
+
+async def test_ndjson_response_streams_one_object_per_line():
+    class Item(BaseModel):
+        value: int
+
+        class Config:
+            from_attributes = True
+
+    class Row:
+        def __init__(self, value):
+            self.value = value
+
+    closed = []
+
+    class FakeSession:
+        async def close(self):
+            closed.append(True)
+
+    async def rows(session):
+        for value in range(3):
+            yield Row(value)
+
+    app = FastAPI()
+
+    @app.get("/items")
+    async def items():
+        return ndjson_response(rows, Item, session_factory=FakeSession)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/items")
+
+    assert response.headers["content-type"] == NDJSON_MEDIA_TYPE
+    assert [json.loads(line) for line in response.text.splitlines()] == [
+        {"value": 0}, {"value": 1}, {"value": 2}]
+    assert closed == [True]
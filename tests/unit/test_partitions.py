@@ -0,0 +1,105 @@
+from datetime import date
+import pytest
+
+from core.partitions import (
+    PartitionedTable,
+    add_months,
+    create_partition_statement,
+    ensure_partitions,
+    ensure_partitions_for,
+    expire_partitions,
+    maintain_partitions,
+    partition_month,
+    partition_name,
+)
+
+LOGS = PartitionedTable("llm_call_logs", "created_at", 2)
+GAMES = PartitionedTable("game_instances", "start_time", 0)
+
+
+def test_month_arithmetic_and_names():
+    assert add_months(date(2026, 11, 1), 2) == date(2027, 1, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+    assert partition_name("llm_call_logs", date(2026, 3, 1)) == "llm_call_logs_y2026m03"
+    assert partition_month("llm_call_logs", "llm_call_logs_y2026m03") == date(2026, 3, 1)
+    assert partition_month("llm_call_logs", "game_instances_y2026m03") is None
+    assert partition_month("llm_call_logs", "llm_call_logs_default") is None
+
+
+def test_create_partition_statement_covers_one_month():
+    assert create_partition_statement(LOGS, date(2026, 12, 1)) == (
+        "CREATE TABLE IF NOT EXISTS llm_call_logs_y2026m12 PARTITION OF llm_call_logs "
+        "FOR VALUES FROM ('2026-12-01') TO ('2027-01-01')")
+
+
+async def test_ensure_partitions_creates_missing_months_only(make_session):
+    session = make_session()
+
+    created = await ensure_partitions(
+        session, LOGS, date(2026, 10, 17), months_ahead=2, existing=["llm_call_logs_y2026m11"])
+
+    assert created == ["llm_call_logs_y2026m10", "llm_call_logs_y2026m12"]
+    assert len(session.sql) == 2
+
+
+async def test_ensure_partitions_for_creates_months_of_the_values(make_session):
+    session = make_session({"game_instances": ["game_instances_y2024m06"]})
+
+    created = await ensure_partitions_for(
+        session, GAMES, [date(2024, 6, 30), date(2023, 1, 5), date(2023, 1, 20)])
+
+    assert created == ["game_instances_y2023m01"]
+    assert "pg_inherits" in session.sql[0]
+    assert session.sql[1:] == [create_partition_statement(GAMES, date(2023, 1, 1))]
+
+
+async def test_expire_partitions_archives_months_past_retention(make_session):
+    session = make_session()
+    existing = ["llm_call_logs_y2026m07", "llm_call_logs_y2026m08", "llm_call_logs_y2026m09"]
+
+    expired = await expire_partitions(session, LOGS, date(2026, 10, 17), "archive", "archive", existing)
+
+    assert expired == ["llm_call_logs_y2026m07"]
+    assert session.sql == [
+        "CREATE SCHEMA IF NOT EXISTS archive",
+        "ALTER TABLE llm_call_logs DETACH PARTITION llm_call_logs_y2026m07",
+        "ALTER TABLE llm_call_logs_y2026m07 SET SCHEMA archive",
+    ]
+
+
+async def test_expire_partitions_drops_or_keeps_forever(make_session):
+    session = make_session()
+    existing = ["game_instances_y2020m01"]
+
+    assert await expire_partitions(session, GAMES, date(2026, 10, 17), "drop", existing=existing) == []
+    expired = await expire_partitions(
+        session, LOGS, date(2026, 10, 17), "drop", existing=["llm_call_logs_y2026m01"])
+
+    assert expired == ["llm_call_logs_y2026m01"]
+    assert session.sql[-1] == "DROP TABLE llm_call_logs_y2026m01"
+    with pytest.raises(ValueError):
+        await expire_partitions(session, LOGS, date(2026, 10, 17), "truncate")
+
+
+async def test_maintain_partitions_runs_in_one_transaction(make_session):
+    session = make_session({"llm_call_logs": ["llm_call_logs_y2026m01", "llm_call_logs_y2026m10"]})
+
+    summary = await maintain_partitions(
+        session, date(2026, 10, 17), tables=(LOGS, GAMES), months_ahead=1, action="drop")
+
+    assert summary == {
+        "llm_call_logs": {"created": ["llm_call_logs_y2026m11"], "expired": ["llm_call_logs_y2026m01"]},
+        "game_instances": {
+            "created": ["game_instances_y2026m10", "game_instances_y2026m11"], "expired": []},
+    }
+    assert session.sql[0].startswith("SET LOCAL lock_timeout")
+    assert session.commits == 1
+
+
+async def test_maintain_partitions_rolls_back_on_error(make_session):
+    session = make_session({"llm_call_logs": ["llm_call_logs_y2026m01"]}, fail_on="DETACH")
+
+    with pytest.raises(RuntimeError):
+        await maintain_partitions(session, date(2026, 10, 17), tables=(LOGS,), action="drop")
+    assert session.rollbacks == 1
+    assert session.commits == 0
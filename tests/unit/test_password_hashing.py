@@ -0,0 +1,62 @@
+import asyncio
+import threading
+import time
+from passlib.context import CryptContext
+
+from core.hashing import HASH_DURATION, HASH_QUEUE_WAIT, PasswordHasher
+
+
+def make_hasher(max_workers: int = 2) -> PasswordHasher:
+    return PasswordHasher(CryptContext(schemes=["sha256_crypt"], sha256_crypt__rounds=1000), max_workers)
+
+
+async def test_hash_and_verify_run_off_the_event_loop():
+    hasher = make_hasher()
+    loop_thread = threading.get_ident()
+    threads = []
+    context_hash = hasher.context.hash
+
+    def hash_on_worker(password):
+        threads.append(threading.get_ident())
+        return context_hash(password)
+
+    hasher.context.hash = hash_on_worker
+    try:
+        hashed = await hasher.hash("correct horse")
+        assert await hasher.verify("correct horse", hashed)
+        assert not await hasher.verify("wrong horse", hashed)
+    finally:
+        hasher.shutdown()
+
+    assert threads and loop_thread not in threads
+
+
+async def test_concurrency_is_bounded_and_queueing_is_measured():
+    hasher = make_hasher(max_workers=1)
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def slow(password):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.02)
+        with lock:
+            running -= 1
+        return password
+
+    waits_before = HASH_QUEUE_WAIT.count("slow")
+    try:
+        tasks = [asyncio.ensure_future(hasher._run("slow", slow, "pw")) for _ in range(3)]
+        await asyncio.sleep(0)
+        assert hasher.pending == 3
+        await asyncio.gather(*tasks)
+    finally:
+        hasher.shutdown()
+
+    assert peak == 1
+    assert hasher.pending == 0
+    assert HASH_QUEUE_WAIT.count("slow") == waits_before + 3
+    assert HASH_DURATION.count("slow") >= 3
@@ -0,0 +1,79 @@
+import uuid
+from datetime import datetime
+
+from core.principal_cache import PrincipalCache, UserSnapshot
+
+
+def snapshot(user_id=None) -> UserSnapshot:
+    now = datetime(2024, 6, 1)
+    return UserSnapshot(user_id or uuid.uuid4(), "player", "player@example.com", now, now)
+
+
+def test_cache_hits_until_ttl(clock):
+    cache = PrincipalCache(max_entries=10, ttl=60, clock=clock)
+    user = snapshot()
+    cache.put("token", {"sub": str(user.id)}, user)
+
+    assert cache.get("token") == ({"sub": str(user.id)}, user, False)
+    clock.now += 61
+    assert cache.get("token") is None
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_entries_are_flagged_for_revalidation(clock):
+    cache = PrincipalCache(max_entries=10, ttl=60, revalidate_after=5, clock=clock)
+    cache.put("token", {}, snapshot())
+
+    assert cache.get("token").revalidate is False
+    clock.now += 5
+    assert cache.get("token").revalidate is True
+    cache.checked("token")
+    assert cache.get("token").revalidate is False
+    clock.now += 5
+    assert cache.get("token").revalidate is True
+
+
+def test_cache_expires_at_token_exp(clock):
+    cache = PrincipalCache(max_entries=10, ttl=600, clock=clock)
+    cache.put("token", {"exp": clock.now + 5}, snapshot())
+
+    clock.now += 4
+    assert cache.get("token") is not None
+    clock.now += 1
+    assert cache.get("token") is None
+
+
+def test_cache_evicts_least_recently_used(clock):
+    cache = PrincipalCache(max_entries=2, ttl=60, clock=clock)
+    cache.put("a", {}, snapshot())
+    cache.put("b", {}, snapshot())
+    cache.get("a")
+    cache.put("c", {}, snapshot())
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_invalidate_user_drops_all_of_their_tokens(clock):
+    cache = PrincipalCache(max_entries=10, ttl=60, clock=clock)
+    user = snapshot()
+    other = snapshot()
+    cache.put("first", {}, user)
+    cache.put("second", {}, user)
+    cache.put("other", {}, other)
+
+    cache.invalidate_user(user.id)
+
+    assert cache.get("first") is None
+    assert cache.get("second") is None
+    assert cache.get("other") is not None
+
+
+def test_cache_keys_are_token_digests(clock):
+    cache = PrincipalCache(max_entries=10, ttl=60, clock=clock)
+    cache.put("secret-token", {}, snapshot())
+
+    assert "secret-token" not in cache._entries
+    assert PrincipalCache.key("secret-token") in cache._entries